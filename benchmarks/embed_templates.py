@@ -0,0 +1,111 @@
+"""Micro-benchmark: reminder embed construction per reminder batch
+
+Compares building both players' reminder embeds from scratch (the previous
+approach) with filling the cached template from EmbedBuilder.
+    
+    python -m benchmarks.embed_templates [duels_per_batch] [batches]
+"""
+import random
+import sys
+import time
+from bot.utils.embeds import EmbedBuilder, MOTIVATIONAL_QUOTES
+
+SERVER_IP = "18.228.228.44"
+SERVER_PORT = "3827"
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"Fighter{user_id}"
+
+def make_batch(size: int) -> list:
+    stats = lambda: {'wins': random.randint(0, 20), 'losses': random.randint(0, 20),
+                     'kills': random.randint(0, 200), 'deaths': random.randint(0, 200)}
+    return [
+        ({'timestamp': 1755194700 + i * 600}, FakeUser(2 * i), FakeUser(2 * i + 1), stats(), stats())
+        for i in range(size)
+    ]
+
+def build_from_scratch(builder: EmbedBuilder, duel, player1, player2, p1_data, p2_data):
+    embeds = []
+    for player, opponent, me, them in ((player1, player2, p1_data, p2_data), (player2, player1, p2_data, p1_data)):
+        embed = builder.duel_reminder_embed(
+            "⚡ FINAL WARNING - DUEL STARTING SOON!",
+            "🔥 **Your epic battle begins in 5 minutes!** 🔥"
+        )
+        embed.add_field(
+            name="⚔️ Battle Details",
+            value=f"**{player.display_name}** 🆚 **{opponent.display_name}**\n"
+                  f"**Starts:** <t:{duel['timestamp']}:t>\n"
+                  f"**In:** <t:{duel['timestamp']}:R>\n\n"
+                  f"🎯 **This is it - the moment of truth!**",
+            inline=False
+        )
+        embed.add_field(
+            name="🎮 Connection Info",
+            value=f"**Server IP:** {SERVER_IP}\n"
+                  f"**Port:** {SERVER_PORT}\n"
+                  f"**Full Address:** {SERVER_IP}:{SERVER_PORT}\n\n"
+                  f"🚨 **CONNECT NOW!**",
+            inline=True
+        )
+        embed.add_field(
+            name="📋 Pre-Battle Checklist",
+            value="✅ Connect to server\n"
+                  "✅ Check your internet connection\n"
+                  "✅ Close other applications\n"
+                  "✅ Prepare for victory!\n"
+                  "✅ May the best fighter win!",
+            inline=True
+        )
+        embed.add_field(
+            name="🎯 Know Your Enemy",
+            value=f"**Opponent Record:** {them['wins']}W-{them['losses']}L\n"
+                  f"**K/D Ratio:** {them['kills'] / max(1, them['deaths']):.2f}\n"
+                  f"**Threat Level:** {'🔥 HIGH' if them['wins'] > 5 else '⚡ MODERATE'}\n"
+                  f"**Strategy:** Fight smart, stay focused!",
+            inline=False
+        )
+        embed.add_field(name="💪 Battle Inspiration", value=random.choice(MOTIVATIONAL_QUOTES), inline=False)
+        embed.add_field(
+            name=f"🥊 Your Stats vs {opponent.display_name}",
+            value=f"**Your Record:** {me['wins']}W-{me['losses']}L\n"
+                  f"**Your K/D:** {me['kills'] / max(1, me['deaths']):.2f}\n"
+                  f"**Confidence Level:** {'🔥 READY TO DOMINATE!' if me['wins'] >= them['wins'] else '⚡ HUNGRY FOR VICTORY!'}",
+            inline=False
+        )
+        embeds.append(embed.to_dict())
+    return embeds
+
+def build_from_template(builder: EmbedBuilder, duel, player1, player2, p1_data, p2_data):
+    return [
+        builder.personal_reminder_embed(duel, player1, player2, p1_data, p2_data, SERVER_IP, SERVER_PORT).to_dict(),
+        builder.personal_reminder_embed(duel, player2, player1, p2_data, p1_data, SERVER_IP, SERVER_PORT).to_dict()
+    ]
+
+def run(build, builder: EmbedBuilder, batch: list, batches: int) -> float:
+    """Return the fastest batch time, which is the least noisy estimate"""
+    best = float('inf')
+    for _ in range(batches):
+        start = time.perf_counter()
+        for duel in batch:
+            build(builder, *duel)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    batches = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    builder = EmbedBuilder()
+    batch = make_batch(size)
+    
+    scratch = run(build_from_scratch, builder, batch, batches)
+    template = run(build_from_template, builder, batch, batches)
+    
+    print(f"Reminder batch of {size} duels ({2 * size} embeds), best of {batches} batches:")
+    print(f"  from scratch:  {scratch * 1000:8.2f} ms/batch  ({scratch / size * 1e6:7.1f} µs/duel)")
+    print(f"  from template: {template * 1000:8.2f} ms/batch  ({template / size * 1e6:7.1f} µs/duel)")
+    print(f"  speedup:       {scratch / template:8.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Load test: the Flask development server against the production web server
+
+Starts each server in a subprocess on a free port, drives it with
+keep-alive HTTP clients for a fixed time and reports requests per second
+and latency percentiles.
+    
+    python -m benchmarks.web_load [path] [seconds] [concurrency]
+"""
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+SERVERS = {
+    'flask dev server': "from web.app import app; import os; app.run(port=int(os.environ['PORT']))",
+    'web.server': "from web.server import create_server; create_server().serve_forever()"
+}
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_ready(port: int, timeout: float = 20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+def client(port: int, path: str, stop: float, latencies: list, errors: list):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    while time.perf_counter() < stop:
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+            # The dev server answers HTTP/1.0 and closes after every response
+            if response.will_close:
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+
+def run(name: str, code: str, path: str, seconds: float, concurrency: int):
+    port = free_port()
+    env = {**os.environ, 'PORT': str(port)}
+    server = subprocess.Popen([sys.executable, '-c', code], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port)
+        latencies, errors = [], []
+        stop = time.perf_counter() + seconds
+        threads = [threading.Thread(target=client, args=(port, path, stop, latencies, errors))
+                   for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+    
+    latencies.sort()
+    count = len(latencies)
+    p50 = latencies[count // 2] * 1000 if count else 0
+    p99 = latencies[min(count - 1, int(count * 0.99))] * 1000 if count else 0
+    print(f"{name:>18}: {count / seconds:8.0f} req/s   p50 {p50:6.1f} ms   p99 {p99:7.1f} ms   errors {len(errors)}")
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else '/api/stats'
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    print(f"GET {path} for {seconds:.0f}s with {concurrency} keep-alive clients")
+    for name, code in SERVERS.items():
+        run(name, code, path, seconds, concurrency)
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,35 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import asyncio
+import hashlib
 import json
 import os
+import time
 from datetime import datetime
 from bot.commands.admin import AdminCommands
 from bot.commands.tournament import TournamentCommands
 from bot.commands.duel import DuelCommands
 from bot.commands.stats import StatsCommands
+from bot.utils.brackets import BracketManager
 from bot.utils.database import Database
+from bot.utils.intervals import IntervalIndex
+from bot.utils.messaging import OutboundQueue
+from bot.utils.metrics import metrics
+from bot.utils.perf import InstrumentedTree, finish as finish_command_timing, instrument_http
+from bot.utils.resolver import UserResolver
 from bot.utils.scheduler import DuelScheduler
+from bot.utils.throttle import CommandThrottle, CommandThrottled
 from bot.utils.translations import Translator
 
+# Guild to sync commands to instantly while developing; global sync can
+# take up to an hour to show up and is rate limited far more strictly
+DEV_GUILD_ID = os.getenv('DEV_GUILD_ID')
+
 class DuelLordsBot(commands.Bot):
     def __init__(self):
+        # Startup timeline: phase name -> perf_counter() when it finished
+        self._boot = {'start': time.perf_counter()}
+        
         intents = discord.Intents.default()
         intents.message_content = True
         intents.members = True
@@ -21,21 +37,31 @@ class DuelLordsBot(commands.Bot):
         super().__init__(
             command_prefix='!',
             intents=intents,
+            tree_cls=InstrumentedTree,
             description="Duel Lords - Ultimate BombSquad Tournament Bot"
         )
         
         # Initialize components
         self.db = Database()
+        self.intervals = IntervalIndex()
+        self.intervals.load(self.db.get_all_duels())
+        self.outbox = OutboundQueue()
+        self.resolver = UserResolver(self)
         self.scheduler = DuelScheduler(self)
+        self.brackets = BracketManager(self)
+        self.throttle = CommandThrottle()
+        self.tree.on_error = self.on_app_command_error
         self.translator = Translator()
         
         # Bot configuration
         self.server_ip = "18.228.228.44"
         self.server_port = "3827"
-        
+        self._boot['init'] = time.perf_counter()
+    
     async def setup_hook(self):
         """Setup hook called when bot is ready"""
         print("🔧 Setting up bot commands...")
+        self._boot['login'] = time.perf_counter()
         
         # Add cogs
         await self.add_cog(AdminCommands(self))
@@ -43,25 +69,72 @@ class DuelLordsBot(commands.Bot):
         await self.add_cog(DuelCommands(self))
         await self.add_cog(StatsCommands(self))
         
-        # Start scheduler
-        self.scheduler_task.start()
+        # Start outbound message queue and deadline-driven scheduler
+        self.outbox.start()
+        self.scheduler.start()
+        instrument_http(self)
+        self._boot['cogs'] = time.perf_counter()
         
-        # Sync slash commands (only once)
+        # Sync slash commands (only once, and only if they changed)
         if not hasattr(self, '_commands_synced'):
-            try:
-                synced = await self.tree.sync()
-                print(f"✅ Synced {len(synced)} slash commands")
-                self._commands_synced = True
-            except discord.HTTPException as e:
-                if e.status == 429:  # Rate limited
-                    print(f"⏳ Rate limited, skipping command sync")
-                else:
-                    print(f"❌ Failed to sync commands: {e}")
-            except Exception as e:
+            await self.sync_commands()
+        self._boot['sync'] = time.perf_counter()
+    
+    def command_tree_hash(self, guild: discord.abc.Snowflake | None = None) -> str:
+        """Stable hash of the command payload Discord would receive for a scope"""
+        payload = sorted(
+            (command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)),
+            key=lambda command: command['name']
+        )
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    
+    async def sync_commands(self, force: bool = False):
+        """Sync slash commands when their hash differs from the last successful sync"""
+        guild = discord.Object(id=int(DEV_GUILD_ID)) if DEV_GUILD_ID else None
+        if guild:
+            self.tree.copy_global_to(guild=guild)
+        scope = f"guild:{guild.id}" if guild else "global"
+        
+        command_hash = self.command_tree_hash(guild)
+        if not force and self.db.get_command_hash(scope) == command_hash:
+            print(f"✅ Slash commands unchanged ({scope}), skipping sync")
+            self._commands_synced = True
+            return
+        
+        try:
+            synced = await self.tree.sync(guild=guild)
+            self.db.set_command_hash(scope, command_hash)
+            print(f"✅ Synced {len(synced)} slash commands ({scope})")
+            self._commands_synced = True
+        except discord.HTTPException as e:
+            if e.status == 429:  # Rate limited
+                print(f"⏳ Rate limited, skipping command sync")
+            else:
                 print(f"❌ Failed to sync commands: {e}")
+        except Exception as e:
+            print(f"❌ Failed to sync commands: {e}")
+    
+    def _log_startup(self):
+        """Print how long each startup phase took and record it in the metrics"""
+        self._boot['ready'] = time.perf_counter()
+        phases = ['init', 'login', 'cogs', 'sync', 'ready']
+        previous = self._boot['start']
+        parts = []
+        for phase in phases:
+            if phase not in self._boot:
+                continue
+            duration = self._boot[phase] - previous
+            previous = self._boot[phase]
+            metrics.record(f"startup.{phase}_seconds", duration)
+            parts.append(f"{phase} {duration * 1000:.0f}ms")
+        total = self._boot['ready'] - self._boot['start']
+        metrics.record('startup.total_seconds', total)
+        print(f"⏱️ Time to ready: {total:.2f}s ({', '.join(parts)})")
     
     async def on_ready(self):
         """Called when bot is ready"""
+        if 'ready' not in self._boot:
+            self._log_startup()
         print(f"🎯 {self.user} is now online!")
         print(f"🏆 Duel Lords Tournament Bot Ready!")
         print(f"📊 Serving {len(self.guilds)} guild(s)")
@@ -73,29 +146,33 @@ class DuelLordsBot(commands.Bot):
         )
         await self.change_presence(activity=activity, status=discord.Status.online)
     
-    async def on_application_command_error(self, interaction, error):
+    async def on_app_command_completion(self, interaction, command):
+        """Record the timing of a finished slash command"""
+        finish_command_timing()
+    
+    async def on_app_command_error(self, interaction, error):
         """Handle slash command errors"""
-        if isinstance(error, commands.MissingPermissions):
-            await interaction.response.send_message(
-                "❌ You don't have permission to use this command!", 
-                ephemeral=True
-            )
+        finish_command_timing(failed=True)
+        if isinstance(error, CommandThrottled):
+            message = f"⏳ Slow down! Try `/{error.command}` again in {error.retry_after:.0f}s."
+            if error.scope == 'server':
+                message = f"⏳ This server is using commands too fast. Try again in {error.retry_after:.0f}s."
+        elif isinstance(error, (commands.MissingPermissions, discord.app_commands.MissingPermissions)):
+            message = "❌ You don't have permission to use this command!"
         else:
-            await interaction.response.send_message(
-                f"❌ An error occurred: {str(error)}", 
-                ephemeral=True
-            )
+            message = f"❌ An error occurred: {str(error)}"
             print(f"Command error: {error}")
-    
-    @tasks.loop(seconds=30)
-    async def scheduler_task(self):
-        """Check for scheduled duels and send reminders"""
+        
         try:
-            await self.scheduler.check_reminders()
-        except Exception as e:
-            print(f"❌ Scheduler error: {e}")
+            if interaction.response.is_done():
+                await interaction.followup.send(message, ephemeral=True)
+            else:
+                await interaction.response.send_message(message, ephemeral=True)
+        except discord.HTTPException:
+            pass
     
-    @scheduler_task.before_loop
-    async def before_scheduler(self):
-        """Wait until bot is ready before starting scheduler"""
-        await self.wait_until_ready()
+    async def close(self):
+        """Stop background work before closing the connection"""
+        self.scheduler.stop()
+        self.outbox.stop()
+        await super().close()
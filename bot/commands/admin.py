@@ -1,8 +1,13 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import io
 from bot.utils.embeds import EmbedBuilder
 from bot.utils.database import Database
+from bot.utils.importer import STAT_FIELDS, MAX_IMPORT_BYTES, ImportFileError, parse_results
+from bot.utils.messaging import PRIORITY_WELCOME
+from bot.utils.metrics import HISTOGRAM_WINDOW, metrics
+from bot.utils.perf import SLOW_COMMAND_SECONDS, slow_log
 
 class AdminCommands(commands.Cog):
     def __init__(self, bot):
@@ -16,6 +21,43 @@ class AdminCommands(commands.Cog):
             return interaction.user.guild_permissions.administrator
         return False
     
+    def _new_player(self, user: discord.abc.User, display_name: str, registered_by: int) -> dict:
+        """Fresh player record with zeroed stats"""
+        return {
+            "user_id": user.id,
+            "username": user.name,
+            "display_name": display_name,
+            "wins": 0,
+            "losses": 0,
+            "draws": 0,
+            "kills": 0,
+            "deaths": 0,
+            "kill_count": 0,
+            "registered_at": discord.utils.utcnow().isoformat(),
+            "registered_by": registered_by
+        }
+    
+    def _welcome_embed(self, registered_by: discord.abc.User) -> discord.Embed:
+        """Welcome DM sent to newly registered players"""
+        welcome_embed = self.embed_builder.info_embed(
+            "🎉 Welcome to Duel Lords Tournament!",
+            f"You have been registered by {registered_by.mention}"
+        )
+        welcome_embed.add_field(
+            name="🎮 BombSquad Server",
+            value=f"**IP:** {self.bot.server_ip}\n**Port:** {self.bot.server_port}",
+            inline=False
+        )
+        welcome_embed.add_field(
+            name="📋 Available Commands",
+            value="• `/stats` - View your statistics\n"
+                  "• `/leaderboard` - View tournament rankings\n"
+                  "• `/ip` - Get server connection info\n"
+                  "• `/fighters` - View all tournament fighters",
+            inline=False
+        )
+        return welcome_embed
+    
     @app_commands.command(name="register", description="Register a new player (Admin only)")
     @app_commands.describe(
         user="The Discord user to register",
@@ -50,21 +92,8 @@ class AdminCommands(commands.Cog):
             return
         
         # Register the player
-        player_data = {
-            "user_id": user.id,
-            "username": user.name,
-            "display_name": player_name,
-            "wins": 0,
-            "losses": 0,
-            "draws": 0,
-            "kills": 0,
-            "deaths": 0,
-            "kill_count": 0,
-            "registered_at": discord.utils.utcnow().isoformat(),
-            "registered_by": interaction.user.id
-        }
-        
-        self.db.add_player(user.id, player_data)
+        player_data = self._new_player(user, player_name, interaction.user.id)
+        total_players = self.db.add_players({user.id: player_data})
         
         # Create success embed
         embed = self.embed_builder.success_embed(
@@ -83,7 +112,7 @@ class AdminCommands(commands.Cog):
         )
         embed.add_field(
             name="🏆 Tournament Info",
-            value=f"**Total Players:** {len(self.db.get_all_players())}\n"
+            value=f"**Total Players:** {total_players}\n"
                   f"**Registered By:** {interaction.user.mention}\n"
                   f"**Registration Date:** <t:{int(discord.utils.utcnow().timestamp())}:F>",
             inline=True
@@ -93,28 +122,84 @@ class AdminCommands(commands.Cog):
         
         await interaction.followup.send(embed=embed)
         
-        # Send welcome message to the registered player
-        try:
-            welcome_embed = self.embed_builder.info_embed(
-                "🎉 Welcome to Duel Lords Tournament!",
-                f"You have been registered by {interaction.user.mention}"
-            )
-            welcome_embed.add_field(
-                name="🎮 BombSquad Server",
-                value=f"**IP:** {self.bot.server_ip}\n**Port:** {self.bot.server_port}",
-                inline=False
+        # Welcome DMs are the lowest priority; don't hold up the response for them
+        welcome_embed = self._welcome_embed(interaction.user)
+        self.bot.outbox.submit(user, {'embed': welcome_embed}, PRIORITY_WELCOME)
+    
+    @app_commands.command(name="register_role", description="Register every member with a role (Admin only)")
+    @app_commands.describe(
+        role="Members with this role will be registered",
+        send_welcome="Send the welcome DM to each new player"
+    )
+    async def register_role(self, interaction: discord.Interaction, role: discord.Role, send_welcome: bool = True):
+        """Register all unregistered members of a role with a single write"""
+        if not self.is_admin(interaction):
+            await interaction.response.send_message(
+                "❌ Only administrators can register players!", 
+                ephemeral=True
             )
-            welcome_embed.add_field(
-                name="📋 Available Commands",
-                value="• `/stats` - View your statistics\n"
-                      "• `/leaderboard` - View tournament rankings\n"
-                      "• `/ip` - Get server connection info\n"
-                      "• `/fighters` - View all tournament fighters",
-                inline=False
+            return
+        
+        await interaction.response.defer()
+        
+        # role.members only sees cached members. Page through the member list
+        # over REST (1000 per request) rather than chunking the whole guild
+        # into the cache, keeping only the members that have the role.
+        members = {member.id: member for member in role.members}
+        if not interaction.guild.chunked:
+            async for member in interaction.guild.fetch_members(limit=None):
+                if member.get_role(role.id):
+                    members.setdefault(member.id, member)
+        
+        registered = self.db.get_all_players()
+        new_players = {}
+        already, bots = 0, 0
+        for member in members.values():
+            if member.bot:
+                bots += 1
+            elif str(member.id) in registered:
+                already += 1
+            else:
+                new_players[member.id] = (member, self._new_player(member, member.display_name, interaction.user.id))
+        
+        if not new_players:
+            embed = self.embed_builder.warning_embed(
+                "No New Players",
+                f"Every member of {role.mention} is already registered!"
             )
-            await user.send(embed=welcome_embed)
-        except discord.Forbidden:
-            pass  # User has DMs disabled
+            await interaction.followup.send(embed=embed)
+            return
+        
+        total_players = self.db.add_players({user_id: player for user_id, (_, player) in new_players.items()})
+        
+        embed = self.embed_builder.success_embed(
+            "🎯 Players Registered Successfully!",
+            f"Registered **{len(new_players)}** members of {role.mention}"
+        )
+        names = [member.mention for member, _ in new_players.values()]
+        embed.add_field(
+            name="🆕 New Players",
+            value=", ".join(names[:30]) + (f" *...and {len(names) - 30} more*" if len(names) > 30 else ""),
+            inline=False
+        )
+        embed.add_field(
+            name="🏆 Tournament Info",
+            value=f"**Total Players:** {total_players}\n"
+                  f"**Already Registered:** {already}\n"
+                  f"**Bots Skipped:** {bots}\n"
+                  f"**Registered By:** {interaction.user.mention}",
+            inline=True
+        )
+        if send_welcome:
+            embed.set_footer(text=f"Welcome DMs queued for {len(new_players)} players")
+        await interaction.followup.send(embed=embed)
+        print(f"👥 Registered {len(new_players)} players from role {role.name}")
+        
+        if send_welcome:
+            # One shared embed; the outbox paces the DMs behind higher priority traffic
+            welcome_embed = self._welcome_embed(interaction.user)
+            for member, _ in new_players.values():
+                self.bot.outbox.submit(member, {'embed': welcome_embed}, PRIORITY_WELCOME)
     
     @app_commands.command(name="remove", description="Remove a player from tournament (Admin only)")
     @app_commands.describe(user="The Discord user to remove")
@@ -250,3 +335,199 @@ class AdminCommands(commands.Cog):
         embed.set_footer(text=f"Updated by {interaction.user.display_name}")
         
         await interaction.followup.send(embed=embed)
+    
+    @app_commands.command(name="import_results", description="Apply a CSV/JSON file of results or stat changes (Admin only)")
+    @app_commands.describe(
+        file="CSV or JSON with player rows (player, wins, losses, draws, kills, deaths) or duel rows (player1, player2, p1_kills, p2_kills, winner)",
+        dry_run="Validate and show the changes without saving them"
+    )
+    async def import_results(self, interaction: discord.Interaction, file: discord.Attachment, dry_run: bool = False):
+        """Validate an attachment and apply all of its stat changes in one write"""
+        if not self.is_admin(interaction):
+            await interaction.response.send_message(
+                "❌ Only administrators can import results!", 
+                ephemeral=True
+            )
+            return
+        
+        if file.size > MAX_IMPORT_BYTES:
+            await interaction.response.send_message(
+                f"❌ The file is too large (limit {MAX_IMPORT_BYTES // 1024} KB).",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer()
+        
+        try:
+            players = self.db.get_all_players()
+            deltas, rows, errors = parse_results(await file.read(), file.filename, players)
+        except (ImportFileError, discord.HTTPException) as e:
+            embed = self.embed_builder.error_embed("Import Failed", str(e))
+            await interaction.followup.send(embed=embed)
+            return
+        
+        changes = {}
+        if dry_run:
+            for user_id, fields in deltas.items():
+                new = dict(players[user_id])
+                for field, value in fields.items():
+                    new[field] = new.get(field, 0) + value
+                changes[user_id] = (players[user_id], new)
+        elif deltas:
+            changes = self.db.apply_stat_deltas(deltas)
+        
+        embed = (self.embed_builder.info_embed if dry_run else self.embed_builder.success_embed)(
+            "🔍 Import Preview" if dry_run else "📥 Results Imported",
+            f"**{rows - len(errors)}** of **{rows}** rows {'are valid' if dry_run else 'applied'} "
+            f"for **{len(changes)}** players from `{file.filename}`"
+        )
+        
+        totals = {field: sum(fields[field] for fields in deltas.values()) for field in STAT_FIELDS}
+        embed.add_field(
+            name="📊 Total Changes",
+            value="\n".join(f"**{field.title()}:** {totals[field]:+d}" for field in STAT_FIELDS),
+            inline=True
+        )
+        
+        # Biggest movers first
+        diff_lines = []
+        for user_id, (old, new) in sorted(
+            changes.items(), key=lambda item: -sum(abs(v) for v in deltas[item[0]].values())
+        ):
+            parts = [
+                f"{field[0].upper()} {old.get(field, 0)}→{new.get(field, 0)}"
+                for field in STAT_FIELDS if deltas[user_id][field]
+            ]
+            if parts:
+                diff_lines.append(f"**{new.get('display_name', 'Unknown')}:** {', '.join(parts)}")
+        if diff_lines:
+            shown = diff_lines[:10]
+            if len(diff_lines) > 10:
+                shown.append(f"*...and {len(diff_lines) - 10} more*")
+            embed.add_field(name="📈 Player Changes", value="\n".join(shown)[:1024], inline=False)
+        
+        report = None
+        if errors:
+            shown = [f"Row {number}: {message}" for number, message in errors[:10]]
+            if len(errors) > 10:
+                shown.append(f"...and {len(errors) - 10} more (see attached report)")
+                report = discord.File(
+                    io.BytesIO("\n".join(f"Row {number}: {message}" for number, message in errors).encode()),
+                    filename="import_errors.txt"
+                )
+            embed.add_field(name=f"⚠️ Skipped Rows ({len(errors)})", value="\n".join(shown)[:1024], inline=False)
+        
+        embed.set_footer(text="Nothing was saved" if dry_run else f"Imported by {interaction.user.display_name}")
+        if report:
+            await interaction.followup.send(embed=embed, file=report)
+        else:
+            await interaction.followup.send(embed=embed)
+        
+        if changes and not dry_run:
+            print(f"📥 Imported {rows - len(errors)} result rows for {len(changes)} players")
+    
+    @app_commands.command(name="scheduler_stats", description="Show scheduler lag and throughput metrics (Admin only)")
+    async def scheduler_stats(self, interaction: discord.Interaction):
+        """Show rolling scheduler and outbound queue metrics"""
+        if not self.is_admin(interaction):
+            await interaction.response.send_message(
+                "❌ Only administrators can view scheduler stats!", 
+                ephemeral=True
+            )
+            return
+        
+        snapshot = metrics.snapshot()
+        embed = self.embed_builder.stats_embed(
+            "📈 Scheduler Metrics",
+            f"Rolling percentiles over the last {HISTOGRAM_WINDOW} samples per metric"
+        )
+        
+        if not snapshot:
+            embed.add_field(name="📭 No Data", value="No events have been dispatched yet.", inline=False)
+        
+        for name, summary in snapshot.items():
+            # Per-command timings have their own view in /perf
+            if not summary['window'] or name.startswith('command.'):
+                continue
+            # Durations are shown in milliseconds, depths as plain counts
+            if name.endswith('_seconds'):
+                label, fmt = name[:-len('_seconds')], lambda v: f"{v * 1000:.1f} ms"
+            else:
+                label, fmt = name, lambda v: f"{v:.0f}"
+            embed.add_field(
+                name=f"⏱️ {label}",
+                value=f"**p50:** {fmt(summary['p50'])}\n"
+                      f"**p90:** {fmt(summary['p90'])}\n"
+                      f"**p99:** {fmt(summary['p99'])}\n"
+                      f"**max:** {fmt(summary['max'])}\n"
+                      f"**samples:** {summary['count']}",
+                inline=True
+            )
+        
+        throttle = self.bot.throttle.stats()
+        if throttle:
+            embed.add_field(
+                name="🚦 Command Throttle",
+                value="\n".join(
+                    f"**/{command}:** {counters['throttled']}/{counters['hits']} throttled"
+                    for command, counters in sorted(throttle.items())
+                ),
+                inline=False
+            )
+        
+        embed.set_footer(text=f"Pending DMs: {self.bot.outbox.depth}")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="perf", description="Show per-command latency and the slow-command log (Admin only)")
+    async def perf(self, interaction: discord.Interaction):
+        """Show rolling per-command timings split into storage and Discord time"""
+        if not self.is_admin(interaction):
+            await interaction.response.send_message(
+                "❌ Only administrators can view command performance!", 
+                ephemeral=True
+            )
+            return
+        
+        # command -> {part: summary} from the command.<name>.<part> histograms
+        commands_seen = {}
+        for name, summary in metrics.snapshot().items():
+            if name.startswith('command.') and summary['window']:
+                command, part = name[len('command.'):].rsplit('.', 1)
+                commands_seen.setdefault(command, {})[part] = summary
+        
+        embed = self.embed_builder.stats_embed(
+            "⏱️ Command Performance",
+            f"Rolling percentiles over the last {HISTOGRAM_WINDOW} runs per command, slowest p99 first"
+        )
+        
+        if not commands_seen:
+            embed.add_field(name="📭 No Data", value="No commands have been timed yet.", inline=False)
+        
+        ranked = sorted(commands_seen.items(), key=lambda item: item[1]['wall_seconds']['p99'], reverse=True)
+        for command, parts in ranked[:20]:
+            wall, storage, api = parts['wall_seconds'], parts['storage_seconds'], parts['discord_seconds']
+            embed.add_field(
+                name=f"/{command}",
+                value=f"**p50:** {wall['p50'] * 1000:.0f} ms\n"
+                      f"**p99:** {wall['p99'] * 1000:.0f} ms\n"
+                      f"**storage p50:** {storage['p50'] * 1000:.0f} ms\n"
+                      f"**discord p50:** {api['p50'] * 1000:.0f} ms\n"
+                      f"**sent p50:** {parts['payload_bytes']['p50'] / 1024:.1f} KB\n"
+                      f"**runs:** {wall['count']}",
+                inline=True
+            )
+        
+        if slow_log:
+            embed.add_field(
+                name=f"🐢 Slow Commands (over {SLOW_COMMAND_SECONDS:g}s)",
+                value="\n".join(
+                    f"<t:{int(entry['at'])}:R> **/{entry['command']}** {entry['wall']:.2f}s "
+                    f"(storage {entry['storage']:.2f}s, discord {entry['discord']:.2f}s"
+                    f"{', failed' if entry['failed'] else ''})"
+                    for entry in list(slow_log)[-5:]
+                ),
+                inline=False
+            )
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
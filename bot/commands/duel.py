@@ -3,16 +3,25 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta
 import re
-from bot.utils.embeds import EmbedBuilder
+import time
+from bot.utils.embeds import EmbedBuilder, format_lead
 from bot.utils.database import Database
-from bot.utils.scheduler import DuelScheduler
+from bot.utils.messaging import PRIORITY_ANNOUNCEMENT
+from bot.utils.pairing import make_duel_record, pack_slots, round_robin_pairs, swiss_pairs
+from bot.utils.scheduler import parse_tiers, resolve_duel_date
+from bot.utils.search import duel_index
 
 class DuelCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
         self.embed_builder = EmbedBuilder()
-        self.scheduler = DuelScheduler(bot)
+        self.scheduler = bot.scheduler
+        self.intervals = bot.intervals
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Apply the per-user and per-guild command throttle"""
+        return self.bot.throttle.check_interaction(interaction)
     
     def is_admin(self, interaction: discord.Interaction) -> bool:
         """Check if user has administrator permissions"""
@@ -20,13 +29,47 @@ class DuelCommands(commands.Cog):
             return interaction.user.guild_permissions.administrator
         return False
     
+    def _describe_tiers(self, tiers: list) -> str:
+        """Describe reminder tiers, e.g. '1 day, 1 hour, 5 minutes before + at start'"""
+        before = [format_lead(lead) for lead in tiers if lead > 0]
+        text = f"{', '.join(before)} before" if before else "none"
+        return f"{text} + at start" if 0 in tiers else text
+    
+    def _challenge_embed(self, opponent_mention: str, opponent_name: str, opponent_data: dict, timestamp: int) -> discord.Embed:
+        """Build the private 'you have been challenged' message for one duel participant"""
+        embed = self.embed_builder.duel_notification_embed(
+            "⚔️ You Have Been Challenged!",
+            f"Your duel against {opponent_mention} has been scheduled!"
+        )
+        embed.add_field(
+            name="🥊 Your Opponent",
+            value=f"**{opponent_name}**\n"
+                  f"Record: {opponent_data['wins']}W-{opponent_data['losses']}L\n"
+                  f"K/D: {(opponent_data['kills'] / max(1, opponent_data['deaths'])):.2f}",
+            inline=True
+        )
+        embed.add_field(
+            name="⏰ Battle Time",
+            value=f"<t:{timestamp}:F>\n"
+                  f"<t:{timestamp}:R>",
+            inline=True
+        )
+        embed.add_field(
+            name="🎮 Connection Info",
+            value=f"**Server:** {self.bot.server_ip}:{self.bot.server_port}\n"
+                  f"**Be online 5 minutes early!**",
+            inline=False
+        )
+        return embed
+    
     @app_commands.command(name="duel", description="Schedule a duel between two players (Admin only)")
     @app_commands.describe(
         player1="First player",
         player2="Second player", 
         day="Day (1-31)",
         hour="Hour (0-23)",
-        minute="Minute (0-59)"
+        minute="Minute (0-59)",
+        reminders="Reminder tiers for this duel, e.g. \"24h, 1h, 5m, start\" (defaults to the server setting)"
     )
     async def schedule_duel(
         self,
@@ -35,7 +78,8 @@ class DuelCommands(commands.Cog):
         player2: discord.Member,
         day: int,
         hour: int,
-        minute: int
+        minute: int,
+        reminders: str = ""
     ):
         """Schedule a duel between two players"""
         if not self.is_admin(interaction):
@@ -78,20 +122,10 @@ class DuelCommands(commands.Cog):
         
         # Validate date/time
         try:
-            current_date = datetime.now()
-            current_year = current_date.year
-            current_month = current_date.month
-            
-            # Handle month overflow
-            if day < current_date.day and current_month == 12:
-                duel_date = datetime(current_year + 1, 1, day, hour, minute)
-            elif day < current_date.day:
-                duel_date = datetime(current_year, current_month + 1, day, hour, minute)
-            else:
-                duel_date = datetime(current_year, current_month, day, hour, minute)
+            duel_date = resolve_duel_date(day, hour, minute)
             
             # Ensure duel is in the future
-            if duel_date <= current_date:
+            if duel_date <= datetime.now():
                 embed = self.embed_builder.error_embed(
                     "Invalid Date",
                     "Duel must be scheduled for a future date and time!"
@@ -107,6 +141,32 @@ class DuelCommands(commands.Cog):
             await interaction.followup.send(embed=embed)
             return
         
+        # Validate reminder tiers
+        try:
+            reminder_tiers = parse_tiers(reminders) if reminders else None
+        except ValueError as e:
+            embed = self.embed_builder.error_embed(
+                "Invalid Reminder Tiers",
+                f"{str(e)}\nUse values like `24h, 1h, 5m, start`."
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
+        # Make sure neither player is already booked for an overlapping slot
+        clash = self.intervals.find_conflict((player1.id, player2.id), int(duel_date.timestamp()))
+        if clash:
+            busy_id, clash_start, clash_id = clash
+            busy = player1 if busy_id == player1.id else player2
+            suggestion = self.intervals.nearest_free((player1.id, player2.id), int(duel_date.timestamp()))
+            embed = self.embed_builder.error_embed(
+                "Schedule Conflict",
+                f"{busy.mention} already has a duel at <t:{clash_start}:F> (`{clash_id[:8]}`).\n"
+                f"Each duel is booked for {self.intervals.length // 60} minutes.\n\n"
+                f"**Nearest free slot:** <t:{suggestion}:F> (<t:{suggestion}:R>)"
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
         # Create duel record
         duel_id = f"{player1.id}_{player2.id}_{int(duel_date.timestamp())}"
         duel_data = {
@@ -119,11 +179,15 @@ class DuelCommands(commands.Cog):
             "timestamp": int(duel_date.timestamp()),
             "status": "scheduled",
             "scheduled_by": interaction.user.id,
+            "guild_id": interaction.guild_id,
+            "reminder_tiers": reminder_tiers,
             "created_at": discord.utils.utcnow().isoformat(),
             "reminder_sent": False
         }
         
         self.db.add_duel(duel_id, duel_data)
+        self.intervals.add_duel(duel_data)
+        self.scheduler.schedule_duel(duel_data)
         
         # Create luxury duel announcement embed
         embed = self.embed_builder.duel_embed(
@@ -205,66 +269,146 @@ class DuelCommands(commands.Cog):
         await interaction.followup.send(embed=embed)
         
         # Send private messages to both players
-        try:
-            # Message to player 1
-            dm_embed1 = self.embed_builder.duel_notification_embed(
-                "⚔️ You Have Been Challenged!",
-                f"Your duel against {player2.mention} has been scheduled!"
-            )
-            dm_embed1.add_field(
-                name="🥊 Your Opponent",
-                value=f"**{player2.display_name}**\n"
-                      f"Record: {p2_data['wins']}W-{p2_data['losses']}L\n"
-                      f"K/D: {(p2_data['kills'] / max(1, p2_data['deaths'])):.2f}",
-                inline=True
+        dm_embed1 = self._challenge_embed(player2.mention, player2.display_name, p2_data, int(duel_date.timestamp()))
+        dm_embed2 = self._challenge_embed(player1.mention, player1.display_name, p1_data, int(duel_date.timestamp()))
+        
+        outcomes = await self.bot.outbox.send_many([
+            (player1, {'embed': dm_embed1}),
+            (player2, {'embed': dm_embed2})
+        ], PRIORITY_ANNOUNCEMENT)
+        
+        if any(outcome != 'sent' for outcome in outcomes.values()):
+            # Add note about DM failure
+            note_embed = self.embed_builder.warning_embed(
+                "📬 DM Notification Issue",
+                "One or both players may have DMs disabled. Please check the server for duel details."
             )
-            dm_embed1.add_field(
-                name="⏰ Battle Time",
-                value=f"<t:{int(duel_date.timestamp())}:F>\n"
-                      f"<t:{int(duel_date.timestamp())}:R>",
-                inline=True
+            await interaction.followup.send(embed=note_embed, ephemeral=True)
+    
+    @app_commands.command(name="generate_round", description="Pair all registered players and schedule a full round (Admin only)")
+    @app_commands.describe(
+        mode="How players are paired",
+        day="Day of the first slot (1-31)",
+        hour="Hour of the first slot (0-23)",
+        minute="Minute of the first slot (0-59)",
+        parallel="How many duels can run at the same time (default 1)"
+    )
+    @app_commands.choices(mode=[
+        app_commands.Choice(name="Swiss (similar scores, no rematches)", value="swiss"),
+        app_commands.Choice(name="Round-robin (next rotation)", value="round_robin")
+    ])
+    async def generate_round(
+        self,
+        interaction: discord.Interaction,
+        mode: app_commands.Choice[str],
+        day: int,
+        hour: int,
+        minute: int,
+        parallel: int = 1
+    ):
+        """Generate pairings for every registered player and pack them into time slots"""
+        if not self.is_admin(interaction):
+            await interaction.response.send_message(
+                "❌ Only administrators can generate rounds!", 
+                ephemeral=True
             )
-            dm_embed1.add_field(
-                name="🎮 Connection Info",
-                value=f"**Server:** {self.bot.server_ip}:{self.bot.server_port}\n"
-                      f"**Be online 5 minutes early!**",
-                inline=False
+            return
+        
+        await interaction.response.defer()
+        
+        try:
+            start_date = resolve_duel_date(day, hour, minute)
+            if start_date <= datetime.now():
+                raise ValueError("the first slot must be in the future")
+            if parallel < 1:
+                raise ValueError("parallel must be at least 1")
+        except ValueError as e:
+            embed = self.embed_builder.error_embed(
+                "Invalid Round Settings",
+                f"Please check your values: {str(e)}"
             )
-            await player1.send(embed=dm_embed1)
-            
-            # Message to player 2
-            dm_embed2 = self.embed_builder.duel_notification_embed(
-                "⚔️ You Have Been Challenged!",
-                f"Your duel against {player1.mention} has been scheduled!"
-            )
-            dm_embed2.add_field(
-                name="🥊 Your Opponent", 
-                value=f"**{player1.display_name}**\n"
-                      f"Record: {p1_data['wins']}W-{p1_data['losses']}L\n"
-                      f"K/D: {(p1_data['kills'] / max(1, p1_data['deaths'])):.2f}",
-                inline=True
+            await interaction.followup.send(embed=embed)
+            return
+        
+        roster = {int(user_id): player for user_id, player in self.db.get_all_players().items()}
+        if len(roster) < 2:
+            embed = self.embed_builder.error_embed(
+                "Not Enough Players",
+                "At least two registered players are needed to generate a round!"
             )
-            dm_embed2.add_field(
-                name="⏰ Battle Time",
-                value=f"<t:{int(duel_date.timestamp())}:F>\n"
-                      f"<t:{int(duel_date.timestamp())}:R>",
+            await interaction.followup.send(embed=embed)
+            return
+        
+        started = time.perf_counter()
+        settings = self.db.get_guild_settings().get(str(interaction.guild_id), {})
+        round_number = settings.get('round_robin_round', 0)
+        
+        if mode.value == 'swiss':
+            played = {frozenset((d['player1_id'], d['player2_id'])) for d in self.db.get_all_duels().values()}
+            pairs, bye = swiss_pairs(roster, played, set(settings.get('swiss_byes', [])))
+        else:
+            pairs, bye = round_robin_pairs(list(roster), round_number)
+        
+        packed = pack_slots(pairs, int(start_date.timestamp()), self.intervals, parallel)
+        
+        # Build every duel record first, then commit them in one write
+        new_duels = {}
+        for p1, p2, timestamp in packed:
+            duel = make_duel_record(
+                p1, p2, roster[p1].get('display_name', 'Unknown'), roster[p2].get('display_name', 'Unknown'),
+                timestamp, interaction.user.id, interaction.guild_id, round=mode.value
+            )
+            new_duels[duel['id']] = duel
+        
+        self.db.add_duels(new_duels)
+        self.scheduler.schedule_duels(list(new_duels.values()))
+        if mode.value == 'round_robin':
+            self.db.update_guild_settings(interaction.guild_id, {'round_robin_round': round_number + 1})
+        elif bye is not None:
+            self.db.update_guild_settings(interaction.guild_id, {'swiss_byes': settings.get('swiss_byes', []) + [bye]})
+        print(f"🗓️ Generated {mode.value} round: {len(new_duels)} duels in {(time.perf_counter() - started) * 1000:.0f} ms")
+        
+        embed = self.embed_builder.duel_list_embed(
+            "🗓️ Round Generated!",
+            f"**{len(new_duels)}** duels scheduled ({mode.name})"
+        )
+        
+        lines = [
+            f"<t:{timestamp}:t> **{roster[p1].get('display_name', 'Unknown')}** 🆚 **{roster[p2].get('display_name', 'Unknown')}**"
+            for p1, p2, timestamp in packed[:15]
+        ]
+        if len(packed) > 15:
+            lines.append(f"...and {len(packed) - 15} more")
+        embed.add_field(name="⚔️ Pairings", value="\n".join(lines) or "None", inline=False)
+        
+        if packed:
+            embed.add_field(
+                name="⏰ Schedule",
+                value=f"**First:** <t:{packed[0][2]}:F>\n"
+                      f"**Last:** <t:{max(t for _, _, t in packed)}:F>\n"
+                      f"**Parallel Duels:** {parallel}",
                 inline=True
             )
-            dm_embed2.add_field(
-                name="🎮 Connection Info", 
-                value=f"**Server:** {self.bot.server_ip}:{self.bot.server_port}\n"
-                      f"**Be online 5 minutes early!**",
+        if bye is not None:
+            embed.add_field(name="💤 Bye", value=roster[bye].get('display_name', 'Unknown'), inline=True)
+        if len(packed) < len(pairs):
+            embed.add_field(
+                name="⚠️ Not Scheduled",
+                value=f"{len(pairs) - len(packed)} pairing(s) could not be fitted around existing duels.",
                 inline=False
             )
-            await player2.send(embed=dm_embed2)
-            
-        except discord.Forbidden:
-            # Add note about DM failure
-            note_embed = self.embed_builder.warning_embed(
-                "📬 DM Notification Issue",
-                "One or both players may have DMs disabled. Please check the server for duel details."
-            )
-            await interaction.followup.send(embed=note_embed, ephemeral=True)
+        
+        await interaction.followup.send(embed=embed)
+        
+        # Tell every player who they face and when
+        users = await self.bot.resolver.resolve_many(list(roster), interaction.guild_id)
+        deliveries = []
+        for p1, p2, timestamp in packed:
+            for player_id, opponent_id in ((p1, p2), (p2, p1)):
+                opponent = roster[opponent_id]
+                dm_embed = self._challenge_embed(f"<@{opponent_id}>", opponent.get('display_name', 'Unknown'), opponent, timestamp)
+                deliveries.append((users.get(player_id), {'embed': dm_embed}))
+        await self.bot.outbox.send_many(deliveries, PRIORITY_ANNOUNCEMENT)
     
     @app_commands.command(name="duels", description="View upcoming scheduled duels")
     async def view_duels(self, interaction: discord.Interaction):
@@ -292,8 +436,8 @@ class DuelCommands(commands.Cog):
         
         for i, duel in enumerate(upcoming_duels[:10], 1):  # Show max 10 duels
             try:
-                player1 = self.bot.get_user(duel['player1_id'])
-                player2 = self.bot.get_user(duel['player2_id'])
+                player1 = self.bot.resolver.get(duel['player1_id'])
+                player2 = self.bot.resolver.get(duel['player2_id'])
                 
                 p1_name = player1.display_name if player1 else duel['player1_name']
                 p2_name = player2.display_name if player2 else duel['player2_name']
@@ -316,7 +460,7 @@ class DuelCommands(commands.Cog):
             name="🎮 Arena Information",
             value=f"**Server:** {self.bot.server_ip}:{self.bot.server_port}\n"
                   f"**Tournament Mode:** Active\n"
-                  f"**Reminders:** 5 minutes before each duel",
+                  f"**Reminders:** {self._describe_tiers(self.scheduler.tiers_for({'guild_id': interaction.guild_id}))}",
             inline=False
         )
         
@@ -325,7 +469,7 @@ class DuelCommands(commands.Cog):
         await interaction.followup.send(embed=embed)
     
     @app_commands.command(name="cancel_duel", description="Cancel a scheduled duel (Admin only)")
-    @app_commands.describe(duel_id="The duel ID to cancel (first 8 characters)")
+    @app_commands.describe(duel_id="The duel to cancel (search by player name or ID)")
     async def cancel_duel(self, interaction: discord.Interaction, duel_id: str):
         """Cancel a scheduled duel"""
         if not self.is_admin(interaction):
@@ -356,16 +500,31 @@ class DuelCommands(commands.Cog):
         
         # Remove the duel
         self.db.remove_duel(matching_duel['id'])
+        self.intervals.remove_duel(matching_duel)
+        self.scheduler.cancel_duel(matching_duel['id'])
+        
+        # A bracket match cannot simply disappear; give it a new slot
+        requeued = self.bot.brackets.requeue(matching_duel, interaction.user.id) if matching_duel.get('bracket_id') else []
         
         # Create cancellation embed
         embed = self.embed_builder.warning_embed(
             "🚫 Duel Cancelled",
             "The scheduled duel has been cancelled."
         )
+        if requeued:
+            embed.add_field(
+                name="🏆 Bracket Match Rescheduled",
+                value=f"The bracket match was rescheduled for <t:{requeued[0]['timestamp']}:F> "
+                      f"(ID: `{requeued[0]['id'][:8]}`)",
+                inline=False
+            )
         
         try:
-            player1 = self.bot.get_user(matching_duel['player1_id'])
-            player2 = self.bot.get_user(matching_duel['player2_id'])
+            users = await self.bot.resolver.resolve_many(
+                [matching_duel['player1_id'], matching_duel['player2_id']], matching_duel.get('guild_id')
+            )
+            player1 = users.get(matching_duel['player1_id'])
+            player2 = users.get(matching_duel['player2_id'])
             
             p1_name = player1.display_name if player1 else matching_duel['player1_name']
             p2_name = player2.display_name if player2 else matching_duel['player2_name']
@@ -384,13 +543,10 @@ class DuelCommands(commands.Cog):
                 f"Your scheduled duel has been cancelled by an administrator."
             )
             
-            try:
-                if player1:
-                    await player1.send(embed=cancellation_embed)
-                if player2:
-                    await player2.send(embed=cancellation_embed)
-            except discord.Forbidden:
-                pass
+            await self.bot.outbox.send_many([
+                (player1, {'embed': cancellation_embed}),
+                (player2, {'embed': cancellation_embed})
+            ], PRIORITY_ANNOUNCEMENT)
                 
         except:
             embed.add_field(
@@ -401,3 +557,174 @@ class DuelCommands(commands.Cog):
             )
         
         await interaction.followup.send(embed=embed)
+    
+    @cancel_duel.autocomplete('duel_id')
+    async def duel_id_autocomplete(self, interaction: discord.Interaction, current: str) -> list:
+        """Suggest scheduled duels by id or player name"""
+        return [
+            app_commands.Choice(name=label[:100], value=value)
+            for value, label in duel_index(self.db).search(current)
+        ]
+    
+    @app_commands.command(name="result", description="Record the outcome of a duel (Admin only)")
+    @app_commands.describe(
+        duel_id="The duel to close (search by player name or ID)",
+        winner="Who won the duel",
+        p1_kills="Kills scored by the first player",
+        p2_kills="Kills scored by the second player"
+    )
+    @app_commands.choices(winner=[
+        app_commands.Choice(name="Player 1", value="player1"),
+        app_commands.Choice(name="Player 2", value="player2"),
+        app_commands.Choice(name="Draw", value="draw")
+    ])
+    async def record_result(
+        self,
+        interaction: discord.Interaction,
+        duel_id: str,
+        winner: str,
+        p1_kills: int = 0,
+        p2_kills: int = 0
+    ):
+        """Close a duel and update both players, their head-to-head and any bracket"""
+        if not self.is_admin(interaction):
+            await interaction.response.send_message(
+                "❌ Only administrators can record results!", 
+                ephemeral=True
+            )
+            return
+        
+        if p1_kills < 0 or p2_kills < 0:
+            await interaction.response.send_message(
+                "❌ Kills cannot be negative!", 
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer()
+        
+        duel = self.db.get_duel(duel_id)
+        if not duel or duel.get('status') not in ('scheduled', 'in_progress'):
+            embed = self.embed_builder.error_embed(
+                "Duel Not Found",
+                f"No open duel found with ID `{duel_id}`" if not duel else
+                f"Duel `{duel_id[:8]}` has already been completed"
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
+        if winner == 'draw' and duel.get('bracket_id'):
+            embed = self.embed_builder.error_embed(
+                "Draw Not Allowed",
+                "Bracket duels need a winner to advance the bracket."
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
+        winner_id = {'player1': duel['player1_id'], 'player2': duel['player2_id']}.get(winner)
+        result = self.db.record_duel_result(duel['id'], winner_id, p1_kills, p2_kills, interaction.user.id)
+        if not result:
+            embed = self.embed_builder.error_embed(
+                "Duel Not Found",
+                f"Duel `{duel_id[:8]}` was closed in the meantime"
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
+        self.intervals.remove_duel(duel)
+        self.scheduler.cancel_duel(duel['id'])
+        next_duels = []
+        if winner_id and duel.get('bracket_id'):
+            next_duels = self.bot.brackets.record_result(result['duel'], winner_id)
+        
+        if winner_id:
+            winner_name = duel['player1_name'] if winner_id == duel['player1_id'] else duel['player2_name']
+            embed = self.embed_builder.success_embed(
+                "🏆 Duel Result Recorded",
+                f"**{winner_name}** wins the duel!"
+            )
+        else:
+            embed = self.embed_builder.success_embed(
+                "🤝 Duel Result Recorded",
+                "The duel ended in a draw!"
+            )
+        embed.add_field(
+            name="⚔️ Final Score",
+            value=f"**{duel['player1_name']}** {p1_kills} - {p2_kills} **{duel['player2_name']}**",
+            inline=False
+        )
+        
+        for player_id in (duel['player1_id'], duel['player2_id']):
+            change = result['players'].get(str(player_id))
+            if not change:
+                continue
+            old, new = change
+            record = new['head_to_head'][str(duel['player2_id'] if player_id == duel['player1_id'] else duel['player1_id'])]
+            embed.add_field(
+                name=f"📊 {new.get('display_name', 'Unknown')}",
+                value=f"**Record:** {new['wins']}W-{new['losses']}L-{new['draws']}D\n"
+                      f"**Kills:** {old['kills']} → {new['kills']}\n"
+                      f"**Deaths:** {old['deaths']} → {new['deaths']}\n"
+                      f"**Head-to-Head:** {record['wins']}-{record['losses']}-{record['draws']}",
+                inline=True
+            )
+        
+        if next_duels:
+            embed.add_field(
+                name="🗂️ Bracket Advanced",
+                value="\n".join(
+                    f"**{d['player1_name']}** vs **{d['player2_name']}** • <t:{d['timestamp']}:F>"
+                    for d in next_duels
+                ),
+                inline=False
+            )
+        
+        embed.set_footer(text=f"Recorded by {interaction.user.display_name}")
+        await interaction.followup.send(embed=embed)
+    
+    @record_result.autocomplete('duel_id')
+    async def open_duel_autocomplete(self, interaction: discord.Interaction, current: str) -> list:
+        """Suggest scheduled and running duels by id or player name"""
+        return [
+            app_commands.Choice(name=label[:100], value=value)
+            for value, label in duel_index(self.db, ('scheduled', 'in_progress')).search(current)
+        ]
+    
+    @app_commands.command(name="reminders", description="View or set this server's duel reminder tiers (Admin only)")
+    @app_commands.describe(tiers="Comma separated tiers, e.g. \"24h, 1h, 5m, start\" (leave empty to view)")
+    async def reminder_tiers(self, interaction: discord.Interaction, tiers: str = ""):
+        """View or configure the server's default reminder tiers"""
+        if not tiers:
+            current = self.scheduler.tiers_for({'guild_id': interaction.guild_id})
+            embed = self.embed_builder.info_embed(
+                "🔔 Duel Reminder Tiers",
+                f"**Reminders:** {self._describe_tiers(current)}"
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if not self.is_admin(interaction):
+            await interaction.response.send_message(
+                "❌ Only administrators can change reminder tiers!", 
+                ephemeral=True
+            )
+            return
+        
+        try:
+            parsed = parse_tiers(tiers)
+        except ValueError as e:
+            embed = self.embed_builder.error_embed(
+                "Invalid Reminder Tiers",
+                f"{str(e)}\nUse values like `24h, 1h, 5m, start`."
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        self.scheduler.set_guild_tiers(interaction.guild_id, parsed)
+        
+        embed = self.embed_builder.success_embed(
+            "🔔 Reminder Tiers Updated",
+            f"**Reminders:** {self._describe_tiers(parsed)}\n"
+            f"Upcoming duels without their own tiers have been rescheduled."
+        )
+        await interaction.response.send_message(embed=embed)
@@ -3,6 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from bot.utils.embeds import EmbedBuilder
 from bot.utils.database import Database
+from bot.utils.search import player_index
 
 class StatsCommands(commands.Cog):
     def __init__(self, bot):
@@ -10,15 +11,45 @@ class StatsCommands(commands.Cog):
         self.db = Database()
         self.embed_builder = EmbedBuilder()
     
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Apply the per-user and per-guild command throttle"""
+        return self.bot.throttle.check_interaction(interaction)
+    
+    async def _resolve_player(self, value: str, guild_id: int | None):
+        """Turn an autocompleted user id, a mention or a typed player name into a user"""
+        digits = ''.join(ch for ch in value if ch.isdigit())
+        if not digits or not self.db.get_player(int(digits)):
+            # Typed a name without picking a suggestion
+            matches = player_index(self.db).search(value, 1)
+            if matches:
+                digits = matches[0][0]
+        if not digits:
+            return None
+        return await self.bot.resolver.resolve(int(digits), guild_id)
+    
+    async def player_autocomplete(self, interaction: discord.Interaction, current: str) -> list:
+        """Suggest registered players by name, username or id"""
+        return [
+            app_commands.Choice(name=label[:100], value=value)
+            for value, label in player_index(self.db).search(current)
+        ]
+    
     @app_commands.command(name="stats", description="View detailed player statistics")
     @app_commands.describe(user="The player to view stats for (defaults to yourself)")
-    async def player_stats(self, interaction: discord.Interaction, user: discord.Member = None):
+    @app_commands.autocomplete(user=player_autocomplete)
+    async def player_stats(self, interaction: discord.Interaction, user: str = ""):
         """Display detailed player statistics"""
-        if user is None:
-            user = interaction.user
-        
         await interaction.response.defer()
         
+        user = await self._resolve_player(user, interaction.guild_id) if user else interaction.user
+        if user is None:
+            embed = self.embed_builder.error_embed(
+                "Player Not Found",
+                "No registered player matches that name."
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
         # Get player data
         player = self.db.get_player(user.id)
         
@@ -191,15 +222,26 @@ class StatsCommands(commands.Cog):
         player1="First player to compare",
         player2="Second player to compare"
     )
+    @app_commands.autocomplete(player1=player_autocomplete, player2=player_autocomplete)
     async def compare_players(
         self, 
         interaction: discord.Interaction, 
-        player1: discord.Member, 
-        player2: discord.Member
+        player1: str, 
+        player2: str
     ):
         """Compare statistics between two players"""
         await interaction.response.defer()
         
+        player1 = await self._resolve_player(player1, interaction.guild_id)
+        player2 = await self._resolve_player(player2, interaction.guild_id)
+        if player1 is None or player2 is None:
+            embed = self.embed_builder.error_embed(
+                "Player Not Found",
+                "No registered player matches that name."
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
         # Get both players' data
         p1_data = self.db.get_player(player1.id)
         p2_data = self.db.get_player(player2.id)
@@ -291,11 +333,17 @@ class StatsCommands(commands.Cog):
                     if (d['player1_id'] == player1.id and d['player2_id'] == player2.id) or
                        (d['player1_id'] == player2.id and d['player2_id'] == player1.id)]
         
+        record = p1_data.get('head_to_head', {}).get(str(player2.id))
+        if record:
+            series = f"{record['wins']}-{record['losses']}-{record['draws']} for {player1.display_name}"
+        else:
+            series = "No results recorded yet"
+        
         if h2h_duels:
             embed.add_field(
                 name="🔥 Head-to-Head History",
                 value=f"**Total Encounters:** {len(h2h_duels)}\n"
-                      f"**Series Status:** Under Development\n"
+                      f"**Series Status:** {series}\n"
                       f"**Rivalry Level:** {'🔥 INTENSE' if len(h2h_duels) >= 3 else '⚡ DEVELOPING'}",
                 inline=False
             )
@@ -357,7 +405,7 @@ class StatsCommands(commands.Cog):
         
         for i, player in enumerate(sorted_players[:10]):
             try:
-                user = self.bot.get_user(player['user_id'])
+                user = self.bot.resolver.get(player['user_id'])
                 name = user.display_name if user else player['display_name']
                 medal = medals[i] if i < len(medals) else "💀"
                 kd_ratio = player['kills'] / max(1, player['deaths'])
@@ -1,10 +1,18 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+from datetime import datetime
 from bot.utils.embeds import EmbedBuilder
 from bot.utils.database import Database
+from bot.utils.pagination import PageView
+from bot.utils.ranking import get_ranked
+from bot.utils.scheduler import resolve_duel_date
+from bot.utils.search import bracket_index
 from bot.utils.translations import Translator
 
+FIGHTERS_PER_PAGE = 10
+LEADERBOARD_PER_PAGE = 10
+
 class TournamentCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -12,187 +20,111 @@ class TournamentCommands(commands.Cog):
         self.embed_builder = EmbedBuilder()
         self.translator = Translator()
     
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Apply the per-user and per-guild command throttle"""
+        return self.bot.throttle.check_interaction(interaction)
+    
+    def is_admin(self, interaction: discord.Interaction) -> bool:
+        """Check if user has administrator permissions"""
+        if hasattr(interaction.user, 'guild_permissions'):
+            return interaction.user.guild_permissions.administrator
+        return False
+    
     @app_commands.command(name="ip", description="Get BombSquad server connection info")
     async def server_ip(self, interaction: discord.Interaction):
         """Display server IP and port information"""
-        embed = self.embed_builder.info_embed(
-            "🎮 BombSquad Server Information",
-            "Connect to our official tournament server!"
-        )
-        embed.add_field(
-            name="🌐 Connection Details",
-            value=f"**IP Address:** `{self.bot.server_ip}`\n"
-                  f"**Port:** `{self.bot.server_port}`\n"
-                  f"**Full Address:** `{self.bot.server_ip}:{self.bot.server_port}`",
-            inline=False
-        )
-        embed.add_field(
-            name="📋 How to Connect",
-            value="1. Open BombSquad\n"
-                  "2. Go to Play → Network → Connect by Address\n"
-                  "3. Enter the IP address above\n"
-                  "4. Click Connect and join the tournament!",
-            inline=False
-        )
-        embed.add_field(
-            name="⚡ Server Status",
-            value="🟢 **Online** - Ready for duels!\n"
-                  "🏆 Tournament Mode Active\n"
-                  "👥 Players Welcome",
-            inline=False
-        )
-        embed.set_footer(text="Good luck in your duels!")
+        embed = self.embed_builder.server_info_embed(self.bot.server_ip, self.bot.server_port)
         
         await interaction.response.send_message(embed=embed)
     
-    @app_commands.command(name="fighters", description="View all tournament fighters")
-    async def fighters(self, interaction: discord.Interaction):
-        """Display all registered tournament fighters"""
-        await interaction.response.defer()
-        
-        players = self.db.get_all_players()
-        
-        if not players:
-            embed = self.embed_builder.warning_embed(
-                "No Fighters Found",
-                "No players are currently registered for the tournament.\nAdministrators can register players using `/register`."
-            )
-            await interaction.followup.send(embed=embed)
-            return
-        
-        # Sort players by total wins
-        sorted_players = sorted(players.values(), key=lambda x: x['wins'], reverse=True)
-        
+    def _fighters_page(self, offset: int) -> tuple:
+        """Render one page of the fighter roster"""
+        index = get_ranked(self.db, 'wins')
         embed = self.embed_builder.tournament_embed(
             "⚔️ Tournament Fighters",
-            f"Currently {len(players)} brave warriors are registered!"
+            f"Currently {len(index)} brave warriors are registered!"
         )
         
-        # Add players in chunks of 10
-        for i in range(0, len(sorted_players), 10):
-            chunk = sorted_players[i:i+10]
-            fighter_list = ""
-            
-            for j, player in enumerate(chunk, i+1):
-                try:
-                    user = self.bot.get_user(player['user_id'])
-                    name = user.mention if user else player['display_name']
-                    wins = player['wins']
-                    losses = player['losses']
-                    kd_ratio = player['kills'] / max(1, player['deaths'])
-                    
-                    fighter_list += f"{j}. {name}\n"
-                    fighter_list += f"   🏆 {wins}W-{losses}L | K/D: {kd_ratio:.1f}\n\n"
-                except:
-                    fighter_list += f"{j}. {player['display_name']}\n"
-                    fighter_list += f"   🏆 {player['wins']}W-{player['losses']}L\n\n"
-            
-            field_name = f"🥊 Fighters {i+1}-{min(i+10, len(sorted_players))}"
-            embed.add_field(name=field_name, value=fighter_list, inline=True)
+        fighter_list = ""
+        for rank, player in index.page(offset, FIGHTERS_PER_PAGE):
+            user = self.bot.resolver.get(player['user_id'])
+            name = user.mention if user else player['display_name']
+            fighter_list += f"{rank}. {name}\n"
+            fighter_list += f"   🏆 {player['wins']}W-{player['losses']}L | K/D: {player['kd_ratio']:.1f}\n\n"
         
-        # Add tournament stats
-        total_wins = sum(p['wins'] for p in players.values())
-        total_kills = sum(p['kills'] for p in players.values())
+        embed.add_field(
+            name=f"🥊 Fighters {offset + 1}-{min(offset + FIGHTERS_PER_PAGE, len(index))}",
+            value=fighter_list or "No fighters on this page",
+            inline=False
+        )
         
+        # Add tournament stats
         embed.add_field(
             name="📊 Tournament Statistics",
-            value=f"**Total Matches:** {total_wins}\n"
-                  f"**Total Eliminations:** {total_kills}\n"
-                  f"**Active Fighters:** {len(players)}\n"
+            value=f"**Total Matches:** {index.totals['wins']}\n"
+                  f"**Total Eliminations:** {index.totals['kills']}\n"
+                  f"**Active Fighters:** {len(index)}\n"
                   f"**Server:** {self.bot.server_ip}:{self.bot.server_port}",
             inline=False
         )
         
-        embed.set_footer(text="Use /stats @user to view detailed player statistics")
-        
-        await interaction.followup.send(embed=embed)
+        pages = max(1, -(-len(index) // FIGHTERS_PER_PAGE))
+        embed.set_footer(text=f"Page {offset // FIGHTERS_PER_PAGE + 1}/{pages} • Use /stats @user to view detailed player statistics")
+        return embed, len(index)
     
-    @app_commands.command(name="leaderboard", description="View tournament leaderboard")
-    @app_commands.describe(sort_by="Sort leaderboard by specific stat")
-    @app_commands.choices(sort_by=[
-        app_commands.Choice(name="Wins", value="wins"),
-        app_commands.Choice(name="Win Rate", value="win_rate"),
-        app_commands.Choice(name="Kills", value="kills"),
-        app_commands.Choice(name="K/D Ratio", value="kd_ratio"),
-        app_commands.Choice(name="Total Matches", value="matches")
-    ])
-    async def leaderboard(self, interaction: discord.Interaction, sort_by: str = "wins"):
-        """Display the tournament leaderboard"""
-        await interaction.response.defer()
-        
-        players = self.db.get_all_players()
+    @app_commands.command(name="fighters", description="View all tournament fighters")
+    async def fighters(self, interaction: discord.Interaction):
+        """Display all registered tournament fighters"""
+        index = get_ranked(self.db, 'wins')
         
-        if not players:
+        if not len(index):
             embed = self.embed_builder.warning_embed(
-                "Empty Leaderboard",
-                "No players are registered yet!\nAdministrators can register players using `/register`."
+                "No Fighters Found",
+                "No players are currently registered for the tournament.\nAdministrators can register players using `/register`."
             )
-            await interaction.followup.send(embed=embed)
+            await interaction.response.send_message(embed=embed)
             return
         
-        # Calculate additional stats and sort
-        player_stats = []
-        for player in players.values():
-            total_matches = player['wins'] + player['losses'] + player['draws']
-            win_rate = (player['wins'] / max(1, total_matches)) * 100
-            kd_ratio = player['kills'] / max(1, player['deaths'])
-            
-            player_stats.append({
-                **player,
-                'total_matches': total_matches,
-                'win_rate': win_rate,
-                'kd_ratio': kd_ratio
-            })
-        
-        # Sort by selected criteria
-        if sort_by == "win_rate":
-            sorted_players = sorted(player_stats, key=lambda x: x['win_rate'], reverse=True)
-        elif sort_by == "kd_ratio":
-            sorted_players = sorted(player_stats, key=lambda x: x['kd_ratio'], reverse=True)
-        elif sort_by == "matches":
-            sorted_players = sorted(player_stats, key=lambda x: x['total_matches'], reverse=True)
-        else:
-            sorted_players = sorted(player_stats, key=lambda x: x[sort_by], reverse=True)
-        
+        embed, total = self._fighters_page(0)
+        view = PageView(self._fighters_page, FIGHTERS_PER_PAGE, total, interaction.user.id)
+        await interaction.response.send_message(embed=embed, view=view)
+        view.message = await interaction.original_response()
+    
+    def _leaderboard_page(self, sort_by: str, offset: int) -> tuple:
+        """Render one page of the leaderboard for a sort key"""
+        index = get_ranked(self.db, sort_by)
         embed = self.embed_builder.leaderboard_embed(
             "🏆 Tournament Leaderboard",
             f"Top fighters sorted by {sort_by.replace('_', ' ').title()}"
         )
         
-        # Add top 10 players
         leaderboard_text = ""
-        medals = ["🥇", "🥈", "🥉"] + ["🏅"] * 7
+        medals = ["🥇", "🥈", "🥉"]
         
-        for i, player in enumerate(sorted_players[:10]):
-            try:
-                user = self.bot.get_user(player['user_id'])
-                name = user.display_name if user else player['display_name']
-                medal = medals[i] if i < len(medals) else "🏅"
-                
-                leaderboard_text += f"{medal} **{name}**\n"
-                leaderboard_text += f"   🏆 {player['wins']}W-{player['losses']}L-{player['draws']}D"
-                leaderboard_text += f" | Win Rate: {player['win_rate']:.1f}%\n"
-                leaderboard_text += f"   ⚔️ {player['kills']} kills | K/D: {player['kd_ratio']:.2f}\n\n"
-            except:
-                continue
+        for rank, player in index.page(offset, LEADERBOARD_PER_PAGE):
+            user = self.bot.resolver.get(player['user_id'])
+            name = user.display_name if user else player['display_name']
+            medal = medals[rank - 1] if rank <= len(medals) else f"`#{rank}`"
+            
+            leaderboard_text += f"{medal} **{name}**\n"
+            leaderboard_text += f"   🏆 {player['wins']}W-{player['losses']}L-{player['draws']}D"
+            leaderboard_text += f" | Win Rate: {player['win_rate']:.1f}%\n"
+            leaderboard_text += f"   ⚔️ {player['kills']} kills | K/D: {player['kd_ratio']:.2f}\n\n"
         
         embed.add_field(
-            name="📊 Top Fighters",
+            name=f"📊 Ranks {offset + 1}-{min(offset + LEADERBOARD_PER_PAGE, len(index))}",
             value=leaderboard_text or "No data available",
             inline=False
         )
         
         # Add tournament summary
-        total_players = len(players)
-        total_matches = sum(p['wins'] + p['losses'] + p['draws'] for p in players.values())
-        total_kills = sum(p['kills'] for p in players.values())
-        
+        leader = index.page(0, 1)
         embed.add_field(
             name="🎯 Tournament Summary",
-            value=f"**Total Players:** {total_players}\n"
-                  f"**Matches Played:** {total_matches // 2}\n"
-                  f"**Total Eliminations:** {total_kills}\n"
-                  f"**Most Active Player:** {sorted_players[0]['display_name'] if sorted_players else 'N/A'}",
+            value=f"**Total Players:** {len(index)}\n"
+                  f"**Matches Played:** {index.totals['matches'] // 2}\n"
+                  f"**Total Eliminations:** {index.totals['kills']}\n"
+                  f"**Most Active Player:** {leader[0][1]['display_name'] if leader else 'N/A'}",
             inline=True
         )
         
@@ -204,9 +136,36 @@ class TournamentCommands(commands.Cog):
             inline=True
         )
         
-        embed.set_footer(text="🔄 Leaderboard updates in real-time | Use /stats for detailed player info")
+        pages = max(1, -(-len(index) // LEADERBOARD_PER_PAGE))
+        embed.set_footer(text=f"Page {offset // LEADERBOARD_PER_PAGE + 1}/{pages} • Use /stats for detailed player info")
+        return embed, len(index)
+    
+    @app_commands.command(name="leaderboard", description="View tournament leaderboard")
+    @app_commands.describe(sort_by="Sort leaderboard by specific stat")
+    @app_commands.choices(sort_by=[
+        app_commands.Choice(name="Wins", value="wins"),
+        app_commands.Choice(name="Win Rate", value="win_rate"),
+        app_commands.Choice(name="Kills", value="kills"),
+        app_commands.Choice(name="K/D Ratio", value="kd_ratio"),
+        app_commands.Choice(name="Total Matches", value="matches")
+    ])
+    async def leaderboard(self, interaction: discord.Interaction, sort_by: str = "wins"):
+        """Display the tournament leaderboard"""
+        index = get_ranked(self.db, sort_by)
         
-        await interaction.followup.send(embed=embed)
+        if not len(index):
+            embed = self.embed_builder.warning_embed(
+                "Empty Leaderboard",
+                "No players are registered yet!\nAdministrators can register players using `/register`."
+            )
+            await interaction.response.send_message(embed=embed)
+            return
+        
+        render = lambda offset: self._leaderboard_page(sort_by, offset)
+        embed, total = render(0)
+        view = PageView(render, LEADERBOARD_PER_PAGE, total, interaction.user.id)
+        await interaction.response.send_message(embed=embed, view=view)
+        view.message = await interaction.original_response()
     
     @app_commands.command(name="tournament_info", description="Display comprehensive tournament information")
     async def tournament_info(self, interaction: discord.Interaction):
@@ -261,7 +220,7 @@ class TournamentCommands(commands.Cog):
         if players:
             top_player = max(players.values(), key=lambda x: x['wins'])
             try:
-                user = self.bot.get_user(top_player['user_id'])
+                user = self.bot.resolver.get(top_player['user_id'])
                 top_name = user.display_name if user else top_player['display_name']
                 embed.add_field(
                     name="👑 Current Champion",
@@ -286,3 +245,114 @@ class TournamentCommands(commands.Cog):
         embed.set_footer(text="May the best warrior win! Good luck in your duels.")
         
         await interaction.followup.send(embed=embed)
+    
+    @app_commands.command(name="create_bracket", description="Create an elimination bracket seeded from the leaderboard (Admin only)")
+    @app_commands.describe(
+        name="Bracket name",
+        format="Single or double elimination",
+        day="Day of the first round (1-31)",
+        hour="Hour of the first round (0-23)",
+        minute="Minute of the first round (0-59)",
+        size="Maximum number of players (2-64), taken from the top of the leaderboard (default 16)",
+        seeding="Leaderboard stat used for seeding",
+        parallel="How many duels can run at the same time (default 1)"
+    )
+    @app_commands.choices(
+        format=[
+            app_commands.Choice(name="Single Elimination", value="single"),
+            app_commands.Choice(name="Double Elimination", value="double")
+        ],
+        seeding=[
+            app_commands.Choice(name="Wins", value="wins"),
+            app_commands.Choice(name="Win Rate", value="win_rate"),
+            app_commands.Choice(name="Kills", value="kills"),
+            app_commands.Choice(name="K/D Ratio", value="kd_ratio")
+        ]
+    )
+    async def create_bracket(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+        format: str,
+        day: int,
+        hour: int,
+        minute: int,
+        size: app_commands.Range[int, 2, 64] = 16,
+        seeding: str = "wins",
+        parallel: int = 1
+    ):
+        """Create a bracket and schedule its first round"""
+        if not self.is_admin(interaction):
+            await interaction.response.send_message(
+                "❌ Only administrators can create brackets!", 
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer()
+        
+        try:
+            start_date = resolve_duel_date(day, hour, minute)
+            if start_date <= datetime.now():
+                raise ValueError("the first round must be in the future")
+            if parallel < 1:
+                raise ValueError("parallel must be at least 1")
+        except ValueError as e:
+            embed = self.embed_builder.error_embed(
+                "Invalid Bracket Settings",
+                f"Please check your values: {str(e)}"
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
+        bracket = self.bot.brackets.create(name, format, interaction.guild_id, seeding, size)
+        if len(bracket.data['seeds']) < 2:
+            embed = self.embed_builder.error_embed(
+                "Not Enough Players",
+                "At least two registered players are needed for a bracket!"
+            )
+            await interaction.followup.send(embed=embed)
+            return
+        
+        scheduled = self.bot.brackets.schedule_ready(
+            bracket, int(start_date.timestamp()), interaction.user.id, parallel
+        )
+        
+        embed = self.embed_builder.bracket_embed(bracket.render())
+        embed.add_field(
+            name="📅 First Round",
+            value=f"**{len(scheduled)}** duels scheduled from <t:{int(start_date.timestamp())}:F>\n"
+                  f"Later rounds are scheduled automatically as results come in.",
+            inline=False
+        )
+        await interaction.followup.send(embed=embed)
+    
+    @app_commands.command(name="bracket", description="View a tournament bracket")
+    @app_commands.describe(bracket_id="Bracket ID (defaults to this server's latest bracket)")
+    async def view_bracket(self, interaction: discord.Interaction, bracket_id: str = ""):
+        """Show a bracket from its cached view"""
+        brackets = self.db.get_all_brackets()
+        
+        if bracket_id:
+            bracket = brackets.get(bracket_id)
+        else:
+            own = [b for b in brackets.values() if b.get('guild_id') == interaction.guild_id]
+            bracket = max(own, key=lambda b: b['created_at']) if own else None
+        
+        if not bracket:
+            embed = self.embed_builder.warning_embed(
+                "No Bracket Found",
+                "No bracket matches that ID.\nAdministrators can create one using `/create_bracket`."
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await interaction.response.send_message(embed=self.embed_builder.bracket_embed(bracket['view']))
+    
+    @view_bracket.autocomplete('bracket_id')
+    async def bracket_id_autocomplete(self, interaction: discord.Interaction, current: str) -> list:
+        """Suggest brackets by name or id"""
+        return [
+            app_commands.Choice(name=label[:100], value=value)
+            for value, label in bracket_index(self.db).search(current)
+        ]
@@ -0,0 +1,300 @@
+import time
+import uuid
+from bot.utils.database import Database
+from bot.utils.pairing import make_duel_record, pack_slots
+
+BYE = 0  # player id marking an empty seed
+
+# Delay before a newly ready bracket match is scheduled, rounded up to the minute
+NEXT_MATCH_DELAY = 1800
+
+FORMATS = {'single': "Single Elimination", 'double': "Double Elimination"}
+
+def seed_positions(size: int) -> list:
+    """Return seed numbers in bracket order so seed 1 meets seed `size`, 2 meets `size` - 1, ..."""
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+class Bracket:
+    """Elimination bracket stored as a flat array of matches
+    
+    The winners bracket uses heap layout: the final is match 0 and the
+    feeders of match i are matches 2i+1 and 2i+2, so round r (1 = first
+    round) occupies indices size/2^r - 1 onwards. Double elimination appends
+    the losers bracket, the grand final and its reset after it; the reset is
+    only played when the losers bracket side wins the grand final, so the
+    winners bracket champion is not out after one loss. Each match stores
+    where its winner and loser go as [match_index, slot], which makes
+    recording a result O(1) apart from automatic bye advancement.
+    """
+    
+    def __init__(self, data: dict):
+        self.data = data
+        self._ready = []
+    
+    @property
+    def matches(self) -> list:
+        return self.data['matches']
+    
+    @classmethod
+    def create(cls, name: str, fmt: str, seeds: list, names: dict, guild_id: int | None) -> 'Bracket':
+        """Build a bracket for `seeds` (best first); empty seeds become byes"""
+        size = 2
+        while size < len(seeds):
+            size *= 2
+        rounds = size.bit_length() - 1
+        
+        matches = [None] * (size - 1)
+        for r in range(1, rounds + 1):
+            first = (size >> r) - 1
+            for j in range(size >> r):
+                win = [(first - 1) // 2 + j // 2, j % 2] if r < rounds else None
+                matches[first + j] = {'round': f"W{r}", 'players': [None, None], 'winner': None,
+                                      'win': win, 'lose': None, 'duel_id': None}
+        
+        def add(label: str) -> int:
+            matches.append({'round': label, 'players': [None, None], 'winner': None,
+                            'win': None, 'lose': None, 'duel_id': None})
+            return len(matches) - 1
+        
+        if fmt == 'double':
+            previous = []  # losers bracket matches of the previous round
+            for lr in range(1, 2 * (rounds - 1) + 1):
+                if lr == 1:
+                    # First-round losers meet each other
+                    current = [add("L1") for _ in range(size >> 2)]
+                    for j in range(size >> 1):
+                        matches[(size >> 1) - 1 + j]['lose'] = [current[j // 2], j % 2]
+                elif lr % 2 == 0:
+                    # Survivors meet the losers of the next winners round, in reverse order
+                    wr = lr // 2 + 1
+                    current = [add(f"L{lr}") for _ in range(len(previous))]
+                    for j, index in enumerate(previous):
+                        matches[index]['win'] = [current[j], 0]
+                    first = (size >> wr) - 1
+                    for j in range(size >> wr):
+                        matches[first + j]['lose'] = [current[len(current) - 1 - j], 1]
+                else:
+                    current = [add(f"L{lr}") for _ in range(len(previous) // 2)]
+                    for j, index in enumerate(previous):
+                        matches[index]['win'] = [current[j // 2], j % 2]
+                previous = current
+            
+            grand_final = add("GF")
+            matches[0]['win'] = [grand_final, 0]
+            if previous:
+                matches[previous[0]]['win'] = [grand_final, 1]
+            else:
+                matches[0]['lose'] = [grand_final, 1]
+            matches[grand_final]['reset'] = add("GF2")
+        
+        bracket = cls({
+            'id': uuid.uuid4().hex[:8],
+            'name': name,
+            'format': fmt,
+            'guild_id': guild_id,
+            'created_at': time.time(),
+            'version': 0,
+            'seeds': list(seeds),
+            'names': {str(player_id): player_name for player_id, player_name in names.items()},
+            'matches': matches,
+            'duels': {},
+            'champion': None
+        })
+        
+        padded = list(seeds) + [BYE] * (size - len(seeds))
+        order = seed_positions(size)
+        first = (size >> 1) - 1
+        for position, seed in enumerate(order):
+            bracket._place(first + position // 2, position % 2, padded[seed - 1])
+        return bracket
+    
+    def _place(self, index: int, slot: int, player: int):
+        match = self.matches[index]
+        match['players'][slot] = player
+        a, b = match['players']
+        if a is None or b is None:
+            return
+        if a == BYE or b == BYE:
+            match['bye'] = True
+            self._finish(index, b if a == BYE else a)
+        else:
+            self._ready.append(index)
+    
+    def _finish(self, index: int, winner: int):
+        match = self.matches[index]
+        match['winner'] = winner
+        a, b = match['players']
+        loser = b if winner == a else a
+        reset = match.get('reset')
+        if reset is not None:
+            if winner == b:
+                # Both finalists now have one loss: play the reset
+                self._place(reset, 0, a)
+                self._place(reset, 1, b)
+                return
+            self.matches[reset]['skipped'] = True
+        if match['win']:
+            self._place(match['win'][0], match['win'][1], winner)
+        else:
+            self.data['champion'] = winner
+        if match['lose']:
+            self._place(match['lose'][0], match['lose'][1], loser)
+    
+    def record_result(self, index: int, winner: int) -> list:
+        """Record a match winner and return the indices of matches that became playable"""
+        match = self.matches[index]
+        if match['winner'] is not None or winner not in match['players'] or winner == BYE:
+            raise ValueError("invalid winner for this match")
+        self._ready = []
+        self._finish(index, winner)
+        self.data['version'] += 1
+        return self._ready
+    
+    def ready_matches(self) -> list:
+        """Indices of matches with two players that have no duel yet"""
+        return [
+            index for index, match in enumerate(self.matches)
+            if match['winner'] is None and None not in match['players'] and not match['duel_id']
+        ]
+    
+    def assign_duel(self, index: int, duel_id: str):
+        self.matches[index]['duel_id'] = duel_id
+        self.data['duels'][duel_id] = index
+        self.data['version'] += 1
+    
+    def release_duel(self, duel_id: str) -> int | None:
+        """Detach a cancelled duel from its match so the match becomes playable again"""
+        index = self.data['duels'].pop(duel_id, None)
+        if index is not None and self.matches[index]['duel_id'] == duel_id:
+            self.matches[index]['duel_id'] = None
+            self.data['version'] += 1
+        return index
+    
+    def match_for_duel(self, duel_id: str) -> int | None:
+        return self.data['duels'].get(duel_id)
+    
+    def name_of(self, player_id: int | None) -> str:
+        if player_id is None:
+            return "TBD"
+        if player_id == BYE:
+            return "BYE"
+        return self.data['names'].get(str(player_id), "Unknown")
+    
+    def _round_title(self, label: str, rounds: int) -> str:
+        if label == "GF":
+            return "Grand Final"
+        if label == "GF2":
+            return "Grand Final Reset"
+        number = int(label[1:])
+        if label[0] == "L":
+            return f"Losers Round {number}"
+        if number == rounds:
+            return "Final" if self.data['format'] == 'single' else "Winners Final"
+        if number == rounds - 1:
+            return "Semifinals"
+        return f"Round {number}"
+    
+    def render(self) -> dict:
+        """Serialize the bracket into the view shown by /bracket and the dashboard"""
+        grouped = {}
+        for index, match in enumerate(self.matches):
+            if match.get('skipped'):
+                continue
+            grouped.setdefault(match['round'], []).append({
+                'index': index,
+                'players': [self.name_of(player) for player in match['players']],
+                'winner': self.name_of(match['winner']) if match['winner'] is not None else None,
+                'bye': match.get('bye', False),
+                'duel_id': match['duel_id']
+            })
+        
+        rounds = sum(1 for label in grouped if label[0] == 'W')
+        section = {'W': 0, 'L': 1, 'G': 2}
+        labels = sorted(grouped, key=lambda label: (section[label[0]], int(label[1:]) if label[1:].isdigit() else 0))
+        return {
+            'id': self.data['id'],
+            'name': self.data['name'],
+            'format': FORMATS[self.data['format']],
+            'version': self.data['version'],
+            'champion': self.name_of(self.data['champion']) if self.data['champion'] else None,
+            'rounds': [
+                {'name': self._round_title(label, rounds), 'matches': grouped[label]}
+                for label in labels
+            ]
+        }
+    
+    def to_dict(self) -> dict:
+        """Stored form: the bracket state plus its rendered view, refreshed on every change"""
+        return {**self.data, 'view': self.render()}
+
+class BracketManager:
+    """Create brackets, turn playable matches into scheduled duels and advance winners"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.db = Database()
+    
+    def create(self, name: str, fmt: str, guild_id: int | None, seeding: str, size: int) -> Bracket:
+        """Seed a new bracket from the leaderboard"""
+        ranked = self.db.get_leaderboard(sort_by=seeding, limit=size)
+        seeds = [player['user_id'] for player in ranked]
+        names = {player['user_id']: player.get('display_name', 'Unknown') for player in ranked}
+        return Bracket.create(name, fmt, seeds, names, guild_id)
+    
+    def schedule_ready(self, bracket: Bracket, start: int, scheduled_by: int,
+                       parallel: int = 1, ready: list | None = None) -> list:
+        """Schedule playable matches (all of them by default) as duels from `start` and save the bracket"""
+        if ready is None:
+            ready = bracket.ready_matches()
+        pairs = [tuple(bracket.matches[index]['players']) for index in ready]
+        packed = pack_slots(pairs, start, self.bot.intervals, parallel)
+        slot_of = {(p1, p2): timestamp for p1, p2, timestamp in packed}
+        
+        new_duels = {}
+        for index, pair in zip(ready, pairs):
+            if pair not in slot_of:
+                continue
+            duel = make_duel_record(
+                pair[0], pair[1], bracket.name_of(pair[0]), bracket.name_of(pair[1]), slot_of[pair],
+                scheduled_by, bracket.data['guild_id'], bracket_id=bracket.data['id'], bracket_match=index
+            )
+            new_duels[duel['id']] = duel
+            bracket.assign_duel(index, duel['id'])
+        
+        if new_duels:
+            self.db.add_duels(new_duels)
+            self.bot.scheduler.schedule_duels(list(new_duels.values()))
+        self.db.save_bracket(bracket.data['id'], bracket.to_dict())
+        return list(new_duels.values())
+    
+    def record_result(self, duel: dict, winner_id: int) -> list:
+        """Advance the bracket a finished duel belongs to and schedule the matches it unlocks"""
+        data = self.db.get_bracket(duel.get('bracket_id'))
+        if not data:
+            return []
+        bracket = Bracket(data)
+        index = bracket.match_for_duel(duel['id'])
+        if index is None:
+            return []
+        
+        ready = bracket.record_result(index, winner_id)
+        return self.schedule_ready(bracket, self._next_start(), duel.get('scheduled_by'), ready=ready)
+    
+    def requeue(self, duel: dict, scheduled_by: int) -> list:
+        """Schedule a fresh duel for the match of a cancelled bracket duel, so the bracket is not left stuck"""
+        data = self.db.get_bracket(duel.get('bracket_id'))
+        if not data:
+            return []
+        bracket = Bracket(data)
+        index = bracket.release_duel(duel['id'])
+        if index is None or bracket.matches[index]['winner'] is not None:
+            return []
+        return self.schedule_ready(bracket, self._next_start(), scheduled_by, ready=[index])
+    
+    def _next_start(self) -> int:
+        """NEXT_MATCH_DELAY from now, rounded up to the minute"""
+        return -(-(int(time.time()) + NEXT_MATCH_DELAY) // 60) * 60
@@ -0,0 +1,35 @@
+import threading
+
+class ChangeFeed:
+    """In-process notification of data file writes
+    
+    Database bumps the version after every save; the web dashboard's
+    stream waits on it instead of polling the files. Thread-safe because
+    the bot loop and the web server threads share it.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.version = 0
+        self.closed = False
+    
+    def notify(self):
+        """Record that a data file was written and wake all waiters"""
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+    
+    def wait(self, since: int, timeout: float) -> int:
+        """Block until the version moves past `since` or `timeout` passes; return the version"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version > since or self.closed, timeout)
+            return self.version
+    
+    def close(self):
+        """Wake all waiters for good; used on shutdown so long-lived streams end"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+# Process-wide feed; the dashboard runs in the same process as the bot
+changes = ChangeFeed()
@@ -1,12 +1,19 @@
 import json
 import os
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime
+from bot.utils.changes import changes
+from bot.utils.perf import track_storage
 
 class Database:
     def __init__(self):
         self.players_file = "data/players.json"
         self.duels_file = "data/duels.json"
+        self.reminders_file = "data/reminders.json"
+        self.settings_file = "data/settings.json"
+        self.brackets_file = "data/brackets.json"
+        self.sync_file = "data/command_sync.json"
         
         # Ensure data directory exists
         os.makedirs("data", exist_ok=True)
@@ -14,6 +21,10 @@ class Database:
         # Initialize files if they don't exist
         self._init_file(self.players_file, {})
         self._init_file(self.duels_file, {})
+        self._init_file(self.reminders_file, {})
+        self._init_file(self.settings_file, {})
+        self._init_file(self.brackets_file, {})
+        self._init_file(self.sync_file, {})
     
     def _init_file(self, filename: str, default_data: dict):
         """Initialize a JSON file with default data if it doesn't exist"""
@@ -23,17 +34,39 @@ class Database:
     
     def _load_data(self, filename: str) -> dict:
         """Load data from a JSON file"""
+        started = time.perf_counter()
         try:
             with open(filename, 'r') as f:
-                return json.load(f)
+                text = f.read()
+            data = json.loads(text)
+            track_storage(time.perf_counter() - started, len(text))
+            return data
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
     
+    def _file_version(self, filename: str) -> tuple:
+        """Change marker for a data file (mtime and size), used to key caches derived from it"""
+        try:
+            stat = os.stat(filename)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return 0, 0
+    
     def _save_data(self, filename: str, data: dict):
-        """Save data to a JSON file"""
+        """Save data to a JSON file
+        
+        The data is written to a temporary file that then replaces the old
+        one, so readers and crashes never see a half-written file.
+        """
+        started = time.perf_counter()
         try:
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
+            text = json.dumps(data, indent=2)
+            temp = f"{filename}.tmp"
+            with open(temp, 'w') as f:
+                f.write(text)
+            os.replace(temp, filename)
+            track_storage(time.perf_counter() - started, len(text))
+            changes.notify()
         except Exception as e:
             print(f"Error saving to {filename}: {e}")
     
@@ -44,6 +77,13 @@ class Database:
         players[str(user_id)] = player_data
         self._save_data(self.players_file, players)
     
+    def add_players(self, new_players: dict) -> int:
+        """Add several players with a single write and return the new player count"""
+        players = self._load_data(self.players_file)
+        players.update({str(user_id): player for user_id, player in new_players.items()})
+        self._save_data(self.players_file, players)
+        return len(players)
+    
     def get_player(self, user_id: int) -> Optional[dict]:
         """Get a player's data"""
         players = self._load_data(self.players_file)
@@ -67,6 +107,10 @@ class Database:
         """Get all players data"""
         return self._load_data(self.players_file)
     
+    def players_version(self) -> tuple:
+        """Change marker for the player data"""
+        return self._file_version(self.players_file)
+    
     def update_player_stats(self, user_id: int, wins: int = 0, losses: int = 0, 
                            draws: int = 0, kills: int = 0, deaths: int = 0):
         """Update player statistics"""
@@ -81,6 +125,29 @@ class Database:
             player['last_updated'] = datetime.utcnow().isoformat()
             self.update_player(user_id, player)
     
+    def apply_stat_deltas(self, deltas: dict) -> dict:
+        """Add stat deltas to many players with a single write
+        
+        `deltas` maps user ids to {stat: change}. Returns {user_id: (old, new)}
+        for the players that exist.
+        """
+        players = self._load_data(self.players_file)
+        now = datetime.utcnow().isoformat()
+        changes = {}
+        for user_id, fields in deltas.items():
+            player = players.get(str(user_id))
+            if not player:
+                continue
+            old = dict(player)
+            for field, value in fields.items():
+                player[field] = player.get(field, 0) + value
+            player['kill_count'] = player.get('kills', 0)
+            player['last_updated'] = now
+            changes[str(user_id)] = (old, player)
+        if changes:
+            self._save_data(self.players_file, players)
+        return changes
+    
     # Duel management
     def add_duel(self, duel_id: str, duel_data: dict):
         """Add a new duel to the database"""
@@ -88,6 +155,12 @@ class Database:
         duels[duel_id] = duel_data
         self._save_data(self.duels_file, duels)
     
+    def add_duels(self, new_duels: dict):
+        """Add several duels with a single write"""
+        duels = self._load_data(self.duels_file)
+        duels.update(new_duels)
+        self._save_data(self.duels_file, duels)
+    
     def get_duel(self, duel_id: str) -> Optional[dict]:
         """Get a duel's data"""
         duels = self._load_data(self.duels_file)
@@ -100,6 +173,22 @@ class Database:
             duels[duel_id] = duel_data
             self._save_data(self.duels_file, duels)
     
+    def update_duels(self, updates: dict, require_status: str | None = None):
+        """Apply field changes to several duels with a single write
+        
+        `updates` maps duel ids to the fields to change; ids that no longer
+        exist are skipped, and so are duels whose stored status is not
+        `require_status` when it is given (e.g. completed in the meantime).
+        """
+        duels = self._load_data(self.duels_file)
+        changed = False
+        for duel_id, fields in updates.items():
+            if duel_id in duels and require_status in (None, duels[duel_id].get('status')):
+                duels[duel_id].update(fields)
+                changed = True
+        if changed:
+            self._save_data(self.duels_file, duels)
+    
     def remove_duel(self, duel_id: str):
         """Remove a duel from the database"""
         duels = self._load_data(self.duels_file)
@@ -111,6 +200,63 @@ class Database:
         """Get all duels data"""
         return self._load_data(self.duels_file)
     
+    def duels_version(self) -> tuple:
+        """Change marker for the duel data"""
+        return self._file_version(self.duels_file)
+    
+    def record_duel_result(self, duel_id: str, winner_id: int | None, player1_kills: int,
+                           player2_kills: int, recorded_by: int) -> Optional[dict]:
+        """Close a duel and apply its outcome to both players
+        
+        Updates the duel, both players' stats and their head-to-head records
+        with one write per file. `winner_id` None records a draw. Returns
+        {'duel': duel, 'players': {user_id: (old, new)}}, or None when the
+        duel does not exist or is already completed.
+        """
+        duels = self._load_data(self.duels_file)
+        duel = duels.get(duel_id)
+        if not duel or duel.get('status') == 'completed':
+            return None
+        
+        players = self._load_data(self.players_file)
+        now = datetime.utcnow().isoformat()
+        sides = (
+            (duel['player1_id'], duel['player2_id'], player1_kills, player2_kills),
+            (duel['player2_id'], duel['player1_id'], player2_kills, player1_kills)
+        )
+        changes = {}
+        for player_id, opponent_id, kills, deaths in sides:
+            player = players.get(str(player_id))
+            if not player:
+                continue  # removed since the duel was scheduled
+            outcome = 'draws' if winner_id is None else 'wins' if winner_id == player_id else 'losses'
+            old = dict(player)
+            player[outcome] = player.get(outcome, 0) + 1
+            player['kills'] = player.get('kills', 0) + kills
+            player['deaths'] = player.get('deaths', 0) + deaths
+            player['kill_count'] = player['kills']
+            player['last_updated'] = now
+            record = player.setdefault('head_to_head', {}).setdefault(
+                str(opponent_id), {'wins': 0, 'losses': 0, 'draws': 0}
+            )
+            record[outcome] += 1
+            changes[str(player_id)] = (old, player)
+        
+        duel.update({
+            'status': 'completed',
+            'winner_id': winner_id,
+            'player1_kills': player1_kills,
+            'player2_kills': player2_kills,
+            'completed_at': now,
+            'recorded_by': recorded_by
+        })
+        # Duel first: if the players write is lost the duel is closed and
+        # cannot be counted twice
+        self._save_data(self.duels_file, duels)
+        if changes:
+            self._save_data(self.players_file, players)
+        return {'duel': duel, 'players': changes}
+    
     def get_upcoming_duels(self) -> list:
         """Get all upcoming scheduled duels"""
         duels = self._load_data(self.duels_file)
@@ -136,6 +282,77 @@ class Database:
         
         return sorted(player_duels, key=lambda x: x.get('timestamp', 0), reverse=True)
     
+    # Reminder queue
+    def get_reminder_events(self) -> dict:
+        """Get the persisted scheduler event queue"""
+        return self._load_data(self.reminders_file)
+    
+    def save_reminder_events(self, events: dict):
+        """Replace the persisted scheduler event queue"""
+        self._save_data(self.reminders_file, events)
+    
+    def set_duel_reminder_events(self, duel_id: str, events: dict):
+        """Replace the queued events belonging to one duel"""
+        self.set_reminder_events({duel_id: events})
+    
+    def set_reminder_events(self, duel_events: dict):
+        """Replace the queued events of several duels ({duel_id: events}) with a single write"""
+        queue = self._load_data(self.reminders_file)
+        queue = {key: event for key, event in queue.items() if event.get('duel_id') not in duel_events}
+        for events in duel_events.values():
+            queue.update(events)
+        self._save_data(self.reminders_file, queue)
+    
+    def update_reminder_events(self, events: dict, remove_duels=()):
+        """Insert or update queued events by key and drop those of `remove_duels`, with a single write"""
+        remove_duels = set(remove_duels)
+        queue = self._load_data(self.reminders_file)
+        queue.update(events)
+        if remove_duels:
+            queue = {key: event for key, event in queue.items() if event.get('duel_id') not in remove_duels}
+        self._save_data(self.reminders_file, queue)
+    
+    # Guild settings
+    def get_guild_settings(self) -> dict:
+        """Get per-guild settings keyed by guild id"""
+        return self._load_data(self.settings_file)
+    
+    def update_guild_settings(self, guild_id: int, fields: dict):
+        """Update settings for one guild"""
+        settings = self._load_data(self.settings_file)
+        settings.setdefault(str(guild_id), {}).update(fields)
+        self._save_data(self.settings_file, settings)
+    
+    # Slash command sync state
+    def get_command_hash(self, scope: str) -> Optional[str]:
+        """Get the command tree hash last synced for a scope ('global' or 'guild:<id>')"""
+        return self._load_data(self.sync_file).get(scope)
+    
+    def set_command_hash(self, scope: str, command_hash: str):
+        """Remember the command tree hash synced for a scope"""
+        state = self._load_data(self.sync_file)
+        state[scope] = command_hash
+        self._save_data(self.sync_file, state)
+    
+    # Brackets
+    def get_all_brackets(self) -> dict:
+        """Get all brackets keyed by bracket id"""
+        return self._load_data(self.brackets_file)
+    
+    def brackets_version(self) -> tuple:
+        """Change marker for the bracket data"""
+        return self._file_version(self.brackets_file)
+    
+    def get_bracket(self, bracket_id: str) -> Optional[dict]:
+        """Get a bracket's data"""
+        return self._load_data(self.brackets_file).get(bracket_id)
+    
+    def save_bracket(self, bracket_id: str, bracket_data: dict):
+        """Insert or replace a bracket"""
+        brackets = self._load_data(self.brackets_file)
+        brackets[bracket_id] = bracket_data
+        self._save_data(self.brackets_file, brackets)
+    
     # Tournament statistics
     def get_tournament_stats(self) -> dict:
         """Get overall tournament statistics"""
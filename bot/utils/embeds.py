@@ -1,6 +1,31 @@
 import discord
+import random
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
+
+MOTIVATIONAL_QUOTES = [
+    "*\"I fear not the man who has practiced 10,000 kicks once, but I fear the man who has practiced one kick 10,000 times.\"* - Bruce Lee",
+    "*\"Victory is reserved for those who are willing to pay its price.\"* - Sun Tzu", 
+    "*\"The way to get started is to quit talking and begin doing.\"* - Walt Disney",
+    "*\"Champions train, losers complain.\"* - Unknown",
+    "*\"It's not whether you get knocked down, it's whether you get up.\"* - Vince Lombardi"
+]
+
+# Prebuilt template embeds shared by every EmbedBuilder, stored as dicts
+_template_cache = {}
+
+# Discord rejects embeds whose title, description, fields and footer add up to more
+EMBED_TOTAL_LIMIT = 6000
+
+def format_lead(seconds: int) -> str:
+    """Human readable reminder lead time, e.g. 3600 -> '1 hour'"""
+    if seconds == 0:
+        return "start"
+    for unit, name in ((86400, 'day'), (3600, 'hour'), (60, 'minute')):
+        if seconds % unit == 0:
+            count = seconds // unit
+            return f"{count} {name}{'s' if count != 1 else ''}"
+    return f"{seconds} seconds"
 
 class EmbedBuilder:
     def __init__(self):
@@ -22,6 +47,22 @@ class EmbedBuilder:
         self.footer_icon = "https://cdn.discordapp.com/emojis/856550982005465108.png"
         self.thumbnail_url = "https://cdn.discordapp.com/emojis/856550982005465108.png"
     
+    def from_template(self, key, build: Callable[[], discord.Embed]) -> discord.Embed:
+        """Return a fresh embed from a cached template, building the template once
+        
+        Only the field list is copied per call, so callers can fill in or add
+        dynamic fields without touching the cached template.
+        """
+        template = _template_cache.get(key)
+        if template is None:
+            template = build().to_dict()
+            template.pop('timestamp', None)
+            _template_cache[key] = template
+        
+        embed = discord.Embed.from_dict({**template, 'fields': [dict(f) for f in template.get('fields', [])]})
+        embed.timestamp = datetime.utcnow()
+        return embed
+    
     def base_embed(self, title: str, description: str, color: int) -> discord.Embed:
         """Create a base embed with luxury styling"""
         embed = discord.Embed(
@@ -111,7 +152,7 @@ class EmbedBuilder:
         
         return embed
     
-    def duel_reminder_embed(self, title: str, description: str) -> discord.Embed:
+    def duel_reminder_embed(self, title: str, description: str, warning: str = "5 Minutes Warning!") -> discord.Embed:
         """Create a luxury duel reminder embed"""
         embed = discord.Embed(
             title=title,
@@ -127,18 +168,173 @@ class EmbedBuilder:
         )
         
         embed.set_footer(
-            text="⏰ 5 Minutes Warning! | Duel Lords",
+            text=f"⏰ {warning} | Duel Lords",
             icon_url=self.footer_icon
         )
         
         return embed
     
+    def personal_reminder_embed(self, duel: dict, player, opponent, player_data: Optional[dict],
+                                opponent_data: Optional[dict], server_ip: str, server_port: str,
+                                lead: int = 300) -> discord.Embed:
+        """Create a reminder for one participant from the cached template for its tier"""
+        embed = self.from_template(('duel_reminder', server_ip, server_port, lead),
+                                   lambda: self._duel_reminder_template(server_ip, server_port, lead))
+        
+        opp_wins = opponent_data['wins'] if opponent_data else 0
+        opp_losses = opponent_data['losses'] if opponent_data else 0
+        opp_kd = opponent_data['kills'] / max(1, opponent_data['deaths']) if opponent_data else 0
+        my_wins = player_data['wins'] if player_data else 0
+        my_losses = player_data['losses'] if player_data else 0
+        my_kd = player_data['kills'] / max(1, player_data['deaths']) if player_data else 0
+        
+        embed.set_field_at(
+            0,
+            name="⚔️ Battle Details",
+            value=f"**{player.display_name}** 🆚 **{opponent.display_name}**\n"
+                  f"**Starts:** <t:{duel['timestamp']}:t>\n"
+                  f"**In:** <t:{duel['timestamp']}:R>\n\n"
+                  f"🎯 **This is it - the moment of truth!**",
+            inline=False
+        )
+        embed.set_field_at(
+            3,
+            name="🎯 Know Your Enemy",
+            value=f"**Opponent Record:** {opp_wins}W-{opp_losses}L\n"
+                  f"**K/D Ratio:** {opp_kd:.2f}\n"
+                  f"**Threat Level:** {'🔥 HIGH' if opp_wins > 5 else '⚡ MODERATE'}\n"
+                  f"**Strategy:** Fight smart, stay focused!",
+            inline=False
+        )
+        embed.set_field_at(
+            4,
+            name="💪 Battle Inspiration",
+            value=random.choice(MOTIVATIONAL_QUOTES),
+            inline=False
+        )
+        embed.set_field_at(
+            5,
+            name=f"🥊 Your Stats vs {opponent.display_name}",
+            value=f"**Your Record:** {my_wins}W-{my_losses}L\n"
+                  f"**Your K/D:** {my_kd:.2f}\n"
+                  f"**Confidence Level:** {'🔥 READY TO DOMINATE!' if (player_data and my_wins >= opp_wins) else '⚡ HUNGRY FOR VICTORY!'}",
+            inline=False
+        )
+        return embed
+    
+    def _duel_reminder_template(self, server_ip: str, server_port: str, lead: int) -> discord.Embed:
+        """Build the reminder template; fields 0, 3, 4 and 5 are filled per player"""
+        label = format_lead(lead)
+        imminent = lead <= 600
+        
+        embed = self.duel_reminder_embed(
+            "⚡ FINAL WARNING - DUEL STARTING SOON!" if imminent else f"🔔 DUEL REMINDER - {label.upper()} TO GO!",
+            f"🔥 **Your epic battle begins in {label}!** 🔥",
+            f"{label.title()} Warning!"
+        )
+        embed.add_field(name="⚔️ Battle Details", value="\u200b", inline=False)
+        embed.add_field(
+            name="🎮 Connection Info",
+            value=f"**Server IP:** {server_ip}\n"
+                  f"**Port:** {server_port}\n"
+                  f"**Full Address:** {server_ip}:{server_port}\n\n"
+                  + ("🚨 **CONNECT NOW!**" if imminent else "📌 **Save this address for the duel**"),
+            inline=True
+        )
+        embed.add_field(
+            name="📋 Pre-Battle Checklist",
+            value="✅ Connect to server\n"
+                  "✅ Check your internet connection\n"
+                  "✅ Close other applications\n"
+                  "✅ Prepare for victory!\n"
+                  "✅ May the best fighter win!",
+            inline=True
+        )
+        embed.add_field(name="🎯 Know Your Enemy", value="\u200b", inline=False)
+        embed.add_field(name="💪 Battle Inspiration", value="\u200b", inline=False)
+        embed.add_field(name="🥊 Your Stats", value="\u200b", inline=False)
+        return embed
+    
+    def server_info_embed(self, server_ip: str, server_port: str) -> discord.Embed:
+        """Create the BombSquad server connection embed"""
+        return self.from_template(('server_info', server_ip, server_port),
+                                  lambda: self._server_info_template(server_ip, server_port))
+    
+    def _server_info_template(self, server_ip: str, server_port: str) -> discord.Embed:
+        embed = self.info_embed(
+            "🎮 BombSquad Server Information",
+            "Connect to our official tournament server!"
+        )
+        embed.add_field(
+            name="🌐 Connection Details",
+            value=f"**IP Address:** `{server_ip}`\n"
+                  f"**Port:** `{server_port}`\n"
+                  f"**Full Address:** `{server_ip}:{server_port}`",
+            inline=False
+        )
+        embed.add_field(
+            name="📋 How to Connect",
+            value="1. Open BombSquad\n"
+                  "2. Go to Play → Network → Connect by Address\n"
+                  "3. Enter the IP address above\n"
+                  "4. Click Connect and join the tournament!",
+            inline=False
+        )
+        embed.add_field(
+            name="⚡ Server Status",
+            value="🟢 **Online** - Ready for duels!\n"
+                  "🏆 Tournament Mode Active\n"
+                  "👥 Players Welcome",
+            inline=False
+        )
+        embed.set_footer(text="Good luck in your duels!")
+        return embed
+    
     def duel_list_embed(self, title: str, description: str) -> discord.Embed:
         """Create a duel list embed"""
         embed = self.base_embed(title, description, self.colors['duel'])
         embed.set_footer(text="📅 Scheduled Duels | Duel Lords", icon_url=self.footer_icon)
         return embed
     
+    def bracket_embed(self, view: dict) -> discord.Embed:
+        """Render a bracket from its stored view, one field per round"""
+        embed = self.base_embed(
+            f"🏟️ {view['name']}",
+            f"**Format:** {view['format']}\n**Bracket ID:** `{view['id']}`",
+            self.colors['tournament']
+        )
+        
+        footer = "🏟️ Brackets | Duel Lords"
+        champion = f"**{view['champion']}**" if view['champion'] else None
+        more_name = "📺 More Rounds"
+        more_value = f"The full bracket is on the web dashboard at `/bracket/{view['id']}`"
+        # Room kept for the fields that always close the embed
+        reserved = len(footer) + len(more_name) + len(more_value) + (len("👑 Champion") + len(champion) if champion else 0)
+        
+        for position, bracket_round in enumerate(view['rounds'][:23]):
+            lines = []
+            for match in bracket_round['matches']:
+                if match['bye']:
+                    continue
+                p1, p2 = match['players']
+                if match['winner']:
+                    lines.append(f"🏆 **{match['winner']}** def. {p2 if match['winner'] == p1 else p1}")
+                else:
+                    lines.append(f"⚔️ {p1} 🆚 {p2}")
+            value = "\n".join(lines) or "Byes only"
+            if len(value) > 1024:
+                value = value[:1000].rsplit("\n", 1)[0] + "\n..."
+            if len(embed) + len(bracket_round['name']) + len(value) + reserved > EMBED_TOTAL_LIMIT:
+                embed.add_field(name=more_name, value=more_value, inline=False)
+                break
+            embed.add_field(name=bracket_round['name'], value=value, inline=False)
+        
+        if champion:
+            embed.add_field(name="👑 Champion", value=champion, inline=False)
+        
+        embed.set_footer(text=footer, icon_url=self.footer_icon)
+        return embed
+    
     def stats_embed(self, title: str, description: str) -> discord.Embed:
         """Create a luxury statistics embed"""
         embed = self.base_embed(title, description, self.colors['stats'])
@@ -159,19 +355,31 @@ class EmbedBuilder:
     
     def help_embed(self) -> discord.Embed:
         """Create a comprehensive help embed"""
+        return self.from_template('help', self._help_template)
+    
+    def _help_template(self) -> discord.Embed:
         embed = self.base_embed(
             "📚 Duel Lords Command Guide",
-            "Complete list of available commands for the ultimate BombSquad tournament experience!"
+            "Complete list of available commands for the ultimate BombSquad tournament experience!",
+            self.colors['primary']
         )
         
         # Admin Commands
         embed.add_field(
             name="👑 Admin Commands",
             value="`/register` - Register a new player\n"
+                  "`/register_role` - Register everyone with a role\n"
                   "`/remove` - Remove a player\n"
                   "`/update` - Update player stats\n"
+                  "`/import_results` - Import results from a CSV/JSON file\n"
                   "`/duel` - Schedule a duel\n"
-                  "`/cancel_duel` - Cancel a scheduled duel",
+                  "`/generate_round` - Pair everyone and schedule a round\n"
+                  "`/create_bracket` - Create an elimination bracket\n"
+                  "`/result` - Record a duel result\n"
+                  "`/cancel_duel` - Cancel a scheduled duel\n"
+                  "`/reminders` - Configure reminder tiers\n"
+                  "`/scheduler_stats` - Scheduler lag and throughput\n"
+                  "`/perf` - Command latency breakdown",
             inline=False
         )
         
@@ -191,6 +399,7 @@ class EmbedBuilder:
             name="🎮 General Commands",
             value="`/ip` - Server connection info\n"
                   "`/duels` - View upcoming duels\n"
+                  "`/bracket` - View a tournament bracket\n"
                   "`/tournament_info` - Tournament details\n"
                   "`/help` - Show this help message",
             inline=False
@@ -199,7 +408,7 @@ class EmbedBuilder:
         # Features
         embed.add_field(
             name="✨ Premium Features",
-            value="• Automatic duel reminders (5 min before)\n"
+            value="• Automatic duel reminders (24h, 1h, 5 min and at start)\n"
                   "• Private message notifications\n"
                   "• Real-time statistics tracking\n"
                   "• Luxury embed designs\n"
@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+
+STAT_FIELDS = ('wins', 'losses', 'draws', 'kills', 'deaths')
+
+# Attachment limits; a tournament night is a few hundred rows at most
+MAX_IMPORT_BYTES = 2 * 1024 * 1024
+MAX_IMPORT_ROWS = 20000
+
+class ImportFileError(ValueError):
+    """The attachment as a whole cannot be imported"""
+
+def _rows(raw: bytes, filename: str):
+    """Yield (row_number, dict) from a CSV or JSON attachment"""
+    text = raw.decode('utf-8-sig')
+    if filename.lower().endswith('.json') or text.lstrip()[:1] in ('[', '{'):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ImportFileError(f"Invalid JSON: {e}")
+        if isinstance(data, dict):
+            data = data.get('results') or data.get('players') or data.get('duels') or []
+        if not isinstance(data, list):
+            raise ImportFileError("JSON must be a list of rows")
+        for number, row in enumerate(data, 1):
+            yield number, row
+    else:
+        reader = csv.DictReader(io.StringIO(text))
+        # Row 1 is the header
+        for number, row in enumerate(reader, 2):
+            yield number, {key.strip().lower(): (value or '').strip() for key, value in row.items() if key}
+
+class PlayerLookup:
+    """Find registered players by id, mention, display name or username"""
+    
+    def __init__(self, players: dict):
+        self.players = players
+        self.by_name = {}
+        for user_id, player in players.items():
+            for name in (player.get('username'), player.get('display_name')):
+                if name:
+                    self.by_name.setdefault(name.lower(), user_id)
+    
+    def find(self, value) -> str | None:
+        value = str(value or '').strip()
+        digits = value.strip('<@!>')
+        if digits.isdigit() and digits in self.players:
+            return digits
+        return self.by_name.get(value.lower())
+
+def _int(row: dict, field: str, default: int = 0) -> int:
+    value = row.get(field)
+    if value in (None, ''):
+        return default
+    # int() would truncate 2.7 (JSON) and bool is an int; only accept whole numbers
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip('+-').isdigit():
+        return int(value)
+    raise ValueError(f"'{field}' must be a whole number, got '{value}'")
+
+def _player_row(row: dict, lookup: PlayerLookup) -> dict:
+    """Per-player row: player (or user_id) plus stat deltas"""
+    user_id = lookup.find(row.get('user_id') or row.get('player'))
+    if not user_id:
+        raise ValueError(f"unknown player '{row.get('user_id') or row.get('player')}'")
+    return {user_id: {field: _int(row, field) for field in STAT_FIELDS}}
+
+def _duel_row(row: dict, lookup: PlayerLookup) -> dict:
+    """Per-duel row: player1, player2, p1_kills, p2_kills and an optional winner"""
+    p1 = lookup.find(row.get('player1'))
+    p2 = lookup.find(row.get('player2'))
+    if not p1 or not p2:
+        raise ValueError(f"unknown player '{row.get('player1') if not p1 else row.get('player2')}'")
+    if p1 == p2:
+        raise ValueError("a player cannot duel themselves")
+    p1_kills, p2_kills = _int(row, 'p1_kills'), _int(row, 'p2_kills')
+    if p1_kills < 0 or p2_kills < 0:
+        raise ValueError("kills cannot be negative")
+    
+    winner = str(row.get('winner') or '').strip()
+    if not winner:
+        winner = p1 if p1_kills > p2_kills else p2 if p2_kills > p1_kills else 'draw'
+    elif winner.lower() in ('draw', 'tie'):
+        winner = 'draw'
+    elif winner.lower() in ('1', 'player1'):
+        winner = p1
+    elif winner.lower() in ('2', 'player2'):
+        winner = p2
+    else:
+        winner = lookup.find(winner)
+        if winner not in (p1, p2):
+            raise ValueError(f"winner '{row.get('winner')}' is not in this duel")
+    
+    deltas = {}
+    for player, kills, deaths in ((p1, p1_kills, p2_kills), (p2, p2_kills, p1_kills)):
+        deltas[player] = {
+            'wins': int(winner == player),
+            'losses': int(winner not in (player, 'draw')),
+            'draws': int(winner == 'draw'),
+            'kills': kills,
+            'deaths': deaths
+        }
+    return deltas
+
+def parse_results(raw: bytes, filename: str, players: dict) -> tuple:
+    """Validate an attachment against the current players
+    
+    Rows with `player1`/`player2` columns are duel results, any other row is
+    a per-player stat delta. Returns (deltas, rows, errors) where deltas maps
+    user ids to summed stat changes, rows is the number of rows read and
+    errors lists (row_number, message) for rejected rows. A row that would
+    push a total below zero is rejected as a whole.
+    """
+    if len(raw) > MAX_IMPORT_BYTES:
+        raise ImportFileError(f"Attachment is larger than {MAX_IMPORT_BYTES // 1024} KB")
+    try:
+        rows = _rows(raw, filename)
+        lookup = PlayerLookup(players)
+        deltas, errors, count = {}, [], 0
+        for number, row in rows:
+            count += 1
+            if count > MAX_IMPORT_ROWS:
+                raise ImportFileError(f"Too many rows (limit {MAX_IMPORT_ROWS})")
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError("row must be an object")
+                row = {str(key).strip().lower(): value for key, value in row.items()}
+                change = _duel_row(row, lookup) if 'player1' in row else _player_row(row, lookup)
+                for user_id, fields in change.items():
+                    current = deltas.get(user_id, {})
+                    for field, value in fields.items():
+                        if players[user_id].get(field, 0) + current.get(field, 0) + value < 0:
+                            raise ValueError(f"{field} of {players[user_id].get('display_name', user_id)} would go below zero")
+            except ValueError as e:
+                errors.append((number, str(e)))
+                continue
+            for user_id, fields in change.items():
+                current = deltas.setdefault(user_id, dict.fromkeys(STAT_FIELDS, 0))
+                for field, value in fields.items():
+                    current[field] += value
+    except UnicodeDecodeError:
+        raise ImportFileError("Attachment must be UTF-8 text")
+    except csv.Error as e:
+        raise ImportFileError(f"Invalid CSV: {e}")
+    return deltas, count, errors
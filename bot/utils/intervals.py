@@ -0,0 +1,100 @@
+import os
+import time
+from bisect import bisect_left, bisect_right
+
+# How long a duel occupies its players, used for conflict detection
+DUEL_LENGTH = int(os.getenv('DUEL_LENGTH_MINUTES', '20')) * 60
+
+# Duel statuses that still occupy a time slot
+ACTIVE_STATUSES = ('scheduled', 'in_progress')
+
+class IntervalIndex:
+    """Per-player sorted index of booked duel slots for O(log n) overlap checks
+    
+    Every duel occupies [timestamp, timestamp + length). With a single duel
+    length, a player's slots sorted by start are also sorted by end, so the
+    slots overlapping a new one form a single run found with two bisections.
+    """
+    
+    def __init__(self, length: int = DUEL_LENGTH):
+        self.length = length
+        self._starts = {}  # player_id -> sorted slot start times
+        self._slots = {}   # player_id -> [(start, duel_id)] in the same order
+    
+    def load(self, duels: dict):
+        """Rebuild the index from the duel table"""
+        self._starts = {}
+        self._slots = {}
+        for duel in duels.values():
+            if duel.get('status') in ACTIVE_STATUSES:
+                self.add_duel(duel)
+    
+    def add_duel(self, duel: dict):
+        for player_id in (duel['player1_id'], duel['player2_id']):
+            self._prune(player_id)
+            starts = self._starts.setdefault(player_id, [])
+            slots = self._slots.setdefault(player_id, [])
+            i = bisect_right(starts, duel['timestamp'])
+            starts.insert(i, duel['timestamp'])
+            slots.insert(i, (duel['timestamp'], duel['id']))
+    
+    def remove_duel(self, duel: dict):
+        for player_id in (duel['player1_id'], duel['player2_id']):
+            starts = self._starts.get(player_id, [])
+            slots = self._slots.get(player_id, [])
+            i = bisect_left(starts, duel['timestamp'])
+            while i < len(slots) and starts[i] == duel['timestamp']:
+                if slots[i][1] == duel['id']:
+                    del starts[i], slots[i]
+                    break
+                i += 1
+    
+    def _prune(self, player_id: int):
+        """Drop slots that ended in the past"""
+        starts = self._starts.get(player_id)
+        if starts:
+            cut = bisect_left(starts, time.time() - self.length)
+            if cut:
+                del starts[:cut], self._slots[player_id][:cut]
+    
+    def conflict(self, player_id: int, start: int, ignore: str | None = None):
+        """Return (slot_start, duel_id) of a booked slot overlapping a duel at `start`, or None"""
+        starts = self._starts.get(player_id, [])
+        slots = self._slots.get(player_id, [])
+        # Overlapping slots start within (start - length, start + length)
+        i = bisect_right(starts, start - self.length)
+        end = bisect_left(starts, start + self.length)
+        for slot in slots[i:end]:
+            if slot[1] != ignore:
+                return slot
+        return None
+    
+    def find_conflict(self, player_ids, start: int, ignore: str | None = None):
+        """Return (player_id, slot_start, duel_id) for the first player already booked at `start`"""
+        for player_id in player_ids:
+            slot = self.conflict(player_id, start, ignore)
+            if slot:
+                return player_id, slot[0], slot[1]
+        return None
+    
+    def nearest_free(self, player_ids, start: int, earliest: int | None = None) -> int:
+        """Return the free start time closest to `start` for all players, not before `earliest`"""
+        if earliest is None:
+            earliest = int(time.time())
+        
+        # Walk past conflicting slots in each direction until both players are free
+        later = start
+        found = self.find_conflict(player_ids, later)
+        while found:
+            later = found[1] + self.length
+            found = self.find_conflict(player_ids, later)
+        
+        earlier = start
+        found = self.find_conflict(player_ids, earlier)
+        while found and earlier >= earliest:
+            earlier = found[1] - self.length
+            found = self.find_conflict(player_ids, earlier)
+        
+        if earlier < earliest:
+            return later
+        return earlier if start - earlier <= later - start else later
@@ -0,0 +1,190 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from bot.utils.database import Database
+from bot.utils.ranking import SORT_KEYS, get_ranked
+
+# Page size bounds for the list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+PLAYER_FIELDS = ('user_id', 'display_name', 'wins', 'losses', 'draws', 'kills', 'deaths',
+                 'total_matches', 'win_rate', 'kd_ratio', 'registered_at')
+
+# Fields returned unless `fields=` asks for others
+DUEL_DEFAULT_FIELDS = ('id', 'player1_name', 'player2_name', 'scheduled_time', 'status', 'created_at')
+DUEL_FIELDS = DUEL_DEFAULT_FIELDS + ('player1_id', 'player2_id', 'timestamp', 'guild_id', 'bracket_id',
+                                     'winner_id', 'player1_kills', 'player2_kills', 'completed_at')
+
+# name -> (data version, SortedListing)
+_listings = {}
+
+class QueryError(ValueError):
+    """A list request with invalid parameters"""
+
+def encode_cursor(key: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))))
+    except (ValueError, TypeError):
+        raise QueryError("invalid cursor")
+
+def parse_fields(value: str | None, allowed: tuple, default: tuple) -> tuple:
+    """Validate a comma separated `fields=` projection"""
+    if not value:
+        return default
+    fields = tuple(field.strip() for field in value.split(',') if field.strip())
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise QueryError(f"unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})")
+    return fields
+
+def parse_page(offset: str | None, limit: str | None) -> tuple:
+    """Validate offset/limit, clamping the limit to MAX_PAGE_SIZE"""
+    try:
+        offset = int(offset or 0)
+        limit = int(limit or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise QueryError("offset and limit must be integers")
+    if offset < 0 or limit < 1:
+        raise QueryError("offset must be >= 0 and limit >= 1")
+    return offset, min(limit, MAX_PAGE_SIZE)
+
+def parse_time(value: str | None) -> float | None:
+    """Accept a unix timestamp or an ISO date/datetime"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise QueryError(f"invalid date '{value}'")
+
+class SortedListing:
+    """Rows sorted by a unique key with optional secondary indexes of row positions
+    
+    A page is located with bisection: the cursor (the last key a client
+    saw) or a key range narrows the positions, then rows are read until the
+    page is full. Secondary indexes map a value to the ascending positions
+    of matching rows, so filtering on them never touches other rows.
+    """
+    
+    def __init__(self, rows: list, key, indexes: dict | None = None):
+        rows = sorted(rows, key=key)
+        self.rows = rows
+        self.keys = [key(row) for row in rows]
+        self.indexes = {}
+        for name, value_of in (indexes or {}).items():
+            index = self.indexes[name] = {}
+            for position, row in enumerate(rows):
+                values = value_of(row)
+                for value in values if isinstance(values, tuple) else (values,):
+                    index.setdefault(value, []).append(position)
+    
+    def query(self, filters: dict | None = None, low: tuple | None = None, high: tuple | None = None,
+              cursor: tuple | None = None, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+              predicate=None) -> tuple:
+        """Return (rows, total, next_cursor) for one page
+        
+        `filters` maps secondary index names to the value rows must have;
+        `low`/`high` bound the key range (inclusive); `predicate` filters
+        rows that no index covers. `total` counts every matching row.
+        """
+        candidates = None
+        for name, value in (filters or {}).items():
+            positions = self.indexes[name].get(value, [])
+            if candidates is None:
+                candidates = positions
+            else:
+                wanted = set(positions)
+                candidates = [position for position in candidates if position in wanted]
+        if candidates is None:
+            candidates = range(len(self.rows))
+        
+        key_at = self.keys.__getitem__
+        start = bisect_left(candidates, low, key=key_at) if low is not None else 0
+        end = bisect_right(candidates, high, key=key_at) if high is not None else len(candidates)
+        if predicate is not None:
+            candidates = [position for position in candidates[start:end] if predicate(self.rows[position])]
+            start, end = 0, len(candidates)
+        total = end - start
+        
+        # The cursor only moves the start of the page, not what is counted
+        if cursor is not None:
+            self._check_cursor(cursor)
+            start = max(start, bisect_right(candidates, cursor, key=key_at))
+        page = candidates[start + offset:min(end, start + offset + limit)]
+        more = start + offset + limit < end
+        
+        rows = [self.rows[position] for position in page]
+        next_cursor = encode_cursor(self.keys[page[-1]]) if more and page else None
+        return rows, total, next_cursor
+
+    def _check_cursor(self, cursor: tuple):
+        """Reject cursors that do not have the shape of this listing's keys (e.g. from another sort)"""
+        if not self.keys:
+            return
+        kinds = [str if isinstance(part, str) else (int, float) for part in self.keys[0]]
+        if len(cursor) != len(kinds) or any(
+                isinstance(part, bool) or not isinstance(part, kind) for part, kind in zip(cursor, kinds)):
+            raise QueryError("invalid cursor")
+
+def _cached(name: str, version, build) -> SortedListing:
+    cached = _listings.get(name)
+    if cached and cached[0] == version:
+        return cached[1]
+    listing = build()
+    _listings[name] = (version, listing)
+    return listing
+
+def player_listing(db: Database, sort_by: str = 'wins') -> SortedListing:
+    """Players in leaderboard order for `sort_by`, keyed (-stat, user_id)"""
+    sort_by = sort_by if sort_by in SORT_KEYS else 'wins'
+    
+    def build():
+        ranked = get_ranked(db, sort_by)
+        value_of = SORT_KEYS[sort_by]
+        rows = [
+            {
+                'user_id': player['user_id'],
+                'display_name': player.get('display_name', 'Unknown'),
+                'wins': player.get('wins', 0),
+                'losses': player.get('losses', 0),
+                'draws': player.get('draws', 0),
+                'kills': player.get('kills', 0),
+                'deaths': player.get('deaths', 0),
+                'total_matches': player['total_matches'],
+                'win_rate': round(player['win_rate'], 1),
+                'kd_ratio': round(player['kd_ratio'], 2),
+                'registered_at': player.get('registered_at', ''),
+                '_sort': value_of(player)
+            }
+            for player in ranked.players.values()
+        ]
+        return SortedListing(rows, key=lambda row: (-row['_sort'], row['user_id']))
+    return _cached(f"players:{sort_by}", db.players_version(), build)
+
+def duel_listing(db: Database) -> SortedListing:
+    """Duels by (timestamp, id) with status and player indexes"""
+    def build():
+        rows = [{**duel, 'id': duel_id} for duel_id, duel in db.get_all_duels().items()]
+        return SortedListing(
+            rows,
+            key=lambda row: (row.get('timestamp', 0), row['id']),
+            indexes={
+                'status': lambda row: row.get('status', 'unknown'),
+                'player': lambda row: (row.get('player1_id'), row.get('player2_id'))
+            }
+        )
+    return _cached('duels', db.duels_version(), build)
+
+def project(rows: list, fields: tuple, defaults: dict | None = None) -> list:
+    """Keep only `fields` of each row"""
+    defaults = defaults or {}
+    return [{field: row.get(field, defaults.get(field)) for field in fields} for row in rows]
@@ -0,0 +1,189 @@
+import asyncio
+import discord
+import heapq
+import itertools
+import time
+from bot.utils.metrics import metrics
+from bot.utils.ratelimit import TokenBucket
+
+# Delivery priorities (lower is sent first)
+PRIORITY_START_NOW = 0
+PRIORITY_REMINDER = 1
+PRIORITY_ANNOUNCEMENT = 2
+PRIORITY_WELCOME = 3
+
+# Outbound DM budget. discord.py already queues each request on its
+# per-route rate-limit bucket (every DM channel is its own route); the
+# token bucket keeps our share of the global limit so a burst of
+# low-priority traffic cannot starve time-critical messages.
+SEND_RATE = 10            # messages per second
+SEND_BURST = 10           # bucket capacity
+SEND_WORKERS = 5          # messages in flight at once
+MAX_RETRIES = 3           # retries on 429/5xx
+RETRY_BASE_DELAY = 1.0    # seconds, doubled per attempt
+RETRY_MAX_DELAY = 30.0
+
+# Discord message limits used when coalescing
+MAX_EMBEDS = 10
+MAX_CONTENT = 2000
+
+class _Message:
+    """A pending message to one recipient, possibly merged from several submissions"""
+    
+    def __init__(self, recipient, priority: int, payload: dict):
+        self.recipient = recipient
+        self.priority = priority
+        self.content = payload.get('content')
+        self.embeds = list(payload.get('embeds') or [])
+        if payload.get('embed'):
+            self.embeds.append(payload['embed'])
+        self.futures = []
+        self.taken = False
+        self.queued_at = time.monotonic()
+    
+    def can_merge(self, payload: dict) -> bool:
+        embeds = len(payload.get('embeds') or []) + (1 if payload.get('embed') else 0)
+        content = len(payload.get('content') or '')
+        if content and self.content:
+            content += len(self.content) + 2
+        return len(self.embeds) + embeds <= MAX_EMBEDS and content <= MAX_CONTENT
+    
+    def merge(self, payload: dict, priority: int):
+        if payload.get('content'):
+            self.content = f"{self.content}\n\n{payload['content']}" if self.content else payload['content']
+        self.embeds.extend(payload.get('embeds') or [])
+        if payload.get('embed'):
+            self.embeds.append(payload['embed'])
+        self.priority = min(self.priority, priority)
+    
+    def payload(self) -> dict:
+        payload = {}
+        if self.content:
+            payload['content'] = self.content
+        if self.embeds:
+            payload['embeds'] = self.embeds
+        return payload
+
+class OutboundQueue:
+    """Central prioritized DM queue with a token bucket, retries and per-recipient coalescing
+    
+    Messages submitted for a recipient who already has a message waiting are
+    merged into that message, so a player with several simultaneous duels
+    receives one DM instead of several.
+    """
+    
+    def __init__(self, rate: float = SEND_RATE, burst: float = SEND_BURST, workers: int = SEND_WORKERS):
+        self.bucket = TokenBucket(rate, burst)
+        self.worker_count = workers
+        self._heap = []
+        self._sequence = itertools.count()
+        self._pending = {}  # recipient id -> _Message not yet picked up by a worker
+        self._ready = asyncio.Event()
+        self._workers = []
+    
+    def start(self):
+        """Start the sender workers on the running event loop"""
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.worker_count:
+            self._workers.append(asyncio.create_task(self._worker()))
+    
+    def stop(self):
+        """Stop the sender workers"""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+    
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting to be sent"""
+        return len(self._pending)
+    
+    def submit(self, recipient, payload: dict, priority: int = PRIORITY_ANNOUNCEMENT) -> asyncio.Future:
+        """Queue a message and return a future resolving to its outcome
+        
+        Outcomes are 'sent', 'forbidden', 'not_found' or 'failed'.
+        """
+        future = asyncio.get_running_loop().create_future()
+        message = self._pending.get(recipient.id)
+        
+        if message and message.can_merge(payload):
+            raised = priority < message.priority
+            message.merge(payload, priority)
+            if raised:
+                self._push(message)
+        else:
+            message = _Message(recipient, priority, payload)
+            self._pending[recipient.id] = message
+            self._push(message)
+        
+        message.futures.append(future)
+        self.start()
+        return future
+    
+    async def send_many(self, deliveries: list, priority: int = PRIORITY_ANNOUNCEMENT) -> dict:
+        """Queue deliveries and wait for {recipient_id: outcome}
+        
+        Each delivery is (recipient, payload) or (recipient, payload, priority).
+        All of them are queued before any is sent, so several messages for the
+        same recipient are coalesced into one DM.
+        """
+        deliveries = [delivery for delivery in deliveries if delivery[0]]
+        futures = [
+            self.submit(delivery[0], delivery[1], delivery[2] if len(delivery) > 2 else priority)
+            for delivery in deliveries
+        ]
+        outcomes = await asyncio.gather(*futures)
+        return {delivery[0].id: outcome for delivery, outcome in zip(deliveries, outcomes)}
+    
+    def _push(self, message: _Message):
+        heapq.heappush(self._heap, (message.priority, next(self._sequence), message))
+        self._ready.set()
+    
+    async def _next_message(self) -> _Message:
+        while True:
+            while self._heap:
+                _, _, message = heapq.heappop(self._heap)
+                if message.taken:
+                    continue  # stale entry left behind by a priority bump
+                message.taken = True
+                if self._pending.get(message.recipient.id) is message:
+                    del self._pending[message.recipient.id]
+                return message
+            self._ready.clear()
+            await self._ready.wait()
+    
+    async def _worker(self):
+        while True:
+            message = await self._next_message()
+            outcome = await self._deliver(message)
+            metrics.record('outbox.send_seconds', time.monotonic() - message.queued_at)
+            for future in message.futures:
+                if not future.done():
+                    future.set_result(outcome)
+    
+    async def _deliver(self, message: _Message) -> str:
+        """Send one message, retrying with backoff on rate limits and server errors"""
+        recipient = message.recipient
+        
+        for attempt in range(MAX_RETRIES + 1):
+            await self.bucket.acquire()
+            try:
+                await recipient.send(**message.payload())
+                return 'sent'
+            except discord.Forbidden:
+                print(f"❌ Cannot send DM to {recipient.display_name}")
+                return 'forbidden'
+            except discord.NotFound:
+                return 'not_found'
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500 or attempt == MAX_RETRIES:
+                    print(f"❌ Failed to send DM to {recipient.display_name}: {e}")
+                    return 'failed'
+                if e.status == 429:
+                    self.bucket.drain()
+                await asyncio.sleep(min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            except Exception as e:
+                print(f"❌ Failed to send DM to {recipient.display_name}: {e}")
+                return 'failed'
+        
+        return 'failed'
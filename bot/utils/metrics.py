@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import deque
+
+# Samples kept per histogram; percentiles describe the most recent window
+HISTOGRAM_WINDOW = 2048
+
+class RollingHistogram:
+    """Fixed-size window of recent samples with percentile summaries"""
+    
+    def __init__(self, window: int = HISTOGRAM_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()  # the web dashboard reads from another thread
+        self.count = 0
+        self.total = 0.0
+    
+    def record(self, value: float):
+        with self._lock:
+            self._samples.append(value)
+            self.count += 1
+            self.total += value
+    
+    def snapshot(self) -> dict:
+        """Summarize the window: min, p50, p90, p99, max and mean"""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total = self.count, self.total
+        
+        summary = {'count': count, 'window': len(samples)}
+        if not samples:
+            return summary
+        
+        def percentile(p: float) -> float:
+            return samples[min(len(samples) - 1, int(p / 100 * len(samples)))]
+        
+        summary.update({
+            'min': samples[0],
+            'p50': percentile(50),
+            'p90': percentile(90),
+            'p99': percentile(99),
+            'max': samples[-1],
+            'mean': total / count
+        })
+        return summary
+
+class MetricsRegistry:
+    """Named histograms shared by the bot and the web dashboard"""
+    
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+    
+    def histogram(self, name: str) -> RollingHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, RollingHistogram())
+        return histogram
+    
+    def record(self, name: str, value: float):
+        self.histogram(name).record(value)
+    
+    def snapshot(self) -> dict:
+        """Return {name: summary} for every histogram"""
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histogram.snapshot() for name, histogram in sorted(histograms.items())}
+
+# Process-wide registry; the dashboard runs in the same process as the bot
+metrics = MetricsRegistry()
@@ -0,0 +1,70 @@
+import discord
+from typing import Callable
+
+PAGE_TIMEOUT = 300  # seconds before the buttons stop responding
+
+class PageView(discord.ui.View):
+    """First/previous/next/last buttons around a page renderer
+    
+    The view only keeps the current offset; every flip asks `render` for the
+    page at the new offset, which returns (embed, total_items).
+    """
+    
+    def __init__(self, render: Callable[[int], tuple], page_size: int, total: int, owner_id: int):
+        super().__init__(timeout=PAGE_TIMEOUT)
+        self.render = render
+        self.page_size = page_size
+        self.total = total
+        self.owner_id = owner_id
+        self.offset = 0
+        self.message = None
+        self._update_buttons()
+    
+    def _update_buttons(self):
+        last = max(0, (self.total - 1) // self.page_size * self.page_size)
+        self.first_page.disabled = self.previous_page.disabled = self.offset <= 0
+        self.next_page.disabled = self.last_page.disabled = self.offset >= last
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.owner_id:
+            await interaction.response.send_message(
+                "❌ Run the command yourself to browse the pages!",
+                ephemeral=True
+            )
+            return False
+        return True
+    
+    async def _show(self, interaction: discord.Interaction, offset: int):
+        embed, self.total = self.render(max(0, offset))
+        last = max(0, (self.total - 1) // self.page_size * self.page_size)
+        self.offset = min(max(0, offset), last)
+        if self.offset != offset:
+            # The roster shrank since the last page; render the clamped page
+            embed, self.total = self.render(self.offset)
+        self._update_buttons()
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @discord.ui.button(emoji="⏮️", style=discord.ButtonStyle.secondary)
+    async def first_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, 0)
+    
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.primary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.offset - self.page_size)
+    
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.primary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.offset + self.page_size)
+    
+    @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary)
+    async def last_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, (self.total - 1) // self.page_size * self.page_size)
+    
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
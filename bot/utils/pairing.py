@@ -0,0 +1,115 @@
+import discord
+from datetime import datetime
+from bot.utils.intervals import IntervalIndex
+
+# Hard cap on slots tried per pairing when packing a round
+MAX_SLOTS = 1000
+
+def player_points(player: dict) -> float:
+    """Swiss standings score: a win is worth 1 point, a draw half a point"""
+    return player.get('wins', 0) + 0.5 * player.get('draws', 0)
+
+def round_robin_pairs(player_ids: list, round_number: int):
+    """Pair players for one round of a round-robin using the circle method
+    
+    Returns (pairs, bye) where bye is the player sitting out, if any. Over
+    len(player_ids) - 1 rounds (len rounds when odd) everyone meets once.
+    """
+    ids = sorted(player_ids)
+    if len(ids) % 2:
+        ids.append(None)
+    if len(ids) < 2:
+        return [], ids[0] if ids else None
+    
+    rest = ids[1:]
+    shift = round_number % len(rest)
+    ids = [ids[0]] + rest[shift:] + rest[:shift]
+    
+    pairs, bye = [], None
+    for i in range(len(ids) // 2):
+        a, b = ids[i], ids[-1 - i]
+        if a is None or b is None:
+            bye = a if b is None else b
+        else:
+            pairs.append((a, b))
+    return pairs, bye
+
+def swiss_pairs(players: dict, played: set, had_bye=frozenset()):
+    """Pair players with similar scores, avoiding rematches where possible
+    
+    `players` maps user ids to player records and `played` holds frozensets
+    of pairs that have already met. Players are ranked by points then K/D;
+    each unpaired player is matched with the highest-ranked opponent below
+    them they have not played yet, falling back to a rematch only when
+    every remaining opponent is a rematch. With an odd count the bye goes
+    to the lowest-ranked player not in `had_bye` (the lowest-ranked player
+    once everyone has had one). Returns (pairs, bye).
+    """
+    ranked = sorted(
+        players,
+        key=lambda pid: (player_points(players[pid]),
+                         players[pid].get('kills', 0) / max(1, players[pid].get('deaths', 0))),
+        reverse=True
+    )
+    
+    bye = None
+    if len(ranked) % 2:
+        bye = next((pid for pid in reversed(ranked) if pid not in had_bye), ranked[-1])
+        ranked.remove(bye)
+    
+    pairs = []
+    unpaired = ranked
+    while unpaired:
+        player, candidates = unpaired[0], unpaired[1:]
+        opponent = next((c for c in candidates if frozenset((player, c)) not in played), candidates[0])
+        pairs.append((player, opponent))
+        unpaired = [c for c in candidates if c != opponent]
+    return pairs, bye
+
+def make_duel_record(player1_id: int, player2_id: int, player1_name: str, player2_name: str,
+                     timestamp: int, scheduled_by: int, guild_id: int | None, **extra) -> dict:
+    """Build a scheduled duel record in the same shape /duel stores"""
+    duel_id = f"{player1_id}_{player2_id}_{timestamp}"
+    return {
+        "id": duel_id,
+        "player1_id": player1_id,
+        "player2_id": player2_id,
+        "player1_name": player1_name,
+        "player2_name": player2_name,
+        "scheduled_time": datetime.fromtimestamp(timestamp).isoformat(),
+        "timestamp": timestamp,
+        "status": "scheduled",
+        "scheduled_by": scheduled_by,
+        "guild_id": guild_id,
+        "reminder_tiers": None,
+        **extra,
+        "created_at": discord.utils.utcnow().isoformat(),
+        "reminder_sent": False
+    }
+
+def pack_slots(pairs: list, start: int, intervals: IntervalIndex, parallel: int = 1) -> list:
+    """Assign each pair the earliest slot from `start` where both players are free
+    
+    Slots are `intervals.length` apart and hold at most `parallel` duels.
+    Assigned duels are added to `intervals` as they are placed, so players
+    are never double-booked within the round either. Returns a list of
+    (player1_id, player2_id, timestamp); pairs that cannot be placed within
+    MAX_SLOTS slots are left out.
+    """
+    load = {}  # slot number -> duels placed in it
+    first_open = 0  # every slot before this one is full
+    packed = []
+    
+    for p1, p2 in pairs:
+        while load.get(first_open, 0) >= parallel:
+            first_open += 1
+        
+        for slot in range(first_open, first_open + MAX_SLOTS):
+            timestamp = start + slot * intervals.length
+            if load.get(slot, 0) < parallel and not intervals.find_conflict((p1, p2), timestamp):
+                load[slot] = load.get(slot, 0) + 1
+                intervals.add_duel({'id': f"{p1}_{p2}_{timestamp}", 'player1_id': p1,
+                                    'player2_id': p2, 'timestamp': timestamp})
+                packed.append((p1, p2, timestamp))
+                break
+    return packed
@@ -0,0 +1,119 @@
+import contextvars
+import json
+import os
+import time
+from collections import deque
+import discord
+from discord import app_commands
+from discord.webhook.async_ import async_context
+from bot.utils.metrics import metrics
+
+# Commands slower than this (seconds, from the tree check until the
+# handler returns) are printed and kept in the slow-command log
+SLOW_COMMAND_SECONDS = float(os.getenv('SLOW_COMMAND_SECONDS', '2.0'))
+SLOW_LOG_SIZE = 50
+
+# Timing of the command running in the current task. Tasks spawned while
+# it runs (e.g. the completion event) copy the context and see it too.
+_current = contextvars.ContextVar('command_timing', default=None)
+
+# Most recent slow commands, newest last
+slow_log = deque(maxlen=SLOW_LOG_SIZE)
+
+class CommandTiming:
+    """Time spent by one command invocation, split by where it went"""
+    
+    __slots__ = ('command', 'started', 'storage', 'storage_bytes', 'discord', 'discord_calls',
+                 'payload_bytes', 'done')
+    
+    def __init__(self, command: str):
+        self.command = command
+        self.started = time.perf_counter()
+        self.storage = 0.0
+        self.storage_bytes = 0
+        self.discord = 0.0
+        self.discord_calls = 0
+        self.payload_bytes = 0
+        self.done = False
+
+def begin(command: str) -> CommandTiming:
+    """Start timing a command in the current task"""
+    timing = CommandTiming(command)
+    _current.set(timing)
+    return timing
+
+def finish(failed: bool = False) -> CommandTiming | None:
+    """Record the current command's timings; later calls for the same command do nothing"""
+    timing = _current.get()
+    if timing is None or timing.done:
+        return None
+    timing.done = True
+    wall = time.perf_counter() - timing.started
+    
+    prefix = f"command.{timing.command}"
+    metrics.record(f"{prefix}.wall_seconds", wall)
+    metrics.record(f"{prefix}.storage_seconds", timing.storage)
+    metrics.record(f"{prefix}.discord_seconds", timing.discord)
+    metrics.record(f"{prefix}.payload_bytes", timing.payload_bytes)
+    
+    if wall >= SLOW_COMMAND_SECONDS:
+        slow_log.append({
+            'command': timing.command,
+            'at': time.time(),
+            'wall': wall,
+            'storage': timing.storage,
+            'storage_bytes': timing.storage_bytes,
+            'discord': timing.discord,
+            'discord_calls': timing.discord_calls,
+            'payload_bytes': timing.payload_bytes,
+            'failed': failed
+        })
+        print(f"🐢 Slow command /{timing.command}: {wall:.2f}s "
+              f"(storage {timing.storage:.2f}s, discord {timing.discord:.2f}s over {timing.discord_calls} calls, "
+              f"{timing.payload_bytes / 1024:.1f} KB sent)")
+    return timing
+
+def track_storage(seconds: float, size: int):
+    """Add a data file read or write to the running command, if any"""
+    timing = _current.get()
+    if timing is not None:
+        timing.storage += seconds
+        timing.storage_bytes += size
+
+def _payload_size(payload) -> int:
+    if not payload:
+        return 0
+    try:
+        return len(json.dumps(payload))
+    except (TypeError, ValueError):
+        return 0
+
+def _timed(request, payload_key: str):
+    """Wrap an HTTP request coroutine so its time and payload count towards the running command"""
+    async def wrapper(route, *args, **kwargs):
+        timing = _current.get()
+        if timing is None:
+            return await request(route, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await request(route, *args, **kwargs)
+        finally:
+            timing.discord += time.perf_counter() - started
+            timing.discord_calls += 1
+            timing.payload_bytes += _payload_size(kwargs.get(payload_key))
+    return wrapper
+
+def instrument_http(client: discord.Client):
+    """Time the REST client and the webhook adapter used for interaction responses and followups"""
+    client.http.request = _timed(client.http.request, 'json')
+    adapter = async_context.get()
+    adapter.request = _timed(adapter.request, 'payload')
+
+class InstrumentedTree(app_commands.CommandTree):
+    """Command tree that starts a CommandTiming for every slash command it runs"""
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type is discord.InteractionType.application_command:
+            command = interaction.command
+            begin(command.qualified_name if command else interaction.data.get('name', 'unknown'))
+        return True
@@ -0,0 +1,59 @@
+from bot.utils.database import Database
+
+# Leaderboard sort keys and the stat each one orders by
+SORT_KEYS = {
+    'wins': lambda p: p.get('wins', 0),
+    'win_rate': lambda p: p['win_rate'],
+    'kills': lambda p: p.get('kills', 0),
+    'kd_ratio': lambda p: p['kd_ratio'],
+    'matches': lambda p: p['total_matches']
+}
+
+# sort_by -> (players data version, RankedIndex)
+_index_cache = {}
+
+class RankedIndex:
+    """Players ordered by one stat, with derived stats computed once"""
+    
+    def __init__(self, players: dict, sort_by: str):
+        self.sort_by = sort_by if sort_by in SORT_KEYS else 'wins'
+        self.players = {}
+        for user_id, player in players.items():
+            total_matches = player.get('wins', 0) + player.get('losses', 0) + player.get('draws', 0)
+            self.players[user_id] = {
+                **player,
+                'user_id': int(user_id),
+                'total_matches': total_matches,
+                'win_rate': (player.get('wins', 0) / max(1, total_matches)) * 100,
+                'kd_ratio': player.get('kills', 0) / max(1, player.get('deaths', 0))
+            }
+        
+        key = SORT_KEYS[self.sort_by]
+        self.order = sorted(self.players, key=lambda user_id: key(self.players[user_id]), reverse=True)
+        self.totals = {
+            'players': len(self.players),
+            'wins': sum(p.get('wins', 0) for p in self.players.values()),
+            'matches': sum(p['total_matches'] for p in self.players.values()),
+            'kills': sum(p.get('kills', 0) for p in self.players.values())
+        }
+    
+    def __len__(self) -> int:
+        return len(self.order)
+    
+    def page(self, offset: int, limit: int) -> list:
+        """Return [(rank, player)] for one page, ranks starting at 1"""
+        return [
+            (rank, self.players[user_id])
+            for rank, user_id in enumerate(self.order[offset:offset + limit], offset + 1)
+        ]
+
+def get_ranked(db: Database, sort_by: str = 'wins') -> RankedIndex:
+    """Return the ranked index for a sort key, rebuilding it only when the player data changed"""
+    version = db.players_version()
+    cached = _index_cache.get(sort_by)
+    if cached and cached[0] == version:
+        return cached[1]
+    
+    index = RankedIndex(db.get_all_players(), sort_by)
+    _index_cache[sort_by] = (version, index)
+    return index
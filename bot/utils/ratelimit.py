@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second up to `capacity`"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if available without waiting"""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+    
+    def retry_after(self, tokens: float = 1) -> float:
+        """Seconds until the requested tokens will be available"""
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+    
+    async def acquire(self, tokens: float = 1):
+        """Wait until tokens are available, then take them"""
+        while not self.try_acquire(tokens):
+            await asyncio.sleep(self.retry_after(tokens))
+    
+    def drain(self):
+        """Empty the bucket, e.g. after the remote side reported a rate limit"""
+        self._refill()
+        self.tokens = 0
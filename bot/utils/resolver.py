@@ -0,0 +1,104 @@
+import asyncio
+import discord
+import time
+from collections import OrderedDict
+
+# Resolved users are kept in a bounded LRU so reminders keep working for
+# players the client cache does not hold, without caching whole guilds.
+CACHE_SIZE = 4096
+CACHE_TTL = 3600          # seconds a resolved user stays valid
+MISSING_TTL = 300         # seconds to remember users that could not be found
+CHUNK_SIZE = 100          # Discord limit for user_ids in a member chunk request
+FETCH_CONCURRENCY = 5     # parallel fetch_user calls for the remainder
+
+class UserResolver:
+    """Resolve user ids via the client cache, then an LRU, then bulk fetches"""
+    
+    def __init__(self, bot, size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.bot = bot
+        self.size = size
+        self.ttl = ttl
+        self._cache = OrderedDict()  # user_id -> (user or None, expires_at)
+    
+    def _remember(self, user_id: int, user, ttl: float):
+        self._cache[user_id] = (user, time.monotonic() + ttl)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+    
+    def _cached(self, user_id: int):
+        """Return (hit, user) from the LRU, dropping expired entries"""
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return False, None
+        if entry[1] < time.monotonic():
+            del self._cache[user_id]
+            return False, None
+        self._cache.move_to_end(user_id)
+        return True, entry[0]
+    
+    def get(self, user_id: int):
+        """Resolve a user without any network requests"""
+        user = self.bot.get_user(user_id)
+        if user:
+            return user
+        return self._cached(user_id)[1]
+    
+    async def resolve(self, user_id: int, guild_id: int | None = None):
+        """Resolve a single user, fetching it if necessary"""
+        return (await self.resolve_many([user_id], guild_id)).get(user_id)
+    
+    async def resolve_many(self, user_ids, guild_id: int | None = None) -> dict:
+        """Resolve several users, batching everything the caches cannot answer
+        
+        Misses are first requested as guild member chunks (up to 100 ids per
+        gateway request) and whatever is still missing is fetched over REST
+        with bounded concurrency. Returns {user_id: user} for found users.
+        """
+        resolved = {}
+        missing = []
+        
+        for user_id in dict.fromkeys(user_ids):
+            user = self.bot.get_user(user_id)
+            if user:
+                resolved[user_id] = user
+                continue
+            hit, user = self._cached(user_id)
+            if hit:
+                if user:
+                    resolved[user_id] = user
+            else:
+                missing.append(user_id)
+        
+        guild = self.bot.get_guild(guild_id) if guild_id else None
+        if missing and guild:
+            for i in range(0, len(missing), CHUNK_SIZE):
+                try:
+                    members = await guild.query_members(user_ids=missing[i:i + CHUNK_SIZE], cache=False)
+                except (asyncio.TimeoutError, discord.ClientException) as e:
+                    print(f"❌ Member chunk request failed: {e}")
+                    continue
+                for member in members:
+                    self._remember(member.id, member, self.ttl)
+                    resolved[member.id] = member
+            missing = [user_id for user_id in missing if user_id not in resolved]
+        
+        if missing:
+            semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+            
+            async def fetch(user_id: int):
+                async with semaphore:
+                    try:
+                        user = await self.bot.fetch_user(user_id)
+                    except discord.NotFound:
+                        self._remember(user_id, None, MISSING_TTL)
+                        return
+                    except discord.HTTPException as e:
+                        print(f"❌ Failed to fetch user {user_id}: {e}")
+                        return
+                self._remember(user_id, user, self.ttl)
+                resolved[user_id] = user
+            
+            await asyncio.gather(*(fetch(user_id) for user_id in missing))
+        
+        return resolved
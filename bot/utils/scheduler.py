@@ -1,178 +1,574 @@
 import asyncio
-import discord
-from datetime import datetime, timedelta
+import heapq
+import itertools
+import os
+import time
+from datetime import datetime
 from bot.utils.database import Database
 from bot.utils.embeds import EmbedBuilder
+from bot.utils.messaging import PRIORITY_REMINDER, PRIORITY_START_NOW
+from bot.utils.metrics import metrics
+
+# Reminder tiers are lead times in seconds before the duel starts; a tier of
+# 0 sends the "duel starting now" notification. Guilds and individual duels
+# can override the default.
+DEFAULT_REMINDER_TIERS = [86400, 3600, 300, 0]
+CLEANUP_DELAY = 3600  # forget reminder tracking 1 hour after the duel
+
+TIER_UNITS = {'d': 86400, 'h': 3600, 'm': 60, 's': 1}
+
+def parse_tiers(text: str) -> list:
+    """Parse a tier list such as "24h, 1h, 5m, start" into lead times in seconds"""
+    tiers = set()
+    for part in text.replace(' ', '').lower().split(','):
+        if not part:
+            continue
+        if part in ('start', 'now', '0'):
+            tiers.add(0)
+        elif part[-1] in TIER_UNITS and part[:-1].isdigit():
+            tiers.add(int(part[:-1]) * TIER_UNITS[part[-1]])
+        else:
+            raise ValueError(f"Invalid reminder tier: {part}")
+    return sorted(tiers, reverse=True)
+
+def resolve_duel_date(day: int, hour: int, minute: int) -> datetime:
+    """Turn a day of month and time into the next matching date (raises ValueError)"""
+    current_date = datetime.now()
+    current_year = current_date.year
+    current_month = current_date.month
+    
+    # Handle month overflow
+    if day < current_date.day and current_month == 12:
+        return datetime(current_year + 1, 1, day, hour, minute)
+    elif day < current_date.day:
+        return datetime(current_year, current_month + 1, day, hour, minute)
+    return datetime(current_year, current_month, day, hour, minute)
+
+# What to do with reminders that came due while the bot was offline:
+#   late      - send them now if the duel has not started yet
+#   skip      - drop them
+#   summarize - send each player one digest of the reminders they missed
+CATCH_UP_POLICY = os.getenv('REMINDER_CATCH_UP', 'late')
+# A missed "duel starting now" DM is still sent this many seconds after the
+# start (unless the policy is skip); older duels only get their status updated
+START_NOTIFY_GRACE = 300
+CATCH_UP_BATCH = 25       # missed events replayed per batch
+CATCH_UP_PAUSE = 1.0      # seconds between catch-up batches
+
+# Upper bound on events handled per tick; anything beyond it is picked up
+# by the next tick straight away, so one huge round cannot stall the loop
+MAX_EVENTS_PER_TICK = 200
+
+# Participants of a reminder or start DM are resolved this many seconds
+# ahead of the deadline, so a cold user cache costs no time at send time
+PREFETCH_LEAD = 120
+PREFETCH_PREFIX = "prefetch:"
 
 class DuelScheduler:
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
         self.embed_builder = EmbedBuilder()
-        self.reminder_sent = set()  # Track sent reminders to avoid duplicates
+        
+        # Mirror of the persisted event queue: "duel_id:kind[:lead]" -> event.
+        # Event status moves pending -> sent (or skipped, or failed when no DM
+        # could be built or delivered) in the same tick the DMs are queued, so
+        # a restart never repeats a send that may already have gone out.
+        self._events = {}
+        self._duel_keys = {}  # duel_id -> set of event keys
+        self._guild_tiers = {}  # guild_id -> reminder tiers
+        # Min-heap of (due_timestamp, sequence, event_key); entries whose
+        # event was cancelled, rescheduled or already handled are skipped
+        self._queue = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+    
+    def start(self):
+        """Start the scheduler loop on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+    
+    def stop(self):
+        """Stop the scheduler loop"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+    
+    def tiers_for(self, duel: dict) -> list:
+        """Reminder tiers for a duel: its own override, else its guild's, else the default"""
+        if duel.get('reminder_tiers') is not None:
+            return duel['reminder_tiers']
+        return self._guild_tiers.get(str(duel.get('guild_id')), DEFAULT_REMINDER_TIERS)
+    
+    def set_guild_tiers(self, guild_id: int, tiers: list):
+        """Change a guild's default reminder tiers and requeue its upcoming duels"""
+        self.db.update_guild_settings(guild_id, {'reminder_tiers': tiers})
+        self._guild_tiers[str(guild_id)] = tiers
+        
+        self.schedule_duels([
+            duel for duel in self.db.get_all_duels().values()
+            if (duel.get('status') == 'scheduled' and duel.get('guild_id') == guild_id
+                and duel.get('reminder_tiers') is None)
+        ])
+    
+    def _build_events(self, duel: dict) -> dict:
+        """Create the event set for a duel, keeping markers of events already handled
+        
+        Reminder tiers that have already passed when the duel is scheduled
+        are left out rather than fired immediately.
+        """
+        tiers = self.tiers_for(duel)
+        start = duel['timestamp']
+        now = time.time()
+        
+        wanted = {
+            f"{duel['id']}:start": {'kind': 'start', 'due': start, 'notify': 0 in tiers},
+            f"{duel['id']}:cleanup": {'kind': 'cleanup', 'due': start + CLEANUP_DELAY}
+        }
+        for lead in tiers:
+            if lead > 0:
+                wanted[f"{duel['id']}:reminder:{lead}"] = {'kind': 'reminder', 'due': start - lead, 'lead': lead}
+        
+        events = {}
+        for key, spec in wanted.items():
+            existing = self._events.get(key)
+            if existing and existing['due'] == spec['due']:
+                events[key] = {**existing, **spec}
+            elif spec['kind'] != 'reminder' or spec['due'] > now:
+                events[key] = {'duel_id': duel['id'], **spec, 'status': 'pending'}
+        return events
+    
+    def load_schedule(self) -> list:
+        """Rebuild the event heap from disk and return events missed while offline"""
+        duels = self.db.get_all_duels()
+        stored = self.db.get_reminder_events()
+        self._guild_tiers = {
+            guild_id: settings['reminder_tiers']
+            for guild_id, settings in self.db.get_guild_settings().items()
+            if 'reminder_tiers' in settings
+        }
+        
+        # Forget events for duels that no longer exist
+        self._events = {}
+        self._duel_keys = {}
+        for key, event in stored.items():
+            if event['duel_id'] in duels:
+                self._add_event(key, event)
+        
+        # Queue events for scheduled duels created before the queue existed
+        for duel in duels.values():
+            if duel.get('status') == 'scheduled' and duel['id'] not in self._duel_keys:
+                for key, event in self._build_events(duel).items():
+                    if event['kind'] == 'reminder' and duel.get('reminder_sent'):
+                        continue
+                    self._add_event(key, event)
+        
+        # Queues written by older versions may hold interrupted sends; never repeat them
+        for event in self._events.values():
+            if event['status'] == 'sending':
+                event['status'] = 'sent'
+        
+        if self._events != stored:
+            self.db.save_reminder_events(self._events)
+        
+        now = time.time()
+        missed = []
+        for key, event in self._events.items():
+            if event['status'] != 'pending':
+                continue
+            if event['due'] <= now:
+                missed.append(key)
+            else:
+                self._push_event(key, event)
+        
+        missed.sort(key=lambda key: self._events[key]['due'])
+        print(f"⏰ Scheduler loaded {len(self._queue)} pending event(s), {len(missed)} missed")
+        return missed
+    
+    def schedule_duel(self, duel: dict):
+        """Queue reminder, start and cleanup events for a new or rescheduled duel"""
+        self.schedule_duels([duel])
+    
+    def schedule_duels(self, duels: list):
+        """Queue the events of several duels, persisting them with a single write"""
+        duel_events = {}
+        for duel in duels:
+            events = self._build_events(duel)
+            # Unchanged pending events are already on the heap; only queue new or moved ones
+            queued = {key: self._events[key]['due'] for key in self._duel_keys.get(duel['id'], ())
+                      if self._events[key]['status'] == 'pending'}
+            self._drop_events(duel['id'])
+            for key, event in events.items():
+                self._add_event(key, event)
+                if event['status'] == 'pending' and queued.get(key) != event['due']:
+                    self._push_event(key, event)
+            duel_events[duel['id']] = events
+        
+        if duel_events:
+            self.db.set_reminder_events(duel_events)
+            self._wakeup.set()
+    
+    def cancel_duel(self, duel_id: str):
+        """Drop all pending events for a duel"""
+        if self._drop_events(duel_id):
+            self.db.set_duel_reminder_events(duel_id, {})
+            self._wakeup.set()
+    
+    def _add_event(self, key: str, event: dict):
+        self._events[key] = event
+        self._duel_keys.setdefault(event['duel_id'], set()).add(key)
+    
+    def _drop_events(self, duel_id: str) -> bool:
+        keys = self._duel_keys.pop(duel_id, set())
+        for key in keys:
+            del self._events[key]
+        return bool(keys)
+    
+    def _push(self, due: float, key: str):
+        heapq.heappush(self._queue, (due, next(self._sequence), key))
+    
+    def _push_event(self, key: str, event: dict):
+        """Queue an event, plus a participant prefetch ahead of events that send DMs"""
+        self._push(event['due'], key)
+        if event['kind'] == 'reminder' or event.get('notify'):
+            self._push(event['due'] - PREFETCH_LEAD, PREFETCH_PREFIX + key)
+    
+    def _is_current(self, key: str, due: float) -> bool:
+        """Check that a popped heap entry still refers to a pending event"""
+        if key.startswith(PREFETCH_PREFIX):
+            key, due = key[len(PREFETCH_PREFIX):], due + PREFETCH_LEAD
+        event = self._events.get(key)
+        return bool(event) and event['status'] == 'pending' and event['due'] == due
+    
+    def _mark(self, statuses: dict, forget=()):
+        """Persist event status markers ({key: status}) and drop finished duels' events with a single write"""
+        updates = {}
+        for key, status in statuses.items():
+            event = self._events.get(key)
+            if event:
+                event['status'] = status
+                updates[key] = event
+        dropped = [duel_id for duel_id in forget if self._drop_events(duel_id)]
+        updates = {key: event for key, event in updates.items() if key in self._events}
+        if updates or dropped:
+            self.db.update_reminder_events(updates, remove_duels=dropped)
+    
+    def next_deadline(self) -> float | None:
+        """Return the due time of the earliest live event, discarding stale ones"""
+        while self._queue:
+            due, _, key = self._queue[0]
+            if self._is_current(key, due):
+                return due
+            heapq.heappop(self._queue)
+        return None
+    
+    async def run(self):
+        """Replay missed events, then sleep until each next deadline and dispatch it"""
+        await self.bot.wait_until_ready()
+        missed = self.load_schedule()
+        if missed:
+            await self.catch_up(missed)
+        
+        while not self.bot.is_closed():
+            self._wakeup.clear()
+            deadline = self.next_deadline()
+            delay = None if deadline is None else deadline - time.time()
+            
+            if delay is None or delay > 0:
+                # Idle until the deadline or until the schedule changes
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            await self.check_reminders()
     
     async def check_reminders(self):
-        """Check for upcoming duels and send reminders"""
+        """Dispatch the events whose deadline has passed, at most MAX_EVENTS_PER_TICK at a time"""
+        tick_start = time.perf_counter()
+        now = time.time()
+        due_keys = []
+        prefetch_keys = []
+        
+        while self._queue and self._queue[0][0] <= now and len(due_keys) < MAX_EVENTS_PER_TICK:
+            due, _, key = heapq.heappop(self._queue)
+            if not self._is_current(key, due):
+                continue
+            if key.startswith(PREFETCH_PREFIX):
+                prefetch_keys.append(key[len(PREFETCH_PREFIX):])
+            else:
+                due_keys.append(key)
+        
+        if prefetch_keys:
+            # Runs in the background so it never delays an actual deadline
+            duel_ids = {self._events[key]['duel_id'] for key in prefetch_keys}
+            asyncio.create_task(self._resolve_participants(duel_ids))
+        if due_keys:
+            await self._dispatch(due_keys)
+        
+        metrics.record('scheduler.tick_seconds', time.perf_counter() - tick_start)
+        metrics.record('scheduler.queue_depth', len(self._queue))
+        metrics.record('outbox.queue_depth', self.bot.outbox.depth)
+    
+    async def _resolve_participants(self, duel_ids, duels: dict | None = None):
+        """Warm the user resolver with the participants of several duels, one batch per guild"""
         try:
-            current_time = datetime.utcnow()
-            upcoming_duels = self.db.get_upcoming_duels()
-            
-            for duel in upcoming_duels:
-                duel_time = datetime.fromisoformat(duel['scheduled_time'])
-                time_until_duel = duel_time - current_time
-                
-                # Send reminder 5 minutes before duel
-                if (timedelta(minutes=4, seconds=30) <= time_until_duel <= timedelta(minutes=5, seconds=30) 
-                    and duel['id'] not in self.reminder_sent):
-                    
-                    await self._send_duel_reminder(duel)
-                    self.reminder_sent.add(duel['id'])
-                
-                # Clean up old reminders
-                elif time_until_duel <= timedelta(0):
-                    if duel['id'] in self.reminder_sent:
-                        self.reminder_sent.remove(duel['id'])
-                    
-                    # Optionally mark duel as started/completed
-                    duel['status'] = 'in_progress'
-                    self.db.update_duel(duel['id'], duel)
+            if duels is None:
+                duels = self.db.get_all_duels()
+            per_guild = {}
+            for duel_id in duel_ids:
+                duel = duels.get(duel_id)
+                if duel:
+                    per_guild.setdefault(duel.get('guild_id'), []).extend((duel['player1_id'], duel['player2_id']))
+            
+            for guild_id, user_ids in per_guild.items():
+                await self.bot.resolver.resolve_many(user_ids, guild_id)
         
         except Exception as e:
-            print(f"❌ Scheduler error: {e}")
+            print(f"❌ Error resolving duel participants: {e}")
     
-    async def _send_duel_reminder(self, duel: dict):
-        """Send luxury reminder message to duel participants"""
+    async def _dispatch(self, keys: list, quiet: set = frozenset()):
+        """Run the handlers for a batch of events and record that they were handled
+        
+        The batch reads the player file once, queues all reminder and start
+        DMs together on the outbound queue (so a player with several duels in
+        the same slot gets one combined DM), then commits every duel state
+        change and every event marker in one write per file. Delivery is not
+        awaited: latency is recorded as each event's DMs complete, and events
+        nobody received are marked failed in one more write once the whole
+        batch is done, so a large batch never holds up the next tick.
+        Start events in `quiet` update the duel status without notifying.
+        """
+        by_kind = {'reminder': [], 'start': [], 'cleanup': []}
+        now = time.time()
+        for key in keys:
+            event = self._events.get(key)
+            if event:
+                by_kind[event['kind']].append(key)
+                metrics.record('scheduler.lag_seconds', now - event['due'])
+        
         try:
-            # Get players
-            player1 = self.bot.get_user(duel['player1_id'])
-            player2 = self.bot.get_user(duel['player2_id'])
+            duels = self.db.get_all_duels()
+            duel_updates = {}
+            deliveries = {}  # event key -> [(user, payload, priority)]
+            notify = [key for key in by_kind['start'] if self._events[key].get('notify') and key not in quiet]
             
-            if not player1 or not player2:
-                return
+            # Normally a no-op, the prefetch has already filled the cache
+            await self._resolve_participants(
+                {self._events[key]['duel_id'] for key in by_kind['reminder'] + notify}, duels
+            )
+            # A duel may have been completed or cancelled during the await
+            duels = self.db.get_all_duels()
             
-            # Get player stats for reminder
-            p1_data = self.db.get_player(player1.id)
-            p2_data = self.db.get_player(player2.id)
+            if by_kind['reminder']:
+                players = self.db.get_all_players()
+                for key in by_kind['reminder']:
+                    event = self._events[key]
+                    duel = duels.get(event['duel_id'])
+                    if not duel or duel.get('status') != 'scheduled':
+                        continue
+                    messages = self._build_duel_reminder(duel, players, event.get('lead', 300))
+                    if messages:
+                        deliveries[key] = [(user, payload, PRIORITY_REMINDER) for user, payload in messages]
+                        duel_updates[duel['id']] = {'reminder_sent': True}
             
-            # Create luxury reminder embed
-            reminder_embed = self.embed_builder.duel_reminder_embed(
-                "⚡ FINAL WARNING - DUEL STARTING SOON!",
-                "🔥 **Your epic battle begins in 5 minutes!** 🔥"
-            )
+            # Duels whose start time has passed are now in progress
+            for key in by_kind['start']:
+                duel = duels.get(self._events[key]['duel_id'])
+                if duel and duel.get('status') == 'scheduled':
+                    duel_updates.setdefault(duel['id'], {})['status'] = 'in_progress'
+                    messages = self._build_start_notification(duel) if key in notify else []
+                    if messages:
+                        deliveries[key] = [(user, payload, PRIORITY_START_NOW) for user, payload in messages]
             
-            reminder_embed.add_field(
-                name="⚔️ Battle Details",
-                value=f"**{player1.display_name}** 🆚 **{player2.display_name}**\n"
-                      f"**Starts:** <t:{duel['timestamp']}:t>\n"
-                      f"**In:** <t:{duel['timestamp']}:R>\n\n"
-                      f"🎯 **This is it - the moment of truth!**",
-                inline=False
-            )
+            # Every DM is submitted before any is sent, so they still coalesce per recipient
+            failed = {}
+            batch = []
+            for key, messages in deliveries.items():
+                futures = [self.bot.outbox.submit(user, payload, priority) for user, payload, priority in messages]
+                done = asyncio.gather(*futures)
+                done.add_done_callback(
+                    lambda done, key=key, due=self._events[key]['due']: self._delivered(key, due, done, failed)
+                )
+                batch.append(done)
+            if batch:
+                asyncio.gather(*batch, return_exceptions=True).add_done_callback(
+                    lambda _: self._mark(failed)
+                )
             
-            reminder_embed.add_field(
-                name="🎮 Connection Info",
-                value=f"**Server IP:** {self.bot.server_ip}\n"
-                      f"**Port:** {self.bot.server_port}\n"
-                      f"**Full Address:** {self.bot.server_ip}:{self.bot.server_port}\n\n"
-                      f"🚨 **CONNECT NOW!**",
-                inline=True
-            )
+            if duel_updates:
+                # Only duels still scheduled on disk move on; a concurrent /result wins
+                self.db.update_duels(duel_updates, require_status='scheduled')
+            # Events that should have sent DMs but had none (participants could not be resolved)
+            undelivered = {key for key in by_kind['reminder'] + notify if key not in deliveries}
+            statuses = {
+                key: 'failed' if key in undelivered else 'skipped' if key in quiet else 'sent'
+                for key in by_kind['reminder'] + by_kind['start']
+            }
+            self._mark(statuses, forget={self._events[key]['duel_id'] for key in by_kind['cleanup']})
+        
+        except Exception as e:
+            print(f"❌ Scheduler error: {e}")
+    
+    def _delivered(self, key: str, due: float, done: asyncio.Future, failed: dict):
+        """Record an event's latency once its DMs are handled, noting it in `failed` if nobody got one"""
+        # Due time to delivery of every DM the event triggered
+        metrics.record('scheduler.send_seconds', time.time() - due)
+        event = self._events.get(key)
+        if not event or event['due'] != due:
+            return  # rescheduled or finished in the meantime
+        if done.cancelled() or done.exception() or 'sent' not in done.result():
+            failed[key] = 'failed'
+    
+    async def catch_up(self, missed: list):
+        """Replay events missed while offline in bounded batches according to the catch-up policy
+        
+        Under the late policy only the nearest missed reminder tier of each
+        duel is sent (a "1 hour to go" reminder is false five minutes before
+        the start); earlier tiers are skipped. Every reminder that is not
+        replayed is marked in a single write before the replay starts.
+        """
+        print(f"🔁 Replaying {len(missed)} missed event(s) (policy: {CATCH_UP_POLICY})")
+        summarized = {}  # duel_id -> None, one digest entry per duel however many tiers it missed
+        now = time.time()
+        
+        # `missed` is sorted by due time, so the last reminder seen per duel is the nearest tier
+        nearest = {}
+        for key in missed:
+            event = self._events.get(key)
+            if event and event['status'] == 'pending' and event['kind'] == 'reminder':
+                nearest[event['duel_id']] = key
+        
+        replay, quiet, markers = [], set(), {}
+        for key in missed:
+            event = self._events.get(key)
+            if not event or event['status'] != 'pending':
+                continue
             
-            reminder_embed.add_field(
-                name="📋 Pre-Battle Checklist",
-                value="✅ Connect to server\n"
-                      "✅ Check your internet connection\n"
-                      "✅ Close other applications\n"
-                      "✅ Prepare for victory!\n"
-                      "✅ May the best fighter win!",
-                inline=True
-            )
+            if event['kind'] == 'start':
+                # The duel still moves to in progress; only a fresh start is worth a DM
+                replay.append(key)
+                if CATCH_UP_POLICY == 'skip' or event['due'] + START_NOTIFY_GRACE <= now:
+                    quiet.add(key)
+            elif event['kind'] != 'reminder':
+                replay.append(key)
+            elif CATCH_UP_POLICY == 'summarize':
+                # Duels that have already started are no longer worth a reminder
+                if event['due'] + event.get('lead', 300) > now:
+                    summarized[event['duel_id']] = None
+                markers[key] = 'sent'
+            elif (CATCH_UP_POLICY == 'late' and nearest[event['duel_id']] == key
+                    and event['due'] + event.get('lead', 300) > now):
+                replay.append(key)
+            else:
+                markers[key] = 'skipped'
+        
+        self._mark(markers)
+        for i in range(0, len(replay), CATCH_UP_BATCH):
+            await self._dispatch(replay[i:i + CATCH_UP_BATCH], quiet)
+            if i + CATCH_UP_BATCH < len(replay):
+                await asyncio.sleep(CATCH_UP_PAUSE)
+        
+        if summarized:
+            await self._send_missed_summary(list(summarized))
+    
+    async def _send_missed_summary(self, duel_ids: list):
+        """Send each player a single digest of the reminders missed while offline"""
+        all_duels = self.db.get_all_duels()
+        per_player = {}
+        for duel_id in duel_ids:
+            duel = all_duels.get(duel_id)
+            if not duel or duel.get('status') != 'scheduled':
+                continue
+            for player_id in (duel['player1_id'], duel['player2_id']):
+                per_player.setdefault(player_id, []).append(duel)
+        
+        await self._resolve_participants(duel_ids, all_duels)
+        deliveries = []
+        for player_id, duels in per_player.items():
+            user = self.bot.resolver.get(player_id)
+            if not user:
+                continue
             
-            # Add opponent stats for strategy
-            reminder_embed.add_field(
-                name="🎯 Know Your Enemy",
-                value=f"**Opponent Record:** {p2_data['wins'] if p2_data else 0}W-{p2_data['losses'] if p2_data else 0}L\n"
-                      f"**K/D Ratio:** {(p2_data['kills'] / max(1, p2_data['deaths']) if p2_data else 0):.2f}\n"
-                      f"**Threat Level:** {'🔥 HIGH' if (p2_data and p2_data['wins'] > 5) else '⚡ MODERATE'}\n"
-                      f"**Strategy:** Fight smart, stay focused!",
-                inline=False
+            embed = self.embed_builder.duel_reminder_embed(
+                "📬 Duel Reminders You Missed",
+                "The bot was briefly offline. Here are the duels you were due a reminder for:"
             )
+            for duel in duels[:10]:
+                embed.add_field(
+                    name=f"⚔️ {duel['player1_name']} 🆚 {duel['player2_name']}",
+                    value=f"**Starts:** <t:{duel['timestamp']}:F>\n"
+                          f"**When:** <t:{duel['timestamp']}:R>",
+                    inline=False
+                )
+            deliveries.append((user, {'embed': embed}))
+        
+        await self.bot.outbox.send_many(deliveries, PRIORITY_REMINDER)
+    
+    async def _send_duel_reminder(self, duel: dict, lead: int = 300) -> dict:
+        """Send luxury reminder message to duel participants"""
+        await self._resolve_participants([duel['id']], {duel['id']: duel})
+        outcomes = await self.bot.outbox.send_many(self._build_duel_reminder(duel, lead=lead), PRIORITY_REMINDER)
+        if outcomes:
+            self.db.update_duels({duel['id']: {'reminder_sent': True}})
+        return outcomes
+    
+    def _build_duel_reminder(self, duel: dict, players: dict | None = None, lead: int = 300) -> list:
+        """Build the personalised reminder DMs for both duel participants
+        
+        `players` is an already loaded player table, to avoid re-reading the
+        file for every duel in a batch.
+        """
+        try:
+            # Get players
+            player1 = self.bot.resolver.get(duel['player1_id'])
+            player2 = self.bot.resolver.get(duel['player2_id'])
             
-            # Add motivational quotes
-            motivational_quotes = [
-                "*\"I fear not the man who has practiced 10,000 kicks once, but I fear the man who has practiced one kick 10,000 times.\"* - Bruce Lee",
-                "*\"Victory is reserved for those who are willing to pay its price.\"* - Sun Tzu", 
-                "*\"The way to get started is to quit talking and begin doing.\"* - Walt Disney",
-                "*\"Champions train, losers complain.\"* - Unknown",
-                "*\"It's not whether you get knocked down, it's whether you get up.\"* - Vince Lombardi"
-            ]
-            
-            import random
-            quote = random.choice(motivational_quotes)
-            
-            reminder_embed.add_field(
-                name="💪 Battle Inspiration",
-                value=quote,
-                inline=False
-            )
+            if not player1 or not player2:
+                return []
             
-            # Create personalized messages for each player
+            # Get player stats for reminder
+            if players is None:
+                players = self.db.get_all_players()
+            p1_data = players.get(str(player1.id))
+            p2_data = players.get(str(player2.id))
             
-            # Message for Player 1
-            p1_embed = reminder_embed.copy()
-            p1_embed.add_field(
-                name=f"🥊 Your Stats vs {player2.display_name}",
-                value=f"**Your Record:** {p1_data['wins'] if p1_data else 0}W-{p1_data['losses'] if p1_data else 0}L\n"
-                      f"**Your K/D:** {(p1_data['kills'] / max(1, p1_data['deaths']) if p1_data else 0):.2f}\n"
-                      f"**Confidence Level:** {'🔥 READY TO DOMINATE!' if (p1_data and p1_data['wins'] >= p2_data['wins']) else '⚡ HUNGRY FOR VICTORY!'}",
-                inline=False
+            # Personalised reminders built from the cached reminder template
+            p1_embed = self.embed_builder.personal_reminder_embed(
+                duel, player1, player2, p1_data, p2_data, self.bot.server_ip, self.bot.server_port, lead
             )
-            
-            # Message for Player 2
-            p2_embed = reminder_embed.copy()
-            p2_embed.add_field(
-                name=f"🥊 Your Stats vs {player1.display_name}",
-                value=f"**Your Record:** {p2_data['wins'] if p2_data else 0}W-{p2_data['losses'] if p2_data else 0}L\n"
-                      f"**Your K/D:** {(p2_data['kills'] / max(1, p2_data['deaths']) if p2_data else 0):.2f}\n"
-                      f"**Confidence Level:** {'🔥 READY TO DOMINATE!' if (p2_data and p2_data['wins'] >= p1_data['wins']) else '⚡ HUNGRY FOR VICTORY!'}",
-                inline=False
+            p2_embed = self.embed_builder.personal_reminder_embed(
+                duel, player2, player1, p2_data, p1_data, self.bot.server_ip, self.bot.server_port, lead
             )
             
-            # Send reminders
-            try:
-                await player1.send(embed=p1_embed)
-                print(f"📨 Reminder sent to {player1.display_name}")
-            except discord.Forbidden:
-                print(f"❌ Cannot send DM to {player1.display_name}")
-            
-            try:
-                await player2.send(embed=p2_embed)
-                print(f"📨 Reminder sent to {player2.display_name}")
-            except discord.Forbidden:
-                print(f"❌ Cannot send DM to {player2.display_name}")
-            
-            # Mark reminder as sent in database
-            duel['reminder_sent'] = True
-            self.db.update_duel(duel['id'], duel)
-            
-            print(f"⏰ Duel reminder sent: {player1.display_name} vs {player2.display_name}")
+            print(f"⏰ Duel reminder queued: {player1.display_name} vs {player2.display_name}")
+            return [(player1, {'embed': p1_embed}), (player2, {'embed': p2_embed})]
         
         except Exception as e:
             print(f"❌ Error sending duel reminder: {e}")
+            return []
     
-    async def send_immediate_duel_notification(self, duel: dict):
+    async def send_immediate_duel_notification(self, duel: dict) -> dict:
         """Send immediate notification when duel starts"""
+        await self._resolve_participants([duel['id']], {duel['id']: duel})
+        return await self.bot.outbox.send_many(self._build_start_notification(duel), PRIORITY_START_NOW)
+    
+    def _build_start_notification(self, duel: dict) -> list:
+        """Build the "duel starting now" DMs for both duel participants"""
         try:
-            player1 = self.bot.get_user(duel['player1_id'])
-            player2 = self.bot.get_user(duel['player2_id'])
+            player1 = self.bot.resolver.get(duel['player1_id'])
+            player2 = self.bot.resolver.get(duel['player2_id'])
             
             if not player1 or not player2:
-                return
+                return []
             
             # Create "duel starting now" embed
             now_embed = self.embed_builder.duel_reminder_embed(
                 "🚨 DUEL STARTING NOW!",
-                "⚔️ **The battle begins! Connect to the server immediately!** ⚔️"
+                "⚔️ **The battle begins! Connect to the server immediately!** ⚔️",
+                "Starting Now"
             )
             
             now_embed.add_field(
@@ -184,36 +580,8 @@ class DuelScheduler:
                 inline=False
             )
             
-            # Send to both players
-            try:
-                await player1.send(embed=now_embed)
-                await player2.send(embed=now_embed)
-            except discord.Forbidden:
-                pass
-            
-        except Exception as e:
-            print(f"❌ Error sending immediate duel notification: {e}")
-    
-    def cleanup_old_reminders(self):
-        """Clean up reminder tracking for old duels"""
-        try:
-            current_time = datetime.utcnow()
-            completed_duels = []
-            
-            # Find duels that are over
-            for duel_id in list(self.reminder_sent):
-                duel = self.db.get_duel(duel_id)
-                if duel:
-                    duel_time = datetime.fromisoformat(duel['scheduled_time'])
-                    if duel_time < current_time - timedelta(hours=1):  # 1 hour after duel
-                        completed_duels.append(duel_id)
-            
-            # Remove from tracking
-            for duel_id in completed_duels:
-                self.reminder_sent.discard(duel_id)
-            
-            if completed_duels:
-                print(f"🧹 Cleaned up {len(completed_duels)} old duel reminders")
+            return [(player1, {'embed': now_embed}), (player2, {'embed': now_embed})]
         
         except Exception as e:
-            print(f"❌ Error cleaning up reminders: {e}")
+            print(f"❌ Error sending immediate duel notification: {e}")
+            return []
@@ -0,0 +1,115 @@
+import time
+from bisect import bisect_left
+from datetime import datetime
+from bot.utils.database import Database
+
+# Discord shows at most 25 autocomplete choices
+MAX_CHOICES = 25
+
+# Seconds between checks of the data files; within this window keystrokes
+# are answered from memory without even a stat call
+REFRESH_INTERVAL = 2.0
+
+# name -> (data version, last checked, SearchIndex)
+_indexes = {}
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class SearchIndex:
+    """Prefix and trigram index over short strings for autocomplete
+    
+    Entries are (value, label, keys). A query first matches key prefixes via
+    bisection over the sorted keys, then fills up with substring matches
+    found through the trigram sets.
+    """
+    
+    def __init__(self, entries: list):
+        self.entries = entries
+        self._prefix = sorted((key.lower(), i) for i, (_, _, keys) in enumerate(entries) for key in keys)
+        self._grams = {}
+        for i, (_, _, keys) in enumerate(entries):
+            for key in keys:
+                for gram in _trigrams(key.lower()):
+                    self._grams.setdefault(gram, set()).add(i)
+    
+    def search(self, query: str, limit: int = MAX_CHOICES) -> list:
+        """Return up to `limit` (value, label) pairs matching `query`"""
+        query = query.strip().lower()
+        if not query:
+            return [(value, label) for value, label, _ in self.entries[:limit]]
+        
+        found = []
+        i = bisect_left(self._prefix, (query,))
+        while i < len(self._prefix) and self._prefix[i][0].startswith(query) and len(found) < limit:
+            if self._prefix[i][1] not in found:
+                found.append(self._prefix[i][1])
+            i += 1
+        
+        if len(found) < limit and len(query) >= 3:
+            candidates = set.intersection(*(self._grams.get(gram, set()) for gram in _trigrams(query)))
+            for index in sorted(candidates - set(found)):
+                if any(query in key.lower() for key in self.entries[index][2]):
+                    found.append(index)
+                    if len(found) >= limit:
+                        break
+        
+        return [(self.entries[index][0], self.entries[index][1]) for index in found]
+
+def _cached(name: str, version_fn, build_fn) -> SearchIndex:
+    """Return a named index, rebuilding it only when its data file changed"""
+    now = time.monotonic()
+    cached = _indexes.get(name)
+    if cached and now - cached[1] < REFRESH_INTERVAL:
+        return cached[2]
+    
+    version = version_fn()
+    if cached and cached[0] == version:
+        _indexes[name] = (version, now, cached[2])
+        return cached[2]
+    
+    index = build_fn()
+    _indexes[name] = (version, now, index)
+    return index
+
+def player_index(db: Database) -> SearchIndex:
+    """Registered players by display name, username or id; values are user ids"""
+    def build():
+        players = sorted(db.get_all_players().values(), key=lambda p: p.get('wins', 0), reverse=True)
+        return SearchIndex([
+            (
+                str(player['user_id']),
+                f"{player.get('display_name', 'Unknown')} ({player.get('wins', 0)}W-{player.get('losses', 0)}L)",
+                [player.get('display_name', ''), player.get('username', ''), str(player['user_id'])]
+            )
+            for player in players
+        ])
+    return _cached('players', db.players_version, build)
+
+def duel_index(db: Database, statuses: tuple = ('scheduled',)) -> SearchIndex:
+    """Duels with one of `statuses` by id or either player's name; values are duel ids"""
+    def build():
+        duels = sorted(
+            (d for d in db.get_all_duels().values() if d.get('status') in statuses),
+            key=lambda d: d.get('timestamp', 0)
+        )
+        return SearchIndex([
+            (
+                duel['id'],
+                f"{duel['player1_name']} vs {duel['player2_name']} • "
+                f"{datetime.fromtimestamp(duel['timestamp']).strftime('%b %d %H:%M')} • {duel['id'][:8]}",
+                [duel['id'], duel['player1_name'], duel['player2_name']]
+            )
+            for duel in duels
+        ])
+    return _cached(f"duels:{','.join(statuses)}", db.duels_version, build)
+
+def bracket_index(db: Database) -> SearchIndex:
+    """Brackets by id or name, newest first; values are bracket ids"""
+    def build():
+        brackets = sorted(db.get_all_brackets().values(), key=lambda b: b['created_at'], reverse=True)
+        return SearchIndex([
+            (bracket['id'], f"{bracket['name']} • {bracket['id']}", [bracket['id'], bracket['name']])
+            for bracket in brackets
+        ])
+    return _cached('brackets', db.brackets_version, build)
@@ -0,0 +1,86 @@
+from discord import app_commands
+from bot.utils.ratelimit import TokenBucket
+
+# Per-user limits for commands that parse and sort the whole data set:
+# command name -> (burst, seconds to refill the burst). Commands not
+# listed here are not throttled.
+COMMAND_LIMITS = {
+    'leaderboard': (3, 15),
+    'fighters': (3, 15),
+    'tournament_info': (2, 15),
+    'stats': (4, 15),
+    'compare': (3, 15),
+    'kill': (3, 15),
+    'duels': (3, 15),
+    'bracket': (3, 15)
+}
+
+# Shared budget of a whole guild across all throttled commands, so a group
+# of members cannot together starve other servers
+GUILD_LIMIT = (20, 10)
+
+# Idle buckets refill to full and carry no state; drop them past this count
+MAX_BUCKETS = 10000
+
+class CommandThrottled(app_commands.CheckFailure):
+    """Raised by the cog checks when a user or guild is over its command budget"""
+    
+    def __init__(self, command: str, scope: str, retry_after: float):
+        self.command = command
+        self.scope = scope
+        self.retry_after = retry_after
+        super().__init__(f"/{command} is on cooldown for this {scope}, retry in {retry_after:.1f}s")
+
+class CommandThrottle:
+    """In-memory token buckets per (user, command) and per guild with hit counters"""
+    
+    def __init__(self, limits: dict | None = None, guild_limit: tuple = GUILD_LIMIT):
+        self.limits = dict(COMMAND_LIMITS if limits is None else limits)
+        self.guild_limit = guild_limit
+        self._buckets = {}
+        self.counters = {}  # command -> {'hits', 'throttled'}
+    
+    def _bucket(self, key: tuple, limit: tuple) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._prune()
+            burst, per = limit
+            bucket = self._buckets[key] = TokenBucket(burst / per, burst)
+        return bucket
+    
+    def _prune(self):
+        for key, bucket in list(self._buckets.items()):
+            if bucket.retry_after(bucket.capacity) == 0:
+                del self._buckets[key]
+    
+    def check(self, command: str, user_id: int, guild_id: int | None) -> bool:
+        """Take a token for the user and the guild or raise CommandThrottled"""
+        limit = self.limits.get(command)
+        if limit is None:
+            return True
+        counters = self.counters.setdefault(command, {'hits': 0, 'throttled': 0})
+        counters['hits'] += 1
+        
+        user_bucket = self._bucket(('user', user_id, command), limit)
+        if not user_bucket.try_acquire():
+            counters['throttled'] += 1
+            raise CommandThrottled(command, 'user', user_bucket.retry_after())
+        
+        if guild_id is not None:
+            guild_bucket = self._bucket(('guild', guild_id), self.guild_limit)
+            if not guild_bucket.try_acquire():
+                # Give the user their token back; the server as a whole is busy
+                user_bucket.tokens = min(user_bucket.capacity, user_bucket.tokens + 1)
+                counters['throttled'] += 1
+                raise CommandThrottled(command, 'server', guild_bucket.retry_after())
+        return True
+    
+    def check_interaction(self, interaction) -> bool:
+        """Cog `interaction_check` entry point"""
+        command = interaction.command.qualified_name if interaction.command else None
+        return self.check(command, interaction.user.id, interaction.guild_id)
+    
+    def stats(self) -> dict:
+        """Hit and throttle counters per command"""
+        return {command: dict(counters) for command, counters in self.counters.items()}
@@ -1,64 +1,23 @@
-from flask import Flask, jsonify
-from threading import Thread
-import os
+"""Compatibility entry point; the health routes now live in web.app
 
-app = Flask(__name__)
-
-@app.route('/')
-def index():
-    """Health check endpoint"""
-    return jsonify({
-        'status': 'online',
-        'service': 'Duel Lords Tournament Bot',
-        'message': 'Bot is running and ready for epic battles!',
-        'features': [
-            'Player registration and management',
-            'Duel scheduling with reminders',
-            'Real-time statistics tracking',
-            'Tournament leaderboards',
-            'Multi-language support',
-            'Web dashboard integration'
-        ]
-    })
-
-@app.route('/health')
-def health():
-    """Detailed health check"""
-    return jsonify({
-        'status': 'healthy',
-        'bot_status': 'online',
-        'server': {
-            'ip': '18.228.228.44',
-            'port': '3827',
-            'status': 'active'
-        },
-        'features_status': {
-            'discord_bot': 'running',
-            'web_dashboard': 'active',
-            'database': 'connected',
-            'scheduler': 'active'
-        }
-    })
-
-@app.route('/ping')
-def ping():
-    """Simple ping endpoint"""
-    return jsonify({'ping': 'pong', 'status': 'ok'})
+/ping and /health are served by the consolidated web server alongside the
+dashboard and API (the old service overview at / moved to /status).
+"""
+from web.server import create_server
 
 def run():
-    """Run the keep-alive server"""
-    port = int(os.environ.get('PORT', 8000))
-    app.run(host='0.0.0.0', port=port, debug=False)
+    """Run the consolidated web server"""
+    create_server().serve_forever()
 
 def keep_alive():
-    """Start the keep-alive server in a separate thread"""
+    """Start the consolidated web server in a separate thread"""
     try:
-        print("🚀 Starting keep-alive server...")
-        server_thread = Thread(target=run, daemon=True)
-        server_thread.start()
-        print(f"✅ Keep-alive server started on port 8000")
+        print("🚀 Starting web server...")
+        server = create_server()
+        server.start()
+        return server
     except Exception as e:
-        print(f"❌ Failed to start keep-alive server: {e}")
+        print(f"❌ Failed to start web server: {e}")
 
 if __name__ == '__main__':
     run()
@@ -1,31 +1,40 @@
 import os
 import asyncio
+import signal
 import threading
 from bot.bot import DuelLordsBot
-from keep_alive import keep_alive
+from web.server import create_server
 
-def start_web_server():
-    """Start the web dashboard server"""
-    import time
-    time.sleep(3)  # Wait a bit before starting web server
-    try:
-        from web.app import app
-        # Use PORT from environment (Render assigns this)
-        port = int(os.environ.get('PORT', 5000))
-        app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
-    except Exception as e:
-        print(f"Web server error: {e}")
+# Set by SIGTERM (Render sends it on deploys) or Ctrl+C
+shutdown = threading.Event()
+
+def request_shutdown(*_):
+    shutdown.set()
+
+async def run_bot(bot: DuelLordsBot, token: str):
+    """Run the bot until it disconnects or a shutdown is requested"""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, lambda: (shutdown.set(), asyncio.ensure_future(bot.close())))
+        except NotImplementedError:  # Windows
+            pass
+    async with bot:
+        await bot.start(token)
 
 def main():
     """Main entry point for the Duel Lords bot"""
-    # Start the keep-alive server in a separate thread
-    keep_alive_thread = threading.Thread(target=keep_alive, daemon=True)
-    keep_alive_thread.start()
-    
-    # Start web dashboard in separate thread
-    web_thread = threading.Thread(target=start_web_server, daemon=True)
-    web_thread.start()
-    
+    # One server for the dashboard, API and health routes (PORT is set by Render)
+    web_server = create_server()
+    web_server.start()
+    signal.signal(signal.SIGTERM, request_shutdown)
+    try:
+        run_until_shutdown()
+    finally:
+        web_server.shutdown()
+
+def run_until_shutdown():
+    """Run the bot, then keep serving the web routes until shutdown"""
     # Get Discord token from environment variable
     discord_token = os.getenv("DISCORD_TOKEN")
     if not discord_token:
@@ -40,10 +49,14 @@ def main():
     max_retries = 3
     retry_count = 0
     
-    while retry_count < max_retries:
+    while retry_count < max_retries and not shutdown.is_set():
         try:
             print(f"🚀 Starting Duel Lords Bot... (Attempt {retry_count + 1})")
-            asyncio.run(bot.start(discord_token))
+            try:
+                asyncio.run(run_bot(bot, discord_token))
+            finally:
+                # Closing the loop restored the default handler
+                signal.signal(signal.SIGTERM, request_shutdown)
             break  # If successful, exit the loop
         except KeyboardInterrupt:
             print("\n⏹️ Bot stopped by user")
@@ -54,24 +67,25 @@ def main():
                 print(f"⏳ Bot rate limited by Discord (Attempt {retry_count}/{max_retries})")
                 if retry_count < max_retries:
                     print("💡 Waiting 60 seconds before retry...")
-                    import time
-                    time.sleep(60)
+                    shutdown.wait(60)
                 else:
                     print("💡 Max retries reached. Bot will stay alive with web server.")
             else:
                 print(f"❌ Error running bot: {e}")
                 if retry_count < max_retries:
                     print("🔄 Retrying in 30 seconds...")
-                    import time
-                    time.sleep(30)
+                    shutdown.wait(30)
                 break
     
+    if shutdown.is_set():
+        print("⏹️ Shutdown requested, stopping web server...")
+        return
+    
     # Keep the process alive for the web server
     print("✅ Web server is running. Application will stay alive.")
     try:
-        while True:
-            import time
-            time.sleep(60)
+        while not shutdown.wait(60):
+            pass
     except KeyboardInterrupt:
         print("\n⏹️ Application stopped by user")
 
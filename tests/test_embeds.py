@@ -0,0 +1,26 @@
+from bot.utils.brackets import Bracket
+from bot.utils.embeds import EMBED_TOTAL_LIMIT, EmbedBuilder
+
+def finished_bracket(fmt: str, size: int) -> Bracket:
+    seeds = list(range(1, size + 1))
+    bracket = Bracket.create("Grand Tournament", fmt, seeds, {seed: f"LongFighterName{seed:03d}" for seed in seeds}, 1)
+    while ready := bracket.ready_matches():
+        for index in ready:
+            bracket.record_result(index, bracket.matches[index]['players'][0])
+    return bracket
+
+def test_large_double_elimination_embed_stays_under_discord_limit():
+    view = finished_bracket('double', 128).render()
+    embed = EmbedBuilder().bracket_embed(view)
+    
+    assert len(embed) <= EMBED_TOTAL_LIMIT
+    names = [field.name for field in embed.fields]
+    assert names[-2:] == ["📺 More Rounds", "👑 Champion"]
+    assert f"/bracket/{view['id']}" in embed.fields[-2].value
+
+def test_small_bracket_embed_lists_every_round():
+    view = finished_bracket('single', 16).render()
+    embed = EmbedBuilder().bracket_embed(view)
+    
+    assert "📺 More Rounds" not in [field.name for field in embed.fields]
+    assert len(embed.fields) == len(view['rounds']) + 1
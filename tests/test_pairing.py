@@ -0,0 +1,33 @@
+from bot.utils.pairing import swiss_pairs
+
+def play_round(players: dict, played: set, had_bye: set):
+    """Pair a Swiss round, let the first player of each pair win and award the bye a win"""
+    pairs, bye = swiss_pairs(players, played, had_bye)
+    for winner, loser in pairs:
+        players[winner]['wins'] += 1
+        players[loser]['losses'] += 1
+        played.add(frozenset((winner, loser)))
+    players[bye]['wins'] += 1
+    had_bye.add(bye)
+    return pairs, bye
+
+def test_swiss_bye_rotates_to_players_without_one():
+    players = {pid: {'wins': 0, 'losses': 0, 'kills': 10 - pid, 'deaths': 1} for pid in range(1, 6)}
+    played, had_bye = set(), set()
+    
+    byes = [play_round(players, played, had_bye)[1] for _ in range(5)]
+    
+    assert sorted(byes) == [1, 2, 3, 4, 5]
+
+def test_swiss_bye_skips_lowest_ranked_player_who_already_had_one():
+    players = {pid: {'wins': 5 - pid, 'kills': 0, 'deaths': 0} for pid in range(1, 6)}
+    
+    pairs, bye = swiss_pairs(players, set(), {5})
+    
+    assert bye == 4
+    assert sorted(pid for pair in pairs for pid in pair) == [1, 2, 3, 5]
+
+def test_swiss_bye_falls_back_to_lowest_ranked_once_everyone_had_one():
+    players = {pid: {'wins': 5 - pid} for pid in range(1, 4)}
+    
+    assert swiss_pairs(players, set(), {1, 2, 3})[1] == 3
@@ -0,0 +1,69 @@
+import asyncio
+import time
+import pytest
+import bot.utils.scheduler as scheduler
+from bot.utils.messaging import OutboundQueue
+
+class FakeUser:
+    def __init__(self, user_id: int, inbox: list):
+        self.id = user_id
+        self.display_name = f"Fighter{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.inbox = inbox
+    
+    async def send(self, **payload):
+        self.inbox.append((self.id, [embed.title for embed in payload.get('embeds', [])]))
+
+class FakeResolver:
+    def __init__(self, inbox: list):
+        self.inbox = inbox
+    
+    def get(self, user_id):
+        return FakeUser(user_id, self.inbox)
+    
+    async def resolve_many(self, user_ids, guild_id):
+        return {}
+
+class FakeBot:
+    server_ip = "127.0.0.1"
+    server_port = "43210"
+    
+    def __init__(self):
+        self.inbox = []
+        self.resolver = FakeResolver(self.inbox)
+        self.outbox = OutboundQueue(rate=1000, burst=1000)
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+def test_late_catch_up_replays_only_the_nearest_missed_tier(monkeypatch):
+    """Back up inside the last tier's window: only the 5 minute reminder is sent"""
+    monkeypatch.setattr(scheduler, 'CATCH_UP_POLICY', 'late')
+    
+    async def run():
+        bot = FakeBot()
+        duel_scheduler = scheduler.DuelScheduler(bot)
+        now = time.time()
+        start = now + 100
+        duel = {'id': 'd1', 'timestamp': start, 'status': 'scheduled', 'guild_id': 1,
+                'player1_id': 1, 'player2_id': 2, 'player1_name': "Fighter1", 'player2_name': "Fighter2"}
+        duel_scheduler.db.add_duel(duel['id'], duel)
+        duel_scheduler.db.save_reminder_events({
+            f"d1:reminder:{lead}": {'duel_id': 'd1', 'kind': 'reminder', 'due': start - lead,
+                                    'lead': lead, 'status': 'pending'}
+            for lead in (86400, 3600, 300)
+        })
+        
+        missed = duel_scheduler.load_schedule()
+        await duel_scheduler.catch_up(missed)
+        await asyncio.sleep(0.1)
+        return bot.inbox, duel_scheduler.db.get_reminder_events()
+    
+    inbox, events = asyncio.run(run())
+    
+    assert sorted(inbox) == [(1, ["⚡ FINAL WARNING - DUEL STARTING SOON!"]),
+                             (2, ["⚡ FINAL WARNING - DUEL STARTING SOON!"])]
+    assert events['d1:reminder:300']['status'] == 'sent'
+    assert events['d1:reminder:3600']['status'] == 'skipped'
+    assert events['d1:reminder:86400']['status'] == 'skipped'
@@ -1,15 +1,89 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
+from functools import wraps
+from urllib.parse import urlencode
+from werkzeug.http import http_date, parse_date
+import hashlib
 import json
 import os
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
+from bot.utils.changes import changes
 from bot.utils.database import Database
+from bot.utils.listing import (DUEL_DEFAULT_FIELDS, DUEL_FIELDS, PLAYER_FIELDS, QueryError, decode_cursor,
+                               duel_listing, parse_fields, parse_page, parse_time, player_listing, project)
+from bot.utils.metrics import metrics
+from bot.utils.ranking import get_ranked
+from web.compression import init_compression
+from web.server import WEB_THREADS
 
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'duel-lords-secret-key')
 
+# Registered first so its after_request hook runs last, on the final body
+init_compression(app)
+
 # Initialize database
 db = Database()
 
+# Live dashboard stream
+STREAM_HEARTBEAT = 15         # seconds between keep-alive comments (and file checks)
+STREAM_LEADERBOARD_SIZE = 20  # rows pushed to the leaderboard page
+# Each open stream holds a server worker thread, so streams get at most a
+# quarter of WEB_THREADS by default and never the threads kept for requests
+STREAM_RESERVED_THREADS = 4
+STREAM_MAX_CLIENTS = max(1, min(int(os.getenv('WEB_MAX_STREAMS', WEB_THREADS // 4)),
+                                WEB_THREADS - STREAM_RESERVED_THREADS))
+# Streams end after this many seconds; browsers reconnect on their own, so
+# an idle dashboard cannot hold its slot forever
+STREAM_MAX_SECONDS = 300
+
+_stream_lock = threading.Lock()
+_stream_slots = threading.BoundedSemaphore(STREAM_MAX_CLIENTS)
+_stream_cache = {'versions': None, 'events': {}}
+
+# Data files behind each API source, by the Database version method name
+def _data_version(sources: tuple) -> tuple:
+    return tuple(getattr(db, f"{source}_version")() for source in sources)
+
+def conditional(*sources):
+    """Answer If-None-Match / If-Modified-Since with 304 before the view runs
+    
+    The ETag is derived from the version (mtime and size) of the data files
+    named in `sources` plus the request's path and query, so it changes
+    exactly when the payload could. Clients must revalidate on every use.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = _data_version(sources)
+            etag = hashlib.sha1(repr((versions, request.full_path)).encode()).hexdigest()[:20]
+            newest = max(version[0] for version in versions) / 1e9
+            modified = datetime.fromtimestamp(int(newest), timezone.utc)
+            
+            if request.if_none_match:
+                # Weak comparison: compressed responses carry W/ tags
+                fresh = request.if_none_match.contains_weak(etag)
+            else:
+                since = parse_date(request.headers.get('If-Modified-Since'))
+                fresh = since is not None and modified <= since
+            
+            if fresh:
+                response = app.response_class(status=304)
+            else:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # Last-Modified has one second resolution; only send it once a
+            # write in the same second can no longer be hidden behind it
+            if time.time() - newest >= 1:
+                response.headers['Last-Modified'] = http_date(modified)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -37,69 +111,186 @@ def leaderboard():
                          leaderboard=top_players,
                          recent_duels=recent_duels)
 
+@app.route('/bracket/<bracket_id>')
+def bracket_page(bracket_id):
+    """Bracket page, rendered from the view stored with the bracket"""
+    bracket = db.get_bracket(bracket_id)
+    if not bracket:
+        return render_template('index.html'), 404
+    return render_template('bracket.html', bracket=bracket['view'])
+
 @app.route('/api/stats')
+@conditional('players', 'duels')
 def api_stats():
     """API endpoint for tournament statistics"""
     stats = db.get_tournament_stats()
     return jsonify(stats)
 
+def _page_response(rows: list, total: int, next_cursor: str | None):
+    """List body with paging metadata in headers, keeping the plain list shape of the API"""
+    response = jsonify(rows)
+    response.headers['X-Total-Count'] = str(total)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+        args = request.args.to_dict()
+        args.pop('offset', None)
+        args['cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.path}?{urlencode(args)}>; rel="next"'
+    return response
+
+@app.errorhandler(QueryError)
+def bad_query(e):
+    """Reject invalid list parameters"""
+    return jsonify({'error': 'Bad request', 'message': str(e)}), 400
+
 @app.route('/api/leaderboard')
+@conditional('players')
 def api_leaderboard():
     """API endpoint for leaderboard data"""
     sort_by = request.args.get('sort', 'wins')
-    limit = int(request.args.get('limit', 10))
+    offset, limit = parse_page(request.args.get('offset'), request.args.get('limit', 10))
     
-    leaderboard = db.get_leaderboard(sort_by=sort_by, limit=limit)
-    return jsonify(leaderboard)
+    return jsonify([player for _, player in get_ranked(db, sort_by).page(offset, limit)])
 
 @app.route('/api/players')
+@conditional('players')
 def api_players():
-    """API endpoint for all players"""
-    players = db.get_all_players()
+    """API endpoint for players
     
-    # Convert to list format with calculated stats
-    player_list = []
-    for user_id, player in players.items():
-        total_matches = player.get('wins', 0) + player.get('losses', 0) + player.get('draws', 0)
-        win_rate = (player.get('wins', 0) / max(1, total_matches)) * 100
-        kd_ratio = player.get('kills', 0) / max(1, player.get('deaths', 1))
-        
-        player_data = {
-            'user_id': int(user_id),
-            'display_name': player.get('display_name', 'Unknown'),
-            'wins': player.get('wins', 0),
-            'losses': player.get('losses', 0),
-            'draws': player.get('draws', 0),
-            'kills': player.get('kills', 0),
-            'deaths': player.get('deaths', 0),
-            'total_matches': total_matches,
-            'win_rate': round(win_rate, 1),
-            'kd_ratio': round(kd_ratio, 2),
-            'registered_at': player.get('registered_at', '')
-        }
-        player_list.append(player_data)
+    Query: sort (leaderboard key), min_matches, fields, offset/limit or
+    cursor (from X-Next-Cursor). Pages hold at most MAX_PAGE_SIZE players.
+    """
+    fields = parse_fields(request.args.get('fields'), PLAYER_FIELDS, PLAYER_FIELDS)
+    offset, limit = parse_page(request.args.get('offset'), request.args.get('limit'))
+    cursor = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    try:
+        min_matches = int(request.args.get('min_matches', 0))
+    except ValueError:
+        raise QueryError("min_matches must be an integer")
     
-    return jsonify(player_list)
+    listing = player_listing(db, request.args.get('sort', 'wins'))
+    rows, total, next_cursor = listing.query(
+        cursor=cursor, offset=offset, limit=limit,
+        predicate=(lambda row: row['total_matches'] >= min_matches) if min_matches else None
+    )
+    return _page_response(project(rows, fields), total, next_cursor)
 
 @app.route('/api/duels')
+@conditional('duels')
 def api_duels():
-    """API endpoint for duels data"""
-    duels = db.get_all_duels()
+    """API endpoint for duels, ordered by scheduled time
+    
+    Query: status, player (user id), from/to (unix time or ISO date),
+    fields, offset/limit or cursor (from X-Next-Cursor).
+    """
+    fields = parse_fields(request.args.get('fields'), DUEL_FIELDS, DUEL_DEFAULT_FIELDS)
+    offset, limit = parse_page(request.args.get('offset'), request.args.get('limit'))
+    cursor = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    start, end = parse_time(request.args.get('from')), parse_time(request.args.get('to'))
     
-    # Convert to list format
-    duel_list = []
-    for duel_id, duel in duels.items():
-        duel_data = {
-            'id': duel_id,
-            'player1_name': duel.get('player1_name', 'Unknown'),
-            'player2_name': duel.get('player2_name', 'Unknown'),
-            'scheduled_time': duel.get('scheduled_time', ''),
-            'status': duel.get('status', 'unknown'),
-            'created_at': duel.get('created_at', '')
+    filters = {}
+    if request.args.get('status'):
+        filters['status'] = request.args['status']
+    if request.args.get('player'):
+        try:
+            filters['player'] = int(request.args['player'])
+        except ValueError:
+            raise QueryError("player must be a user id")
+    
+    rows, total, next_cursor = duel_listing(db).query(
+        filters=filters,
+        low=(start,) if start is not None else None,
+        high=(end, chr(0x10FFFF)) if end is not None else None,
+        cursor=cursor, offset=offset, limit=limit
+    )
+    defaults = {'player1_name': 'Unknown', 'player2_name': 'Unknown', 'scheduled_time': '',
+                'status': 'unknown', 'created_at': ''}
+    return _page_response(project(rows, fields, defaults), total, next_cursor)
+
+@app.route('/api/brackets')
+@conditional('brackets')
+def api_brackets():
+    """API endpoint listing brackets"""
+    brackets = db.get_all_brackets()
+    return jsonify([
+        {
+            'id': bracket_id,
+            'name': bracket['name'],
+            'format': bracket['view']['format'],
+            'champion': bracket['view']['champion'],
+            'created_at': bracket['created_at']
         }
-        duel_list.append(duel_data)
+        for bracket_id, bracket in brackets.items()
+    ])
+
+@app.route('/api/brackets/<bracket_id>')
+@conditional('brackets')
+def api_bracket(bracket_id):
+    """API endpoint for one bracket's stored view"""
+    bracket = db.get_bracket(bracket_id)
+    if not bracket:
+        return jsonify({'error': 'Bracket not found'}), 404
+    return jsonify(bracket['view'])
+
+def _stream_events() -> dict:
+    """Serialized stream events for the current data, computed once per change for all viewers"""
+    versions = _data_version(('players', 'duels'))
+    with _stream_lock:
+        if _stream_cache['versions'] != versions:
+            _stream_cache['events'] = {
+                'stats': json.dumps(db.get_tournament_stats()),
+                'leaderboard': json.dumps(db.get_leaderboard(sort_by='wins', limit=STREAM_LEADERBOARD_SIZE))
+            }
+            _stream_cache['versions'] = versions
+        return _stream_cache['events']
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-sent events with stats and leaderboard updates
+    
+    Each event is sent when its payload differs from what this client last
+    received, starting with a full snapshot on connect. The stream sleeps on
+    the in-process change feed and re-checks the data files every heartbeat,
+    which also catches writes from another process. Past STREAM_MAX_CLIENTS
+    open streams new viewers get a 503 and fall back to polling; each stream
+    is closed after STREAM_MAX_SECONDS and the browser reconnects.
+    """
+    if not _stream_slots.acquire(blocking=False):
+        return jsonify({'error': 'Too many live viewers, poll /api/stats instead'}), 503, {'Retry-After': '30'}
     
-    return jsonify(duel_list)
+    def generate():
+        sent = {}
+        seen = changes.version
+        yield "retry: 5000\n\n"
+        expires = time.monotonic() + STREAM_MAX_SECONDS
+        while not changes.closed and time.monotonic() < expires:
+            for name, data in _stream_events().items():
+                if sent.get(name) != data:
+                    sent[name] = data
+                    yield f"event: {name}\ndata: {data}\n\n"
+            version = changes.wait(seen, STREAM_HEARTBEAT)
+            if version == seen:
+                yield ": ping\n\n"
+            seen = version
+    
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.call_on_close(_stream_slots.release)
+    return response
+
+def stop_streams():
+    """End every open stream so shutdown does not wait on them"""
+    changes.close()
+
+@app.route('/api/metrics')
+def api_metrics():
+    """API endpoint for scheduler lag, tick duration, queue depth and send latency"""
+    return jsonify({
+        'uptime_seconds': round(time.time() - metrics.started_at),
+        'histograms': metrics.snapshot()
+    })
 
 @app.route('/api/health')
 def health_check():
@@ -111,6 +302,57 @@ def health_check():
         'version': '1.0.0'
     })
 
+# Uptime monitor routes, formerly served by keep_alive.py on a second port
+@app.route('/status')
+def service_status():
+    """Service overview"""
+    return jsonify({
+        'status': 'online',
+        'service': 'Duel Lords Tournament Bot',
+        'message': 'Bot is running and ready for epic battles!',
+        'features': [
+            'Player registration and management',
+            'Duel scheduling with reminders',
+            'Real-time statistics tracking',
+            'Tournament leaderboards',
+            'Multi-language support',
+            'Web dashboard integration'
+        ]
+    })
+
+@app.route('/health')
+def health():
+    """Detailed health check"""
+    return jsonify({
+        'status': 'healthy',
+        'bot_status': 'online',
+        'server': {
+            'ip': '18.228.228.44',
+            'port': '3827',
+            'status': 'active'
+        },
+        'features_status': {
+            'discord_bot': 'running',
+            'web_dashboard': 'active',
+            'database': 'connected',
+            'scheduler': 'active'
+        }
+    })
+
+@app.route('/ping')
+def ping():
+    """Simple ping endpoint"""
+    return jsonify({'ping': 'pong', 'status': 'ok'})
+
+@app.after_request
+def tag_api_response(response):
+    """Give API responses without a data version a content ETag so unchanged bodies still 304"""
+    if (request.path.startswith('/api/') and response.status_code == 200
+            and not response.is_streamed and not response.get_etag()[0]):
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
 @app.errorhandler(404)
 def page_not_found(e):
     """Handle 404 errors"""
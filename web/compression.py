@@ -0,0 +1,138 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from flask import Flask, request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip alone still covers every browser
+    brotli = None
+
+# Responses smaller than this are sent as is; the headers would eat the gain
+COMPRESS_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/css', 'text/plain',
+                      'application/javascript', 'text/javascript', 'image/svg+xml')
+
+# Dynamic responses favour speed, static assets are compressed once at the highest level
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Hashed static URLs never change content, so browsers may keep them for a year
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, honouring q=0"""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    if brotli and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if best else GZIP_LEVEL, mtime=0)
+
+def _compressible(mimetype: str | None) -> bool:
+    return bool(mimetype) and mimetype.split(';')[0].strip() in COMPRESSIBLE_TYPES
+
+class StaticAssets:
+    """Static files read, hashed and precompressed once at startup
+    
+    Each asset keeps its raw bytes, a short content hash used as the
+    `v` query parameter of its URL, and the gzip/brotli variants when they
+    are smaller than the original.
+    """
+    
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.assets = {}
+        for root, _, files in os.walk(folder):
+            for name in files:
+                path = os.path.join(root, name)
+                filename = os.path.relpath(path, folder).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = f.read()
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                variants = {None: data}
+                if _compressible(mimetype) and len(data) >= COMPRESS_MIN_SIZE:
+                    for encoding in ('br', 'gzip') if brotli else ('gzip',):
+                        compressed = compress(data, encoding, best=True)
+                        if len(compressed) < len(data):
+                            variants[encoding] = compressed
+                self.assets[filename] = {
+                    'hash': hashlib.sha256(data).hexdigest()[:12],
+                    'mimetype': mimetype,
+                    'variants': variants
+                }
+    
+    def version(self, filename: str) -> str | None:
+        asset = self.assets.get(filename)
+        return asset['hash'] if asset else None
+
+def init_compression(app: Flask):
+    """Serve precompressed, content-hashed static files and compress large dynamic responses"""
+    assets = StaticAssets(app.static_folder)
+    serve_file = app.view_functions['static']
+    
+    @app.url_defaults
+    def hashed_static_url(endpoint, values):
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            version = assets.version(values['filename'])
+            if version:
+                values['v'] = version
+    
+    def serve_static(filename):
+        asset = assets.assets.get(filename)
+        if not asset:
+            return serve_file(filename=filename)
+        
+        encoding = negotiate(request.headers.get('Accept-Encoding', ''))
+        if encoding not in asset['variants']:
+            encoding = None
+        etag = asset['hash'] + (f"-{encoding}" if encoding else '')
+        
+        response = app.response_class(asset['variants'][encoding], mimetype=asset['mimetype'])
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if request.args.get('v') == asset['hash']:
+            response.headers['Cache-Control'] = f"public, max-age={STATIC_MAX_AGE}, immutable"
+        else:
+            response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    
+    app.view_functions['static'] = serve_static
+    
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+                or 'Content-Encoding' in response.headers or not _compressible(response.mimetype)):
+            return response
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        encoding = negotiate(request.headers.get('Accept-Encoding', ''))
+        if not encoding or len(data) < COMPRESS_MIN_SIZE:
+            return response
+        
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        # The compressed body differs byte for byte, so only a weak validator still holds
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+    
+    return assets
@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+from werkzeug.serving import make_server
+
+try:
+    from waitress import wasyncore
+    from waitress.server import create_server as create_waitress_server
+except ImportError:  # optional; fall back to werkzeug's threaded server
+    create_waitress_server = None
+
+# Worker threads answering requests (each open /api/stream holds one)
+WEB_THREADS = int(os.getenv('WEB_THREADS', '16'))
+# Open connections accepted before new ones wait in the listen backlog
+WEB_CONNECTION_LIMIT = int(os.getenv('WEB_CONNECTION_LIMIT', '200'))
+# Pending connections the OS queues before refusing new ones
+WEB_BACKLOG = int(os.getenv('WEB_BACKLOG', '128'))
+# Seconds an idle keep-alive connection stays open
+WEB_KEEPALIVE = int(os.getenv('WEB_KEEPALIVE_SECONDS', '30'))
+# Seconds in-flight requests get to finish on shutdown
+SHUTDOWN_GRACE = float(os.getenv('WEB_SHUTDOWN_GRACE', '10'))
+
+class WebServer:
+    """The single HTTP server for the dashboard, API and health routes
+    
+    Uses waitress (a thread pool with keep-alive and connection limits) when
+    it is installed, otherwise werkzeug's threaded server.
+    """
+    
+    def __init__(self, app, host: str = '0.0.0.0', port: int | None = None, before_shutdown=None):
+        self.port = port or int(os.environ.get('PORT', 5000))
+        self.before_shutdown = before_shutdown
+        self._thread = None
+        if create_waitress_server:
+            self.kind = 'waitress'
+            self._server = create_waitress_server(
+                app,
+                host=host,
+                port=self.port,
+                threads=WEB_THREADS,
+                connection_limit=WEB_CONNECTION_LIMIT,
+                backlog=WEB_BACKLOG,
+                channel_timeout=WEB_KEEPALIVE,
+                ident='duel-lords'
+            )
+        else:
+            self.kind = 'threaded'
+            self._server = make_server(host, self.port, app, threaded=True)
+    
+    def serve_forever(self):
+        """Serve in the calling thread until shutdown() is called"""
+        print(f"🌐 Web server ({self.kind}) listening on port {self.port}")
+        if self.kind == 'waitress':
+            self._server.run()
+        else:
+            self._server.serve_forever()
+    
+    def start(self) -> threading.Thread:
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name='web-server', daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    def shutdown(self, grace: float = SHUTDOWN_GRACE):
+        """Stop accepting requests, let in-flight ones finish for up to `grace` seconds, then close"""
+        if self.before_shutdown:
+            self.before_shutdown()
+        if self.kind == 'waitress':
+            deadline = time.monotonic() + grace
+            dispatcher = self._server.task_dispatcher
+            # Workers exit as soon as they are told to, so drain queued requests first
+            while dispatcher.queue and time.monotonic() < deadline:
+                time.sleep(0.05)
+            dispatcher.shutdown(cancel_pending=False, timeout=max(0, deadline - time.monotonic()))
+            # Let the event loop flush responses the workers already produced
+            channels = getattr(self._server, 'map', None) or self._server._map
+            while time.monotonic() < deadline and any(
+                    getattr(channel, 'total_outbufs_len', 0) for channel in list(channels.values())):
+                time.sleep(0.05)
+            wasyncore.close_all(channels)
+        else:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._thread:
+            self._thread.join(grace)
+        print("🛑 Web server stopped")
+
+def create_server(port: int | None = None) -> WebServer:
+    """The consolidated server for web.app"""
+    from web.app import app, stop_streams
+    return WebServer(app, port=port, before_shutdown=stop_streams)
+
+if __name__ == '__main__':
+    server = create_server()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()